@@ -0,0 +1,100 @@
+"""Benchmark the backtest functions against the label-aligned pandas version.
+
+Run from the project root with::
+
+    PYTHONPATH=src python benchmarks/bench_backtest.py --tickers 5000 --years 20
+
+Both implementations are run on the same random prices, weights and signals and
+their results are compared.
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.returns import (
+    adjust_returns_for_trading_costs,
+    create_portfolio_returns,
+)
+
+
+def _pandas_backtest(
+    prices: pd.DataFrame, weights: pd.DataFrame, signals: pd.DataFrame, bp: float
+) -> pd.DataFrame:
+    returns = prices.pct_change(fill_method=None)
+    portfolio_returns = (returns * weights).sum(axis=1).to_frame("Portfolio Returns")
+    portfolio_returns["Cumulative Returns"] = (
+        1 + portfolio_returns["Portfolio Returns"]
+    ).cumprod()
+    trade_signals = signals.diff().fillna(signals)
+    position_sizes = portfolio_returns["Cumulative Returns"].shift(1).fillna(1)
+    trading_costs = trade_signals.multiply(position_sizes, axis=0).abs() * bp / 10000
+    portfolio_returns["Total Trading Costs"] = trading_costs.sum(axis=1)
+    portfolio_returns["Normalized Trading Costs"] = (
+        portfolio_returns["Total Trading Costs"]
+        / portfolio_returns["Cumulative Returns"]
+    )
+    portfolio_returns["Adjusted Portfolio Returns"] = (
+        portfolio_returns["Portfolio Returns"]
+        - portfolio_returns["Normalized Trading Costs"]
+    )
+    return portfolio_returns
+
+
+def _array_backtest(
+    prices: pd.DataFrame, weights: pd.DataFrame, signals: pd.DataFrame, bp: float
+) -> pd.DataFrame:
+    portfolio_returns = create_portfolio_returns(prices, weights)
+    return adjust_returns_for_trading_costs(
+        portfolio_returns, signals, {"bp_trading_cost": bp}
+    )
+
+
+def _random_inputs(
+    n_tickers: int, n_years: int, seed: int
+) -> tuple[pd.DataFrame, pd.DataFrame, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start="2000-01-03", periods=252 * n_years)
+    tickers = [f"TICKER_{i:05d}" for i in range(n_tickers)]
+    returns = rng.normal(scale=0.02, size=(len(dates), n_tickers))
+    prices = pd.DataFrame(
+        100 * np.cumprod(1 + returns, axis=0), index=dates, columns=tickers
+    )
+    signals = pd.DataFrame(
+        rng.integers(-1, 2, size=(len(dates), n_tickers)).astype(float),
+        index=dates,
+        columns=tickers,
+    )
+    weights = signals / n_tickers
+    return prices, weights, signals
+
+
+def main() -> int:
+    """Run the backtest benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=5000)
+    parser.add_argument("--years", type=int, default=20)
+    parser.add_argument("--bp", type=float, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    prices, weights, signals = _random_inputs(args.tickers, args.years, args.seed)
+    print(f"{len(prices)} dates x {args.tickers} tickers")
+
+    timings = {}
+    results = {}
+    for name, backtest in [("pandas", _pandas_backtest), ("arrays", _array_backtest)]:
+        start = time.perf_counter()
+        results[name] = backtest(prices, weights, signals, args.bp)
+        timings[name] = time.perf_counter() - start
+        print(f"{name}: {timings[name]:.3f}s")
+
+    pd.testing.assert_frame_equal(results["arrays"], results["pandas"])
+    print(f"speed-up: {timings['pandas'] / timings['arrays']:.1f}x, results match")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
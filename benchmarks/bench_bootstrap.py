@@ -0,0 +1,48 @@
+"""Benchmark the bootstrap confidence intervals of the performance metrics.
+
+Run from the project root with::
+
+    PYTHONPATH=src python benchmarks/bench_bootstrap.py --resamples 10000 --years 10
+"""
+
+import argparse
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.resampling import (
+    RESAMPLING_METHODS,
+    bootstrap_performance_metrics,
+)
+
+
+def main() -> int:
+    """Run the bootstrap benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--resamples", type=int, default=10000)
+    parser.add_argument("--years", type=int, default=10)
+    parser.add_argument("--method", choices=RESAMPLING_METHODS, default="stationary")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    dates = pd.bdate_range(start="2000-01-03", periods=252 * args.years)
+    portfolio_returns = pd.DataFrame(
+        {"Adjusted Portfolio Returns": rng.normal(4e-4, 1e-2, len(dates))},
+        index=dates,
+    )
+    print(f"{args.resamples} resamples x {len(dates)} dates ({args.method})")
+
+    start = time.perf_counter()
+    intervals = bootstrap_performance_metrics(
+        portfolio_returns,
+        {"method": args.method, "n_resamples": args.resamples, "seed": args.seed},
+    )
+    print(intervals.to_string())
+    print(f"elapsed: {time.perf_counter() - start:.3f}s")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""Benchmark the fused feature pipeline against the stepwise pipeline.
+
+Both pipelines run through the Kedro runner with in-memory datasets, so the copies
+of the intermediate frames are included. Run from the project root with::
+
+    PYTHONPATH=src python benchmarks/bench_features.py --tickers 500 --dates 1000
+"""
+
+import argparse
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+from feature_engineering.pipelines import create_pipeline
+from kedro.io import DataCatalog
+from kedro.runner import SequentialRunner
+
+PARAMETERS = Path(__file__).parents[1] / "conf/base/parameters/feature_engineering.yml"
+
+
+def _price_data(n_tickers: int, n_dates: int) -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(start="2000-01-03", periods=n_dates).strftime("%Y-%m-%d")
+    close = (
+        100
+        * np.exp(
+            np.cumsum(rng.normal(scale=0.01, size=(n_dates, n_tickers)), axis=0)
+        ).ravel()
+    )
+    return pd.DataFrame(
+        {
+            "date": np.repeat(dates, n_tickers),
+            "stock_ticker": np.tile(
+                [f"TICKER_{i:04d}" for i in range(n_tickers)], n_dates
+            ),
+            "adj_close": close * 0.99,
+            "close": close,
+            "high": close * 1.01,
+            "low": close * 0.98,
+            "open": close * 1.001,
+            "volume": rng.integers(100_000, 1_000_000, close.size).astype(float),
+        }
+    )
+
+
+def _run(fused: bool, price_data: pd.DataFrame, params: dict) -> pd.DataFrame:
+    catalog = DataCatalog()
+    catalog.add_feed_dict(
+        {
+            "price_data": price_data,
+            **{f"params:{name}": value for name, value in params.items()},
+        }
+    )
+    tracemalloc.start()
+    start = time.perf_counter()
+    outputs = SequentialRunner().run(create_pipeline(fused=fused), catalog)
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    mode = "fused" if fused else "stepwise"
+    print(f"{mode:>8}: {elapsed:.2f}s, peak memory {peak / 2**20:.0f} MiB")
+    return outputs["price_w_features"]
+
+
+def main() -> int:
+    """Run the feature benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=500)
+    parser.add_argument("--dates", type=int, default=1000)
+    args = parser.parse_args()
+
+    params = yaml.safe_load(PARAMETERS.read_text())
+    price_data = _price_data(args.tickers, args.dates)
+    size = price_data.memory_usage(deep=True).sum() / 2**20
+    print(f"{args.tickers} tickers x {args.dates} dates, input {size:.0f} MiB")
+
+    stepwise = _run(False, price_data, params)
+    fused = _run(True, price_data, params)
+    pd.testing.assert_frame_equal(fused, stepwise)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
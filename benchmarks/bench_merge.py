@@ -0,0 +1,79 @@
+"""Benchmark the multi-way join of `merge_datasets` against pairwise merges.
+
+Every variant has predictions for the same dates, except for a share of randomly
+missing dates (``--missing``). Run from the project root with::
+
+    PYTHONPATH=src python benchmarks/bench_merge.py --variants 10 100 500
+"""
+
+import argparse
+import functools
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+from common.utilities.combine_datasets import merge_datasets
+
+COLUMNS = ["mean", "0.1", "0.5", "0.9"]
+
+
+def _pairwise_merge(**kwargs) -> pd.DataFrame:
+    merge_keys = kwargs["params"]
+    dfs_list = [
+        df.rename(columns={col: f"{key}_{col}" for col in COLUMNS})
+        for key, df in kwargs.items()
+        if key != "params"
+    ]
+    return functools.reduce(
+        lambda df1, df2: pd.merge(df1, df2, on=merge_keys), dfs_list
+    )
+
+
+def _variants(
+    n_variants: int, n_dates: int, missing: float, seed: int
+) -> dict[str, pd.DataFrame]:
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range(start="2014-01-02", periods=n_dates)
+    variants = {}
+    for i in range(n_variants):
+        keep = np.sort(rng.permutation(n_dates)[: n_dates - int(n_dates * missing)])
+        variants[f"variant_{i:03d}"] = pd.DataFrame(
+            rng.normal(size=(len(keep), len(COLUMNS))), columns=COLUMNS
+        ).assign(timestamp=dates[keep])[["timestamp", *COLUMNS]]
+    return variants
+
+
+def main() -> int:
+    """Run the merge benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--variants", type=int, nargs="+", default=[10, 100, 500])
+    parser.add_argument("--dates", type=int, default=2520)
+    parser.add_argument("--missing", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    for n_variants in args.variants:
+        variants = _variants(n_variants, args.dates, args.missing, args.seed)
+        timings = {}
+        results = {}
+        for name, merge in [
+            ("pairwise", _pairwise_merge),
+            ("multi-way", merge_datasets),
+        ]:
+            start = time.perf_counter()
+            results[name] = merge(**variants, params=["timestamp"])
+            timings[name] = time.perf_counter() - start
+
+        pd.testing.assert_frame_equal(results["multi-way"], results["pairwise"])
+        print(
+            f"{n_variants:>4} variants x {args.dates} dates: "
+            f"pairwise {timings['pairwise']:.3f}s, "
+            f"multi-way {timings['multi-way']:.3f}s, "
+            f"speed-up {timings['pairwise'] / timings['multi-way']:.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+"""Benchmark CLI startup: registry import, pipeline listing and pipeline creation.
+
+Run from the project root with::
+
+    PYTHONPATH=src python benchmarks/bench_registry_startup.py --variants 150
+
+The script exits with a non-zero status if any timing exceeds its budget.
+"""
+
+import argparse
+import sys
+import time
+
+import pandas as pd
+
+
+def _timed(func, *args, **kwargs) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+
+def main() -> int:
+    """Run the startup benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--variants", type=int, default=150)
+    parser.add_argument("--import-budget", type=float, default=2.0)
+    parser.add_argument("--build-budget", type=float, default=5.0)
+    args = parser.parse_args()
+
+    def _import_and_list():
+        from registry.pipeline_registry import register_pipelines
+
+        return list(register_pipelines())
+
+    import_seconds, names = _timed(_import_and_list)
+
+    from ml_technique_stock_price.pipelines.pipeline import _create_modeling_pipeline
+
+    cutoffs = pd.bdate_range("2000-01-07", periods=args.variants, freq="W-FRI")
+    variants = cutoffs.strftime("%Y-%m-%d").tolist()
+    build_seconds, _ = _timed(
+        lambda: [
+            _create_modeling_pipeline(
+                top_level_namespace="ml_technique_modeling", variant=variant
+            )
+            for variant in variants
+        ]
+    )
+
+    heavy = [m for m in ("autogluon", "matplotlib", "yfinance") if m in sys.modules]
+    print(f"registered pipelines: {names}")
+    print(f"import + listing: {import_seconds:.3f}s (budget {args.import_budget}s)")
+    print(
+        f"building {args.variants} variants: {build_seconds:.3f}s "
+        f"(budget {args.build_budget}s)"
+    )
+    print(f"heavy modules imported: {heavy or 'none'}")
+
+    within_budget = (
+        import_seconds <= args.import_budget
+        and build_seconds <= args.build_budget
+        and not heavy
+    )
+    return 0 if within_budget else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
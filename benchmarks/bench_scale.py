@@ -0,0 +1,127 @@
+"""Benchmark the main steps at universe scale on synthetic price data.
+
+The price data comes from `generate_price_data` (with IPOs, delistings, missing
+bars and splits), so no download is needed. The steps are the feature engineering,
+the cutoff filter, the stock selection and the backtest. Run from the project root
+with::
+
+    PYTHONPATH=src python benchmarks/bench_scale.py --tickers 3000 --days 2520
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import yaml
+from common.backtesting.functions.returns import (
+    adjust_returns_for_trading_costs,
+    create_portfolio_returns,
+)
+from data_collection.functions import generate_price_data
+from feature_engineering.functions import create_features
+from ml_technique_stock_price.functions.data_filtering import (
+    create_ticker_date_index,
+    filter_data,
+)
+from ml_technique_stock_price.functions.stock_selection import stock_selection
+
+CONF = Path(__file__).parents[1] / "conf/base/parameters"
+
+
+def _timed(name: str, func, *args, **kwargs) -> object:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    print(f"{name:>18}: {time.perf_counter() - start:.2f}s")
+    return result
+
+
+def _filter_cutoffs(sorted_features: pd.DataFrame, index: pd.DataFrame, n: int) -> int:
+    dates = np.sort(sorted_features["date"].unique())
+    cutoffs = dates[np.linspace(len(dates) // 2, len(dates) - 1, n).astype(int)]
+    return sum(len(filter_data(sorted_features, cutoff, index)) for cutoff in cutoffs)
+
+
+def _predictions(features: pd.DataFrame, horizon: int) -> pd.DataFrame:
+    """Use the last log returns of every ticker as a naive forecast."""
+    last = features.sort_values("date").groupby("stock_ticker").tail(horizon)
+    return pd.DataFrame(
+        {
+            "item_id": last["stock_ticker"],
+            "timestamp": last["date"],
+            "mean": last["log_return_close"],
+        }
+    )
+
+
+def main() -> int:
+    """Run the scale benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--tickers", type=int, default=3000)
+    parser.add_argument("--days", type=int, default=2520)
+    parser.add_argument("--cutoffs", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    synthetic_params = {
+        **yaml.safe_load((CONF / "data_collection.yml").read_text())["synthetic_data"],
+        "n_tickers": args.tickers,
+        "n_days": args.days,
+        "seed": args.seed,
+    }
+    feature_params = yaml.safe_load((CONF / "feature_engineering.yml").read_text())
+    stock_price_params = yaml.safe_load(
+        (CONF / "ml_technique_stock_price.yml").read_text()
+    )["ml_technique_modeling"]["stock_price_params"]
+
+    price_data = _timed("generate", generate_price_data, synthetic_params)
+    size = price_data.memory_usage(deep=True).sum() / 2**20
+    print(f"{len(price_data)} rows, {size:.0f} MiB")
+
+    features = _timed(
+        "features",
+        create_features,
+        price_data,
+        feature_params["arithmetic"],
+        feature_params["aggregation"],
+        feature_params["shift"],
+        feature_params["log_returns"],
+    )
+    sorted_features, ticker_date_index = _timed(
+        "ticker date index", create_ticker_date_index, features
+    )
+    _timed(
+        f"filter {args.cutoffs} cutoffs",
+        _filter_cutoffs,
+        sorted_features,
+        ticker_date_index,
+        args.cutoffs,
+    )
+    _timed(
+        "stock selection",
+        stock_selection,
+        _predictions(sorted_features, 5),
+        stock_price_params,
+    )
+
+    # Backtest a daily momentum strategy on every ticker and date.
+    prices = sorted_features.pivot(
+        index="date", columns="stock_ticker", values="adj_close"
+    )
+    signals = np.sign(prices.pct_change(fill_method=None).shift(1)).fillna(0)
+    weights = signals / prices.shape[1]
+    portfolio_returns = _timed("backtest", create_portfolio_returns, prices, weights)
+    _timed(
+        "trading costs",
+        adjust_returns_for_trading_costs,
+        portfolio_returns,
+        signals,
+        {"bp_trading_cost": 10},
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,176 @@
+"""Functions for backtesting many strategies in one pass."""
+
+from collections.abc import Callable
+from typing import Any, Union
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.costs import (
+    align_market_data,
+    create_market_data,
+    transaction_costs,
+)
+from common.backtesting.functions.engine import (
+    cost_adjustment,
+    portfolio_returns,
+    signal_changes,
+    simple_returns,
+)
+from common.backtesting.functions.evaluation import performance_metrics_array
+
+StrategyFrames = dict[str, Union[pd.DataFrame, Callable[[], pd.DataFrame]]]
+
+
+def create_batch_portfolio_returns(
+    prices: pd.DataFrame,
+    strategy_signals: StrategyFrames,
+    trading_cost_params: dict[str, Any],
+    strategy_weights: StrategyFrames = None,
+    volumes: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """Backtest several strategies at once.
+
+    The signals (and weights) of all strategies are stacked into one
+    strategy x date x ticker array, so returns and trading costs of every strategy
+    are computed by the same broadcast array operations. Each strategy is only
+    active between its first and its last signal date. The traded amounts are the
+    weight changes if the weights are given, otherwise the signal changes.
+
+    Args:
+    ----
+        prices (pd.DataFrame): Price matrix with a sorted date index and the tickers
+            as the columns.
+        strategy_signals (StrategyFrames): Signals per strategy, either as
+            DataFrames or as loaders returning them (e.g. a loaded partitioned
+            dataset). Signals with a "timestamp" column instead of a date index, as
+            stored by the multi variant pipelines, are supported.
+        trading_cost_params (dict[str, Any]): Dictionary with the trading costs,
+            see `adjust_returns_for_trading_costs`.
+        strategy_weights (StrategyFrames, optional): Weights per strategy. Defaults
+            to the signals scaled to a gross exposure of one per date.
+        volumes (pd.DataFrame, optional): Traded shares, needed by the market
+            impact model.
+
+    Returns:
+    -------
+        pd.DataFrame: Adjusted portfolio returns with the dates as the index and one
+            column per strategy. Dates outside a strategy's period are NaN.
+
+    """
+    strategies = sorted(strategy_signals)
+    signals = [_load_strategy_frame(strategy_signals[name]) for name in strategies]
+
+    first_dates = pd.DatetimeIndex([frame.index.min() for frame in signals])
+    last_dates = pd.DatetimeIndex([frame.index.max() for frame in signals])
+    start = max(prices.index.searchsorted(first_dates.min()) - 1, 0)
+    stop = prices.index.searchsorted(last_dates.max(), side="right")
+    index = prices.index[start:stop]
+    columns = pd.Index(sorted(set().union(*[frame.columns for frame in signals])))
+
+    signal_stack = _stack(signals, index, columns)
+    if strategy_weights is None:
+        gross_exposure = np.nansum(np.abs(signal_stack), axis=-1, keepdims=True)
+        weight_stack = np.divide(
+            signal_stack,
+            gross_exposure,
+            out=np.zeros_like(signal_stack),
+            where=gross_exposure > 0,
+        )
+        trades = signal_changes(signal_stack)
+    else:
+        weight_stack = _stack(
+            [_load_strategy_frame(strategy_weights[name]) for name in strategies],
+            index,
+            columns,
+        )
+        trades = signal_changes(weight_stack)
+
+    backtest_data = align_market_data(
+        create_market_data(prices, trading_cost_params, volumes), index, columns
+    )
+    backtest_data.update({"trades": trades, "weights": weight_stack})
+    returns = portfolio_returns(simple_returns(backtest_data["prices"]), weight_stack)
+    adjustment = cost_adjustment(
+        returns, transaction_costs(backtest_data, trading_cost_params)
+    )
+
+    dates = index.to_numpy()
+    active = (dates >= first_dates.to_numpy()[:, None]) & (
+        dates <= last_dates.to_numpy()[:, None]
+    )
+    adjusted_returns = np.where(
+        active, adjustment["Adjusted Portfolio Returns"], np.nan
+    )
+    return pd.DataFrame(
+        adjusted_returns.T, index=index, columns=pd.Index(strategies, name="strategy")
+    )
+
+
+def calculate_batch_performance_metrics(
+    batch_portfolio_returns: pd.DataFrame,
+) -> pd.DataFrame:
+    """Calculate the performance metrics of every strategy.
+
+    Args:
+    ----
+        batch_portfolio_returns (pd.DataFrame): Adjusted portfolio returns with one
+            column per strategy.
+
+    Returns:
+    -------
+        pd.DataFrame: One row per strategy with the column "strategy" and one column
+            per performance metric.
+
+    """
+    metrics = performance_metrics_array(
+        batch_portfolio_returns.to_numpy(dtype=float).T,
+        pd.DatetimeIndex(batch_portfolio_returns.index),
+    )
+    return pd.DataFrame(
+        {"strategy": batch_portfolio_returns.columns.to_numpy(), **metrics}
+    )
+
+
+def _load_strategy_frame(
+    frame: Union[pd.DataFrame, Callable[[], pd.DataFrame]],
+) -> pd.DataFrame:
+    """Load a strategy's frame and index it by date.
+
+    Args:
+    ----
+        frame (Union[pd.DataFrame, Callable[[], pd.DataFrame]]): DataFrame or loader.
+
+    Returns:
+    -------
+        pd.DataFrame: DataFrame with a sorted datetime index.
+
+    """
+    if callable(frame):
+        frame = frame()
+    if "timestamp" in frame.columns:
+        frame = frame.set_index("timestamp")
+    return frame.set_axis(pd.to_datetime(frame.index), axis=0).sort_index()
+
+
+def _stack(
+    frames: list[pd.DataFrame], index: pd.Index, columns: pd.Index
+) -> np.ndarray:
+    """Stack DataFrames into one strategy x date x ticker array.
+
+    Args:
+    ----
+        frames (list[pd.DataFrame]): One DataFrame per strategy.
+        index (pd.Index): Dates of the stack.
+        columns (pd.Index): Tickers of the stack.
+
+    Returns:
+    -------
+        np.ndarray: Stacked values. Missing dates and tickers are NaN.
+
+    """
+    stack = np.full((len(frames), len(index), len(columns)), np.nan)
+    for position, frame in enumerate(frames):
+        stack[position] = frame.reindex(index=index, columns=columns).to_numpy(
+            dtype=float
+        )
+    return stack
@@ -0,0 +1,293 @@
+"""Transaction cost models.
+
+Every cost model maps the backtest data, i.e. the traded amounts ("trades", the
+weight changes), the "weights" and the market data, to the costs per date as a
+fraction of the portfolio value. The arrays have the dates on the second to last
+axis and the tickers on the last axis, leading axes (e.g. one per strategy) are
+broadcast, so the same models serve single and batched backtests.
+"""
+
+from collections.abc import Callable
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.evaluation import TRADING_DAYS_PER_YEAR
+
+CostModel = Callable[[dict[str, np.ndarray], dict[str, Any]], np.ndarray]
+
+
+def fixed_bps_costs(
+    backtest_data: dict[str, np.ndarray], params: dict[str, Any]
+) -> np.ndarray:
+    """Flat cost in basis points of the traded amount.
+
+    Args:
+    ----
+        backtest_data (dict[str, np.ndarray]): Backtest data with the "trades".
+        params (dict[str, Any]): "bps" is the cost in basis points.
+
+    Returns:
+    -------
+        np.ndarray: Costs per date.
+
+    """
+    return np.nansum(np.abs(backtest_data["trades"]), axis=-1) * params["bps"] / 10000
+
+
+def per_share_costs(
+    backtest_data: dict[str, np.ndarray], params: dict[str, Any]
+) -> np.ndarray:
+    """Commission per traded share.
+
+    The number of shares is the traded value divided by the price, so the costs
+    relative to the portfolio value do not depend on the capital.
+
+    Args:
+    ----
+        backtest_data (dict[str, np.ndarray]): Backtest data with the "trades" and
+            the "prices".
+        params (dict[str, Any]): "fee_per_share" is the commission per share in the
+            currency of the prices.
+
+    Returns:
+    -------
+        np.ndarray: Costs per date.
+
+    """
+    return np.nansum(
+        np.abs(backtest_data["trades"])
+        * params["fee_per_share"]
+        / _require(backtest_data, "prices"),
+        axis=-1,
+    )
+
+
+def spread_costs(
+    backtest_data: dict[str, np.ndarray], params: dict[str, Any]
+) -> np.ndarray:
+    """Half of the bid-ask spread on the traded amount.
+
+    Args:
+    ----
+        backtest_data (dict[str, np.ndarray]): Backtest data with the "trades".
+            Relative "spreads" per date and ticker are used if present.
+        params (dict[str, Any]): "spread_bps" is the spread in basis points used
+            when the backtest data has no spreads.
+
+    Returns:
+    -------
+        np.ndarray: Costs per date.
+
+    """
+    spreads = backtest_data.get("spreads")
+    if spreads is None:
+        spreads = params["spread_bps"] / 10000
+    return np.nansum(np.abs(backtest_data["trades"]) * spreads / 2, axis=-1)
+
+
+def sqrt_impact_costs(
+    backtest_data: dict[str, np.ndarray], params: dict[str, Any]
+) -> np.ndarray:
+    """Square root market impact.
+
+    The price impact of a trade is ``coefficient * volatility * sqrt(traded value /
+    average daily traded value)`` and is paid on the traded amount.
+
+    Args:
+    ----
+        backtest_data (dict[str, np.ndarray]): Backtest data with the "trades", the
+            "volatility" and the "adv" (average daily traded value), see
+            `create_market_data`.
+        params (dict[str, Any]): "capital" is the portfolio value in the currency of
+            the prices and "coefficient" scales the impact (defaults to 1.0).
+
+    Returns:
+    -------
+        np.ndarray: Costs per date.
+
+    """
+    traded = np.abs(backtest_data["trades"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        participation = traded * params["capital"] / _require(backtest_data, "adv")
+    impact = (
+        params.get("coefficient", 1.0)
+        * _require(backtest_data, "volatility")
+        * np.sqrt(participation)
+    )
+    return np.nansum(traded * impact, axis=-1)
+
+
+def borrow_costs(
+    backtest_data: dict[str, np.ndarray], params: dict[str, Any]
+) -> np.ndarray:
+    """Daily fee on the short positions.
+
+    Args:
+    ----
+        backtest_data (dict[str, np.ndarray]): Backtest data with the "weights".
+        params (dict[str, Any]): "annual_rate" is the annual borrow fee.
+
+    Returns:
+    -------
+        np.ndarray: Costs per date.
+
+    """
+    weights = _require(backtest_data, "weights")
+    short_exposure = np.nansum(np.maximum(-weights, 0), axis=-1)
+    return short_exposure * params["annual_rate"] / TRADING_DAYS_PER_YEAR
+
+
+COST_MODELS: dict[str, CostModel] = {
+    "fixed_bps": fixed_bps_costs,
+    "per_share": per_share_costs,
+    "spread": spread_costs,
+    "sqrt_impact": sqrt_impact_costs,
+    "borrow": borrow_costs,
+}
+
+
+def transaction_costs(
+    backtest_data: dict[str, np.ndarray], trading_cost_params: dict[str, Any]
+) -> np.ndarray:
+    """Sum the costs of all configured cost models.
+
+    Args:
+    ----
+        backtest_data (dict[str, np.ndarray]): The "trades" and, as needed by the
+            cost models, the "weights" and the market data aligned with them.
+        trading_cost_params (dict[str, Any]): "cost_models" maps names of
+            `COST_MODELS` to their parameters. "bp_trading_cost" is a shorthand for
+            the "fixed_bps" model.
+
+    Raises:
+    ------
+        ValueError: If a cost model is unknown.
+
+    Returns:
+    -------
+        np.ndarray: Costs per date as a fraction of the portfolio value.
+
+    """
+    models = _cost_models(trading_cost_params)
+    costs = np.zeros(backtest_data["trades"].shape[:-1])
+    for name, params in models.items():
+        costs += COST_MODELS[name](backtest_data, params)
+    return costs
+
+
+def create_market_data(
+    prices: pd.DataFrame,
+    trading_cost_params: dict[str, Any],
+    volumes: Optional[pd.DataFrame] = None,
+) -> dict[str, pd.DataFrame]:
+    """Create the market data used by the configured cost models.
+
+    The trailing statistics of the market impact model only use the dates before
+    each date and are computed on the full history, so a backtest starting later
+    still has them from its first date.
+
+    Args:
+    ----
+        prices (pd.DataFrame): Price matrix with a sorted date index and the tickers
+            as the columns.
+        trading_cost_params (dict[str, Any]): Dictionary with the trading costs, see
+            `transaction_costs`. "market_data_window" is the length of the trailing
+            windows (defaults to 20).
+        volumes (pd.DataFrame, optional): Traded shares, same layout as the prices.
+
+    Raises:
+    ------
+        ValueError: If the market impact model is configured without volumes.
+
+    Returns:
+    -------
+        dict[str, pd.DataFrame]: The "prices" and, for the market impact model, the
+            trailing daily "volatility" and average daily traded value "adv".
+
+    """
+    market_data = {"prices": prices}
+    if "sqrt_impact" in _cost_models(trading_cost_params):
+        if volumes is None:
+            raise ValueError("The cost model needs the market data 'volumes'")
+        window = trading_cost_params.get("market_data_window", 20)
+        returns = prices.pct_change(fill_method=None)
+        traded_value = prices * volumes.reindex_like(prices)
+        market_data["volatility"] = (
+            returns.rolling(window, min_periods=2).std().shift(1)
+        )
+        market_data["adv"] = traded_value.rolling(window, min_periods=1).mean().shift(1)
+    return market_data
+
+
+def align_market_data(
+    market_data: dict[str, pd.DataFrame], index: pd.Index, columns: pd.Index
+) -> dict[str, np.ndarray]:
+    """Align the market data with the dates and tickers of a backtest.
+
+    Args:
+    ----
+        market_data (dict[str, pd.DataFrame]): Market data from
+            `create_market_data`.
+        index (pd.Index): Dates of the backtest.
+        columns (pd.Index): Tickers of the backtest.
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: One float array per market data item.
+
+    """
+    return {
+        name: frame.reindex(index=index, columns=columns).to_numpy(dtype=float)
+        for name, frame in market_data.items()
+    }
+
+
+def _cost_models(trading_cost_params: dict[str, Any]) -> dict[str, dict[str, Any]]:
+    """Collect the configured cost models and their parameters.
+
+    Args:
+    ----
+        trading_cost_params (dict[str, Any]): Dictionary with the trading costs.
+
+    Raises:
+    ------
+        ValueError: If a cost model is unknown.
+
+    Returns:
+    -------
+        dict[str, dict[str, Any]]: Parameters per cost model.
+
+    """
+    models = {
+        name: params or {}
+        for name, params in (trading_cost_params.get("cost_models") or {}).items()
+    }
+    if "bp_trading_cost" in trading_cost_params:
+        models.setdefault("fixed_bps", {"bps": trading_cost_params["bp_trading_cost"]})
+    invalid_models = set(models).difference(COST_MODELS)
+    if invalid_models:
+        raise ValueError(f"Invalid cost models {sorted(invalid_models)}")
+    return models
+
+
+def _require(backtest_data: dict[str, np.ndarray], name: str) -> np.ndarray:
+    """Get a backtest data item that a cost model needs.
+
+    Args:
+    ----
+        backtest_data (dict[str, np.ndarray]): Backtest data.
+        name (str): Name of the item.
+
+    Raises:
+    ------
+        ValueError: If the item is missing.
+
+    Returns:
+    -------
+        np.ndarray: The market data item.
+
+    """
+    if name not in backtest_data:
+        raise ValueError(f"The cost model needs the market data '{name}'")
+    return backtest_data[name]
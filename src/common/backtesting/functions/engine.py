@@ -0,0 +1,201 @@
+"""Array backtest core.
+
+The functions in this module work on contiguous float arrays with the dates on the
+second to last axis and the tickers on the last axis. Any leading axes (e.g. one per
+strategy) are broadcast, so the same kernels serve single and batched backtests.
+Missing values follow the pandas conventions of the DataFrame API: NaN returns are
+skipped in sums and NaN prices produce NaN returns.
+"""
+
+import numpy as np
+import pandas as pd
+
+
+def align_frames(
+    *frames: pd.DataFrame,
+) -> tuple[pd.Index, pd.Index, list[np.ndarray]]:
+    """Align DataFrames on the union of their index and columns once.
+
+    Args:
+    ----
+        *frames (pd.DataFrame): DataFrames to align.
+
+    Returns:
+    -------
+        tuple[pd.Index, pd.Index, list[np.ndarray]]: The common index, the common
+            columns and one float array per DataFrame.
+
+    """
+    index, columns = frames[0].index, frames[0].columns
+    for frame in frames[1:]:
+        if not index.equals(frame.index):
+            index = index.union(frame.index)
+        if not columns.equals(frame.columns):
+            columns = columns.union(frame.columns)
+
+    arrays = []
+    for frame in frames:
+        aligned = (
+            frame
+            if frame.index.equals(index) and frame.columns.equals(columns)
+            else frame.reindex(index=index, columns=columns)
+        )
+        arrays.append(np.ascontiguousarray(aligned.to_numpy(dtype=float)))
+    return index, columns, arrays
+
+
+def align_rows(values: np.ndarray, index: pd.Index, target: pd.Index) -> np.ndarray:
+    """Reindex the rows of an array, filling missing rows with NaN.
+
+    Args:
+    ----
+        values (np.ndarray): Array with the rows on the second to last axis.
+        index (pd.Index): Row labels of the array.
+        target (pd.Index): Row labels of the result.
+
+    Returns:
+    -------
+        np.ndarray: Array with one row per label of `target`.
+
+    """
+    if index.equals(target):
+        return values
+    positions = index.get_indexer(target)
+    aligned = np.take(values, positions, axis=-2)
+    aligned[..., positions == -1, :] = np.nan
+    return aligned
+
+
+def simple_returns(prices: np.ndarray) -> np.ndarray:
+    """Calculate the simple returns of the prices.
+
+    Args:
+    ----
+        prices (np.ndarray): Prices with the dates on the second to last axis.
+
+    Returns:
+    -------
+        np.ndarray: Returns with the same shape. The first date is NaN.
+
+    """
+    returns = np.full(prices.shape, np.nan)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        np.divide(prices[..., 1:, :], prices[..., :-1, :], out=returns[..., 1:, :])
+    returns[..., 1:, :] -= 1
+    return returns
+
+
+def portfolio_returns(asset_returns: np.ndarray, weights: np.ndarray) -> np.ndarray:
+    """Calculate the weighted portfolio returns.
+
+    Args:
+    ----
+        asset_returns (np.ndarray): Returns of the assets.
+        weights (np.ndarray): Weights of the assets, same shape as the returns.
+
+    Returns:
+    -------
+        np.ndarray: Portfolio return per date, i.e. the tickers axis is reduced.
+
+    """
+    return np.nansum(asset_returns * weights, axis=-1)
+
+
+def signal_changes(signals: np.ndarray) -> np.ndarray:
+    """Calculate the changes of the signals between consecutive dates.
+
+    The first date and dates following a missing signal use the signal itself.
+
+    Args:
+    ----
+        signals (np.ndarray): Signals with the dates on the second to last axis.
+
+    Returns:
+    -------
+        np.ndarray: Signal changes with the same shape.
+
+    """
+    changes = np.empty(signals.shape)
+    changes[..., 0, :] = signals[..., 0, :]
+    np.subtract(signals[..., 1:, :], signals[..., :-1, :], out=changes[..., 1:, :])
+    missing = np.isnan(changes)
+    changes[missing] = signals[missing]
+    return changes
+
+
+def cumulative_returns(returns: np.ndarray) -> np.ndarray:
+    """Calculate the cumulative product of (1 + returns) along the last axis.
+
+    Missing returns are skipped and stay missing, like `pd.Series.cumprod`.
+
+    Args:
+    ----
+        returns (np.ndarray): Returns with the dates on the last axis.
+
+    Returns:
+    -------
+        np.ndarray: Cumulative returns with the same shape.
+
+    """
+    cumulative = np.nancumprod(1 + returns, axis=-1)
+    cumulative[np.isnan(returns)] = np.nan
+    return cumulative
+
+
+def trading_cost_adjustment(
+    returns: np.ndarray, trades: np.ndarray, bp_trading_cost: float
+) -> dict[str, np.ndarray]:
+    """Adjust the portfolio returns for a flat trading cost.
+
+    Args:
+    ----
+        returns (np.ndarray): Portfolio returns with the dates on the last axis.
+        trades (np.ndarray): Traded amounts per date and ticker, aligned with the
+            returns.
+        bp_trading_cost (float): Trading cost as a fraction (not basis points).
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: See `cost_adjustment`.
+
+    """
+    return cost_adjustment(
+        returns, np.nansum(np.abs(trades), axis=-1) * bp_trading_cost
+    )
+
+
+def cost_adjustment(
+    returns: np.ndarray, costs: np.ndarray, initial_value: float = 1.0
+) -> dict[str, np.ndarray]:
+    """Adjust the portfolio returns for costs.
+
+    The costs are fractions of the portfolio value of the previous date and are
+    normalized with the portfolio value of the current date.
+
+    Args:
+    ----
+        returns (np.ndarray): Portfolio returns with the dates on the last axis.
+        costs (np.ndarray): Costs per date, same shape as the returns.
+        initial_value (float, optional): Cumulative return before the first date,
+            used to continue an earlier backtest. Defaults to 1.0.
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: "Cumulative Returns", "Total Trading Costs",
+            "Normalized Trading Costs" and "Adjusted Portfolio Returns".
+
+    """
+    cumulative = initial_value * cumulative_returns(returns)
+    position_sizes = np.ones(cumulative.shape)
+    position_sizes[..., :1] = initial_value
+    position_sizes[..., 1:] = cumulative[..., :-1]
+    position_sizes[np.isnan(position_sizes)] = 1
+
+    total_costs = costs * np.abs(position_sizes)
+    normalized_costs = total_costs / cumulative
+    return {
+        "Cumulative Returns": cumulative,
+        "Total Trading Costs": total_costs,
+        "Normalized Trading Costs": normalized_costs,
+        "Adjusted Portfolio Returns": returns - normalized_costs,
+    }
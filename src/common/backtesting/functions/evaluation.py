@@ -1,7 +1,22 @@
 """Functions to evaluate the performance of a trading strategy."""
 
+from typing import Any, Optional
+
 import numpy as np
 import pandas as pd
+from common.backtesting.functions.engine import align_rows, signal_changes
+
+TRADING_DAYS_PER_YEAR = 252
+PERIOD_FREQUENCIES = ("year", "month")
+_WINDOW_METRICS = [
+    "total_return",
+    "mean_return",
+    "volatility",
+    "sharpe_ratio",
+    "sortino_ratio",
+    "hit_rate",
+    "max_drawdown",
+]
 
 
 def mean_return(returns: pd.Series) -> float:
@@ -46,8 +61,8 @@ def cagr(returns: pd.Series) -> float:
         float: CAGR of the returns.
 
     """
-    returns.index = pd.to_datetime(returns.index)
-    total_period = (returns.index[-1] - returns.index[0]).days / 365.25
+    dates = pd.to_datetime(returns.index)
+    total_period = (dates[-1] - dates[0]).days / 365.25
     cumulative_return = (1 + returns).prod() - 1
     cagr_value = (1 + cumulative_return) ** (1 / total_period) - 1
     return cagr_value.iloc[0]
@@ -86,34 +101,360 @@ def sharpe_ratio(returns: pd.Series, risk_free_rate: float = 0.0) -> float:
         float: Sharpe ratio of the returns.
 
     """
-    excess_returns = returns - risk_free_rate / 252
-    return (excess_returns.mean() / returns.std() * np.sqrt(252)).iloc[0]
+    excess_returns = returns - risk_free_rate / TRADING_DAYS_PER_YEAR
+    return (
+        excess_returns.mean() / returns.std() * np.sqrt(TRADING_DAYS_PER_YEAR)
+    ).iloc[0]
 
 
 def calculate_performance_metrics(
-    portfolio_returns: pd.DataFrame, performance_metric_params: str
-) -> pd.DataFrame:
+    portfolio_returns: pd.DataFrame,
+    performance_metric_params: dict[str, Any],
+    signals: Optional[pd.DataFrame] = None,
+) -> dict[str, float]:
     """Calculate performance metrics of a trading strategy.
 
+    All metrics are computed by `performance_metrics_array` from one pass over the
+    returns.
+
+    Args:
+    ----
+        portfolio_returns (pd.DataFrame): DataFrame containing the returns of the
+            portfolio that should be evaluated.
+        performance_metric_params (dict[str, Any]): Dictionary containing the
+            parameters for the performance metrics calculation. "columns" selects
+            the returns column and "risk_free_rate" (optional) is the annual risk
+            free rate.
+        signals (pd.DataFrame, optional): Signals of the strategy. If given, the
+            average turnover is added to the metrics.
+
+    Returns:
+    -------
+        dict[str, float]: Dictionary containing the calculated performance metrics.
+
+    """
+    returns = select_returns(portfolio_returns, performance_metric_params)
+    trades = None
+    if signals is not None:
+        trades = align_rows(
+            signal_changes(signals.to_numpy(dtype=float)),
+            signals.index,
+            returns.index,
+        )
+    metrics = performance_metrics_array(
+        returns.to_numpy(dtype=float),
+        pd.DatetimeIndex(returns.index),
+        performance_metric_params.get("risk_free_rate", 0.0),
+        trades,
+    )
+    return {name: float(values[0]) for name, values in metrics.items()}
+
+
+def performance_metrics_array(
+    returns: np.ndarray,
+    dates: pd.DatetimeIndex,
+    risk_free_rate: float = 0.0,
+    trades: Optional[np.ndarray] = None,
+) -> dict[str, np.ndarray]:
+    """Calculate the performance metrics of several return series at once.
+
+    Missing returns are ignored, so series covering different periods can share one
+    array. The period of each series runs from its first to its last non-missing
+    return. The cumulative returns are computed once and shared by the CAGR, the
+    drawdown and the Calmar ratio.
+
+    Args:
+    ----
+        returns (np.ndarray): Returns with one series per row and the dates on the
+            last axis.
+        dates (pd.DatetimeIndex): Dates of the returns.
+        risk_free_rate (float, optional): The annual risk free rate that is
+            subtracted from the average return. Defaults to 0.0.
+        trades (np.ndarray, optional): Traded amounts with the dates on the second
+            to last axis and the tickers on the last axis, aligned with the returns.
+            If given, the average turnover per date is added.
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: One array per metric with one value per series.
+
+    """
+    returns = np.atleast_2d(returns)
+    observed = ~np.isnan(returns)
+    filled = np.where(observed, returns, 0.0)
+    count = observed.sum(axis=-1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = filled.sum(axis=-1) / count
+        deviations = np.where(observed, returns - mean[..., None], 0.0)
+        metrics = moment_metrics(
+            count,
+            mean,
+            (deviations**2).sum(axis=-1),
+            downside_squares(filled, observed, risk_free_rate).sum(axis=-1),
+            risk_free_rate,
+        )
+        metrics["hit_rate"] = (filled > 0).sum(axis=-1) / count
+
+        day_numbers = dates.to_numpy(dtype="datetime64[D]").astype(np.int64)
+        first_day = np.where(observed, day_numbers, np.iinfo(np.int64).max).min(-1)
+        last_day = np.where(observed, day_numbers, np.iinfo(np.int64).min).max(-1)
+        total_period = (last_day - first_day) / 365.25
+
+        cumulative = np.cumprod(1 + filled, axis=-1)
+        peak = np.maximum.accumulate(cumulative, axis=-1)
+        drawdown = np.where(observed, cumulative / peak - 1, 0.0).min(axis=-1)
+        cagr_value = cumulative[..., -1] ** (1 / total_period) - 1
+
+    metrics.update(
+        {
+            "cagr": cagr_value,
+            "max_drawdown": drawdown,
+            "calmar_ratio": np.divide(
+                cagr_value,
+                -drawdown,
+                out=np.full(cagr_value.shape, np.nan),
+                where=drawdown < 0,
+            ),
+        }
+    )
+    if trades is not None:
+        traded = np.nansum(np.abs(trades), axis=-1)
+        metrics["turnover"] = np.where(observed, traded, 0.0).sum(axis=-1) / count
+    return metrics
+
+
+def calculate_rolling_performance_metrics(
+    portfolio_returns: pd.DataFrame, performance_metric_params: dict[str, Any]
+) -> pd.DataFrame:
+    """Calculate the performance metrics over a rolling window.
+
+    The window statistics are differences of cumulative sums, so every window costs
+    the same regardless of its length. Only the drawdown needs the returns of each
+    window.
+
     Args:
     ----
         portfolio_returns (pd.DataFrame): DataFrame containing the returns of the
             portfolio that should be evaluated.
-        performance_metric_params (str): Dictionary containing the parameters for the
-            performance metrics calculation
+        performance_metric_params (dict[str, Any]): Dictionary containing the
+            parameters for the performance metrics calculation. "columns" selects
+            the returns column, "rolling_window" is the window length in dates
+            (defaults to 63) and "risk_free_rate" (optional) is the annual risk free
+            rate.
+
+    Raises:
+    ------
+        ValueError: If the window is not positive.
+
+    Returns:
+    -------
+        pd.DataFrame: One row per date and one column per metric. The metrics of a
+            date use the window ending at that date, the first dates without a full
+            window are NaN.
+
+    """
+    window = performance_metric_params.get("rolling_window", 63)
+    if window < 1:
+        raise ValueError(f"Invalid rolling window {window}")
+    risk_free_rate = performance_metric_params.get("risk_free_rate", 0.0)
+    returns = select_returns(portfolio_returns, performance_metric_params)
+    values = returns.to_numpy(dtype=float)
+    observed = ~np.isnan(values)
+    filled = np.where(observed, values, 0.0)
+    # Centering on the overall mean keeps the sum of squares differences accurate.
+    centered = np.where(observed, filled - filled[observed].mean(), 0.0)
+    log_wealth = np.cumsum(np.log1p(filled))
+
+    def window_sum(series: np.ndarray) -> np.ndarray:
+        cumulative = np.concatenate([[0.0], np.cumsum(series)])
+        return cumulative[window:] - cumulative[:-window]
+
+    n_windows = max(len(values) - window + 1, 0)
+    metrics = pd.DataFrame(np.nan, index=returns.index, columns=_WINDOW_METRICS)
+    if n_windows == 0:
+        return metrics
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        count = window_sum(observed)
+        centered_sum = window_sum(centered)
+        window_metrics = moment_metrics(
+            count,
+            window_sum(filled) / count,
+            window_sum(centered**2) - centered_sum**2 / count,
+            window_sum(downside_squares(filled, observed, risk_free_rate)),
+            risk_free_rate,
+        )
+        window_metrics["hit_rate"] = window_sum(filled > 0) / count
+    window_metrics["total_return"] = np.expm1(window_sum(np.log1p(filled)))
+
+    windows = np.lib.stride_tricks.sliding_window_view(log_wealth, window)
+    drawdown = np.expm1(windows - np.maximum.accumulate(windows, axis=-1))
+    window_observed = np.lib.stride_tricks.sliding_window_view(observed, window)
+    window_metrics["max_drawdown"] = np.where(window_observed, drawdown, 0.0).min(-1)
+
+    metrics.iloc[window - 1 :] = np.column_stack(
+        [window_metrics[column] for column in _WINDOW_METRICS]
+    )
+    return metrics
+
+
+def calculate_periodic_performance_metrics(
+    portfolio_returns: pd.DataFrame, performance_metric_params: dict[str, Any]
+) -> pd.DataFrame:
+    """Calculate the performance metrics per calendar year or month.
+
+    The returns are reduced per period with grouped sums, the drawdowns of all
+    periods come from one running maximum over the log wealth.
+
+    Args:
+    ----
+        portfolio_returns (pd.DataFrame): DataFrame containing the returns of the
+            portfolio that should be evaluated, with a sorted date index.
+        performance_metric_params (dict[str, Any]): Dictionary containing the
+            parameters for the performance metrics calculation. "columns" selects
+            the returns column, "frequency" is "year" (default) or "month" and
+            "risk_free_rate" (optional) is the annual risk free rate.
+
+    Raises:
+    ------
+        ValueError: If the frequency is unknown.
+
+    Returns:
+    -------
+        pd.DataFrame: One row per period and one column per metric.
+
+    """
+    frequency = performance_metric_params.get("frequency", "year")
+    if frequency not in PERIOD_FREQUENCIES:
+        raise ValueError(f"Invalid frequency '{frequency}'")
+    risk_free_rate = performance_metric_params.get("risk_free_rate", 0.0)
+    returns = select_returns(portfolio_returns, performance_metric_params)
+    dates = pd.DatetimeIndex(returns.index)
+    codes = dates.year.to_numpy() * 12
+    if frequency == "month":
+        codes = codes + dates.month.to_numpy() - 1
+    periods, group = np.unique(codes, return_inverse=True)
+    starts = np.flatnonzero(np.diff(group, prepend=-1))
+
+    values = returns.to_numpy(dtype=float)
+    observed = ~np.isnan(values)
+    filled = np.where(observed, values, 0.0)
+    n_periods = len(periods)
+
+    def period_sum(series: np.ndarray) -> np.ndarray:
+        return np.bincount(group, weights=series, minlength=n_periods)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        count = period_sum(observed)
+        mean = period_sum(filled) / count
+        deviations = np.where(observed, filled - mean[group], 0.0)
+        metrics = moment_metrics(
+            count,
+            mean,
+            period_sum(deviations**2),
+            period_sum(downside_squares(filled, observed, risk_free_rate)),
+            risk_free_rate,
+        )
+        metrics["hit_rate"] = period_sum(filled > 0) / count
+    log_returns = np.log1p(filled)
+    metrics["total_return"] = np.expm1(period_sum(log_returns))
+
+    # Offsetting every period above the range of the previous ones restarts the
+    # running maximum at each period boundary.
+    log_wealth = np.cumsum(log_returns)
+    offset = group * (np.ptp(log_wealth) + 1) if len(log_wealth) else 0
+    peak = np.maximum.accumulate(log_wealth + offset) - offset
+    drawdown = np.where(observed, np.expm1(log_wealth - peak), 0.0)
+    metrics["max_drawdown"] = np.minimum.reduceat(drawdown, starts)
+    metrics["n_observations"] = count.astype(int)
+
+    if frequency == "year":
+        index = pd.Index(periods // 12, name="year")
+    else:
+        index = pd.PeriodIndex.from_ordinals(periods - 1970 * 12, freq="M").rename(
+            "month"
+        )
+    return pd.DataFrame(metrics, index=index).loc[
+        :, [*_WINDOW_METRICS, "n_observations"]
+    ]
+
+
+def select_returns(
+    portfolio_returns: pd.DataFrame, performance_metric_params: dict[str, Any]
+) -> pd.Series:
+    """Select the returns column that should be evaluated.
+
+    Args:
+    ----
+        portfolio_returns (pd.DataFrame): DataFrame containing the returns.
+        performance_metric_params (dict[str, Any]): Dictionary with the key
+            "columns", either a column name or a list whose first column is used.
 
     Returns:
     -------
-        pd.DataFrame: DataFrame containing the calculated performance metrics.
+        pd.Series: The selected returns.
 
     """
     columns = performance_metric_params["columns"]
-    portfolio_returns = portfolio_returns.loc[:, columns]
+    if isinstance(columns, str):
+        return portfolio_returns[columns]
+    return portfolio_returns[columns[0]]
+
+
+def downside_squares(
+    returns: np.ndarray, observed: np.ndarray, risk_free_rate: float
+) -> np.ndarray:
+    """Square the shortfall of the returns below the daily risk free rate.
+
+    Args:
+    ----
+        returns (np.ndarray): Returns with missing values replaced by zero.
+        observed (np.ndarray): Mask of the non-missing returns.
+        risk_free_rate (float): The annual risk free rate.
+
+    Returns:
+    -------
+        np.ndarray: Squared shortfalls, zero for missing returns.
+
+    """
+    shortfall = np.minimum(returns - risk_free_rate / TRADING_DAYS_PER_YEAR, 0.0)
+    return np.where(observed, shortfall**2, 0.0)
+
+
+def moment_metrics(
+    count: np.ndarray,
+    mean: np.ndarray,
+    squared_deviations: np.ndarray,
+    downside_squares: np.ndarray,
+    risk_free_rate: float,
+) -> dict[str, np.ndarray]:
+    """Derive the return based metrics from reduced sums.
+
+    Args:
+    ----
+        count (np.ndarray): Number of returns.
+        mean (np.ndarray): Mean return.
+        squared_deviations (np.ndarray): Sum of the squared deviations from the
+            mean.
+        downside_squares (np.ndarray): Sum of the squared shortfalls below the
+            risk free rate.
+        risk_free_rate (float): The annual risk free rate.
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: "mean_return", "variance_return" (the standard
+            deviation, named for backwards compatibility), "volatility",
+            "sharpe_ratio" and "sortino_ratio".
+
+    """
+    annualization = np.sqrt(TRADING_DAYS_PER_YEAR)
+    std = np.sqrt(np.maximum(squared_deviations, 0.0) / (count - 1))
+    excess = mean - risk_free_rate / TRADING_DAYS_PER_YEAR
     return {
-        "mean_return": mean_return(portfolio_returns),
-        "variance_return": std_deviation(portfolio_returns),
-        "sharpe_ratio": sharpe_ratio(portfolio_returns),
-        "cagr": cagr(portfolio_returns),
-        "max_drawdown": max_drawdown(portfolio_returns),
-        "sharpe_ratio": sharpe_ratio(portfolio_returns),
+        "mean_return": mean,
+        "variance_return": std,
+        "volatility": std * annualization,
+        "sharpe_ratio": excess / std * annualization,
+        "sortino_ratio": excess / np.sqrt(downside_squares / count) * annualization,
     }
@@ -0,0 +1,274 @@
+"""Incremental backtest updates for appended trading days.
+
+A daily refresh only adds a few dates to the prices and weights. Instead of
+recomputing the whole history, the updates below persist a small running state,
+i.e. the last cumulative value, the running peak and the Welford accumulators of
+the returns, and extend the returns and the metrics by the new dates only. The
+states are plain JSON serializable dictionaries, so they can be stored by any
+dataset. Within floating point tolerance the results equal a full recompute with
+`adjust_returns_for_trading_costs` and `calculate_performance_metrics`.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.costs import align_market_data, transaction_costs
+from common.backtesting.functions.engine import (
+    align_rows,
+    cost_adjustment,
+    signal_changes,
+)
+from common.backtesting.functions.evaluation import (
+    downside_squares,
+    moment_metrics,
+    select_returns,
+)
+from common.backtesting.functions.returns import create_portfolio_returns
+
+
+def update_portfolio_returns(
+    prices: pd.DataFrame,
+    weights: pd.DataFrame,
+    trading_cost_params: dict[str, Any],
+    backtest_state: Optional[dict[str, Any]] = None,
+    market_data: Optional[dict[str, pd.DataFrame]] = None,
+) -> tuple[pd.DataFrame, dict[str, Any]]:
+    """Extend the adjusted portfolio returns by the dates after the last update.
+
+    Only the dates after the last update and the date before them (for the price
+    returns and the weight changes) are used.
+
+    Args:
+    ----
+        prices (pd.DataFrame): Price matrix with a sorted date index and the tickers
+            as the columns.
+        weights (pd.DataFrame): Weights with a sorted date index and the tickers as
+            the columns. The traded amounts are the weight changes.
+        trading_cost_params (dict[str, Any]): Dictionary with the trading costs, see
+            `transaction_costs`.
+        backtest_state (dict[str, Any], optional): State returned by the previous
+            update. An empty or missing state starts a new backtest.
+        market_data (dict[str, pd.DataFrame], optional): Market data from
+            `create_market_data`, needed by the price based cost models.
+
+    Returns:
+    -------
+        tuple[pd.DataFrame, dict[str, Any]]: The new rows with the columns of
+            `adjust_returns_for_trading_costs` and the updated state.
+
+    """
+    last_date = _last_date(backtest_state)
+    initial_value = backtest_state["cumulative"] if last_date is not None else 1.0
+    if last_date is not None:
+        prices = prices.iloc[_previous_position(prices.index, last_date) :]
+        weights = weights.iloc[_previous_position(weights.index, last_date) :]
+
+    returns = create_portfolio_returns(prices, weights)
+    if last_date is not None:
+        returns = returns.loc[returns.index > last_date]
+    index = returns.index
+
+    weight_values = weights.to_numpy(dtype=float)
+    backtest_data = {
+        "trades": align_rows(signal_changes(weight_values), weights.index, index),
+        "weights": align_rows(weight_values, weights.index, index),
+    }
+    if market_data is not None:
+        backtest_data.update(align_market_data(market_data, index, weights.columns))
+    adjustment = cost_adjustment(
+        returns["Portfolio Returns"].to_numpy(dtype=float),
+        transaction_costs(backtest_data, trading_cost_params),
+        initial_value,
+    )
+    update = returns.assign(**adjustment)
+
+    if update.empty:
+        return update, dict(backtest_state or {})
+    return update, {
+        "last_date": update.index[-1].isoformat(),
+        "cumulative": float(adjustment["Cumulative Returns"][-1]),
+    }
+
+
+def update_performance_metrics(
+    portfolio_returns: pd.DataFrame,
+    performance_metric_params: dict[str, Any],
+    metric_state: Optional[dict[str, Any]] = None,
+    signals: Optional[pd.DataFrame] = None,
+) -> tuple[dict[str, float], dict[str, Any]]:
+    """Update the performance metrics with the returns after the last update.
+
+    The mean and the variance are merged with Welford's (Chan's batch) update, the
+    drawdown continues from the persisted running peak.
+
+    Args:
+    ----
+        portfolio_returns (pd.DataFrame): New rows of the portfolio returns, e.g.
+            from `update_portfolio_returns`. Dates up to the last update are
+            ignored.
+        performance_metric_params (dict[str, Any]): Dictionary containing the
+            parameters for the performance metrics calculation, see
+            `calculate_performance_metrics`.
+        metric_state (dict[str, Any], optional): State returned by the previous
+            update. An empty or missing state starts new metrics.
+        signals (pd.DataFrame, optional): Signals of the strategy including at least
+            the date before the new rows. If given, the average turnover is added to
+            the metrics.
+
+    Returns:
+    -------
+        tuple[dict[str, float], dict[str, Any]]: The metrics of the whole history,
+            as returned by `calculate_performance_metrics`, and the updated state.
+
+    """
+    risk_free_rate = performance_metric_params.get("risk_free_rate", 0.0)
+    state = _initial_metric_state() if not metric_state else dict(metric_state)
+    last_date = _last_date(metric_state)
+    returns = select_returns(portfolio_returns, performance_metric_params)
+    if last_date is not None:
+        returns = returns.loc[returns.index > last_date]
+
+    values = returns.to_numpy(dtype=float)
+    observed = ~np.isnan(values)
+    filled = np.where(observed, values, 0.0)
+    if observed.any():
+        count = int(observed.sum())
+        mean = filled.sum() / count
+        squared_deviations = (np.where(observed, values - mean, 0.0) ** 2).sum()
+        total_count = state["count"] + count
+        delta = mean - state["mean"]
+        state["mean"] += delta * count / total_count
+        state["m2"] += squared_deviations + delta**2 * state["count"] * count / (
+            total_count
+        )
+        state["count"] = total_count
+        state["downside_squares"] += float(
+            downside_squares(filled, observed, risk_free_rate).sum()
+        )
+        state["positive_count"] += int((filled > 0).sum())
+        dates = returns.index[observed]
+        state["first_date"] = state["first_date"] or dates[0].isoformat()
+        state["last_observed_date"] = dates[-1].isoformat()
+    if signals is not None and len(returns):
+        trades = align_rows(
+            signal_changes(signals.to_numpy(dtype=float)), signals.index, returns.index
+        )
+        state["turnover_sum"] += float(
+            np.where(observed, np.nansum(np.abs(trades), axis=-1), 0.0).sum()
+        )
+
+    cumulative = state["cumulative"] * np.cumprod(1 + filled)
+    if len(cumulative):
+        previous_peak = -np.inf if state["peak"] is None else state["peak"]
+        peak = np.maximum.accumulate(np.maximum(cumulative, previous_peak))
+        drawdown = np.where(observed, cumulative / peak - 1, 0.0)
+        state["max_drawdown"] = min(state["max_drawdown"], float(drawdown.min()))
+        state["cumulative"] = float(cumulative[-1])
+        state["peak"] = float(peak[-1])
+        state["last_date"] = returns.index[-1].isoformat()
+
+    metrics = _state_metrics(state, risk_free_rate)
+    if signals is not None:
+        metrics["turnover"] = (
+            state["turnover_sum"] / state["count"] if state["count"] else np.nan
+        )
+    return metrics, state
+
+
+def _state_metrics(state: dict[str, Any], risk_free_rate: float) -> dict[str, float]:
+    """Derive the performance metrics from the running state.
+
+    Args:
+    ----
+        state (dict[str, Any]): Metric state.
+        risk_free_rate (float): The annual risk free rate.
+
+    Returns:
+    -------
+        dict[str, float]: The performance metrics.
+
+    """
+    count = np.float64(state["count"])
+    with np.errstate(divide="ignore", invalid="ignore"):
+        metrics = moment_metrics(
+            count,
+            np.float64(state["mean"]) if count else np.float64(np.nan),
+            np.float64(state["m2"]),
+            np.float64(state["downside_squares"]),
+            risk_free_rate,
+        )
+        metrics["hit_rate"] = state["positive_count"] / count
+        total_period = np.nan
+        if count:
+            total_period = (
+                pd.Timestamp(state["last_observed_date"])
+                - pd.Timestamp(state["first_date"])
+            ).days / 365.25
+        cagr_value = np.float64(state["cumulative"]) ** (1 / total_period) - 1
+    max_drawdown = state["max_drawdown"]
+    metrics.update(
+        {
+            "cagr": cagr_value,
+            "max_drawdown": max_drawdown,
+            "calmar_ratio": cagr_value / -max_drawdown if max_drawdown < 0 else np.nan,
+        }
+    )
+    return {name: float(value) for name, value in metrics.items()}
+
+
+def _initial_metric_state() -> dict[str, Any]:
+    """Create the metric state of an empty history.
+
+    Returns
+    -------
+        dict[str, Any]: Metric state without any returns.
+
+    """
+    return {
+        "last_date": None,
+        "first_date": None,
+        "last_observed_date": None,
+        "count": 0,
+        "mean": 0.0,
+        "m2": 0.0,
+        "downside_squares": 0.0,
+        "positive_count": 0,
+        "turnover_sum": 0.0,
+        "cumulative": 1.0,
+        "peak": None,
+        "max_drawdown": 0.0,
+    }
+
+
+def _last_date(state: Optional[dict[str, Any]]) -> Optional[pd.Timestamp]:
+    """Get the last date covered by a state.
+
+    Args:
+    ----
+        state (dict[str, Any], optional): Backtest or metric state.
+
+    Returns:
+    -------
+        pd.Timestamp, optional: The last date, None for an empty state.
+
+    """
+    if not state or state.get("last_date") is None:
+        return None
+    return pd.Timestamp(state["last_date"])
+
+
+def _previous_position(index: pd.Index, last_date: pd.Timestamp) -> int:
+    """Get the position of the last row up to a date.
+
+    Args:
+    ----
+        index (pd.Index): Sorted date index.
+        last_date (pd.Timestamp): Date of the last update.
+
+    Returns:
+    -------
+        int: Position of the row, zero if all rows are later.
+
+    """
+    return max(index.searchsorted(last_date, side="right") - 1, 0)
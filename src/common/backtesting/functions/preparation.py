@@ -0,0 +1,212 @@
+"""Functions to prepare the inputs of a backtest."""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def create_price_matrix(
+    price_data: pd.DataFrame, price_matrix_params: dict[str, str]
+) -> pd.DataFrame:
+    """Turn the long price data into a date x ticker price matrix.
+
+    Args:
+    ----
+        price_data (pd.DataFrame): Long price data with one row per date and ticker.
+        price_matrix_params (dict[str, str]): Parameters for the price matrix. The
+            key "price_column" names the price column (defaults to "adj_close"),
+            "date_column" and "id_column" name the date and ticker columns (default
+            to "date" and "stock_ticker").
+
+    Returns:
+    -------
+        pd.DataFrame: Price matrix with a sorted date index and the tickers as the
+            columns.
+
+    """
+    date_column = price_matrix_params.get("date_column", "date")
+    id_column = price_matrix_params.get("id_column", "stock_ticker")
+    price_column = price_matrix_params.get("price_column", "adj_close")
+
+    dates, date_codes = np.unique(
+        pd.to_datetime(price_data[date_column]).to_numpy(), return_inverse=True
+    )
+    tickers, ticker_codes = np.unique(
+        price_data[id_column].to_numpy(), return_inverse=True
+    )
+    prices = np.full((len(dates), len(tickers)), np.nan)
+    prices[date_codes, ticker_codes] = price_data[price_column].to_numpy(dtype=float)
+    return pd.DataFrame(
+        prices, index=pd.DatetimeIndex(dates), columns=pd.Index(tickers)
+    )
+
+
+def signals_to_weights(signals: pd.DataFrame) -> pd.DataFrame:
+    """Scale the signals of every date to a gross exposure of one.
+
+    Args:
+    ----
+        signals (pd.DataFrame): Signals with the dates as the index and the tickers
+            as the columns.
+
+    Returns:
+    -------
+        pd.DataFrame: Weights with the same shape as the signals. Dates without any
+            signal get zero weights.
+
+    """
+    values = signals.to_numpy(dtype=float)
+    gross_exposure = np.abs(values).sum(axis=1, keepdims=True)
+    weights = np.divide(
+        values, gross_exposure, out=np.zeros_like(values), where=gross_exposure > 0
+    )
+    return pd.DataFrame(weights, index=signals.index, columns=signals.columns)
+
+
+def slice_prices_to_signals(
+    prices: pd.DataFrame, signals: pd.DataFrame
+) -> pd.DataFrame:
+    """Restrict the prices to the period covered by the signals.
+
+    The bar before the first signal date is kept, so that the return of the first
+    signal date can be calculated.
+
+    Args:
+    ----
+        prices (pd.DataFrame): Price matrix with a sorted date index.
+        signals (pd.DataFrame): Signals with a date index.
+
+    Returns:
+    -------
+        pd.DataFrame: Prices from the bar before the first signal date up to the
+            last signal date.
+
+    """
+    start = max(prices.index.searchsorted(signals.index.min()) - 1, 0)
+    stop = prices.index.searchsorted(signals.index.max(), side="right")
+    return prices.iloc[start:stop]
+
+
+def combine_cutoff_signals(signals: list[pd.DataFrame]) -> pd.DataFrame:
+    """Stack the signals of several cutoffs into one date-indexed signal matrix.
+
+    Tickers missing from a cutoff get a zero signal. If the signals of several
+    cutoffs overlap, the signals of the later cutoff are kept.
+
+    Args:
+    ----
+        signals (list[pd.DataFrame]): Signals of each cutoff, ordered by cutoff,
+            with the dates as the index and the tickers as the columns.
+
+    Returns:
+    -------
+        pd.DataFrame: Signals with a sorted datetime index.
+
+    """
+    combined = pd.concat(signals).fillna(0)
+    combined.index = pd.to_datetime(combined.index)
+    combined = combined[~combined.index.duplicated(keep="last")]
+    return combined.sort_index(kind="stable")
+
+
+def selection_to_signals_and_weights(
+    selection: pd.DataFrame, stock_price_params: dict[str, Any]
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Split the output of the stock selection into signals and weights.
+
+    Args:
+    ----
+        selection (pd.DataFrame): Output of the stock selection with the dates as
+            the index and the tickers as the columns.
+        stock_price_params (dict[str, Any]): Stock selection parameters. For the
+            "indicator" weighting (default) the selection holds signals, which are
+            scaled to weights, otherwise it already holds the weights.
+
+    Returns:
+    -------
+        tuple[pd.DataFrame, pd.DataFrame]: The signals and the weights.
+
+    """
+    if stock_price_params.get("weighting", "indicator") == "indicator":
+        return selection, signals_to_weights(selection)
+    return np.sign(selection), selection
+
+
+def create_walk_forward_weights(
+    signals_concatenated: pd.DataFrame, stock_price_params: dict[str, Any]
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Stitch the stacked signals of all cutoffs into one date-indexed matrix.
+
+    The rows of all cutoffs are sorted by date once. If several cutoffs have a row
+    for the same date, the row of the later cutoff is kept, so every date is traded
+    on the latest out-of-sample signals.
+
+    Args:
+    ----
+        signals_concatenated (pd.DataFrame): Signals of all cutoffs, ordered by
+            cutoff, with a "timestamp" column and one column per ticker.
+        stock_price_params (dict[str, Any]): Stock selection parameters, see
+            `selection_to_signals_and_weights`.
+
+    Returns:
+    -------
+        tuple[pd.DataFrame, pd.DataFrame]: The signals and the weights with a
+            sorted datetime index. Missing signals are zero.
+
+    """
+    return selection_to_signals_and_weights(
+        _stitch_cutoffs(signals_concatenated), stock_price_params
+    )
+
+
+def create_walk_forward_portfolio(
+    portfolio_concatenated: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Stitch the stacked portfolio weights of all cutoffs into one matrix.
+
+    Like `create_walk_forward_weights`, but for the weights of the portfolio
+    building, which are used as they are.
+
+    Args:
+    ----
+        portfolio_concatenated (pd.DataFrame): Weights of all cutoffs, ordered by
+            cutoff, with a "timestamp" column and one column per ticker.
+
+    Returns:
+    -------
+        tuple[pd.DataFrame, pd.DataFrame]: The signals (the signs of the weights)
+            and the weights with a sorted datetime index.
+
+    """
+    weights = _stitch_cutoffs(portfolio_concatenated)
+    return np.sign(weights), weights
+
+
+def _stitch_cutoffs(concatenated: pd.DataFrame) -> pd.DataFrame:
+    """Keep the row of the latest cutoff for every date.
+
+    Args:
+    ----
+        concatenated (pd.DataFrame): Rows of all cutoffs, ordered by cutoff, with a
+            "timestamp" column and one column per ticker.
+
+    Returns:
+    -------
+        pd.DataFrame: One row per date with a sorted datetime index. Missing values
+            are zero.
+
+    """
+    dates = pd.to_datetime(concatenated["timestamp"]).to_numpy()
+    tickers = concatenated.columns.drop("timestamp")
+    order = np.argsort(dates, kind="stable")
+    sorted_dates = dates[order]
+    last_of_date = np.append(sorted_dates[1:] != sorted_dates[:-1], True)
+    rows = order[last_of_date]
+
+    values = concatenated[tickers].to_numpy(dtype=float)[rows]
+    return pd.DataFrame(
+        np.nan_to_num(values),
+        index=pd.DatetimeIndex(dates[rows], name="timestamp"),
+        columns=tickers,
+    )
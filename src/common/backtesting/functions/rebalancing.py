@@ -0,0 +1,208 @@
+"""Rebalancing simulation with drifting positions.
+
+Between two rebalances the positions are held and their weights drift with the
+prices. The weights of a holding period follow from the cumulative growth of each
+ticker since the last rebalance, so every period is computed with array operations
+and only threshold-triggered rebalances need a loop over the holding periods.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.costs import align_market_data, transaction_costs
+from common.backtesting.functions.engine import (
+    align_frames,
+    cost_adjustment,
+    simple_returns,
+)
+
+
+def simulate_rebalancing(
+    prices: pd.DataFrame,
+    target_weights: pd.DataFrame,
+    trading_cost_params: dict[str, Any],
+    rebalance_params: dict[str, Any],
+    market_data: Optional[dict[str, pd.DataFrame]] = None,
+) -> pd.DataFrame:
+    """Simulate a portfolio that only trades on rebalance dates.
+
+    On a rebalance date the portfolio is traded to the latest target weights. On
+    the other dates the positions are held, so the weights drift with the prices
+    and no trading costs arise. A daily schedule reproduces
+    `create_portfolio_returns`.
+
+    Args:
+    ----
+        prices (pd.DataFrame): Price matrix with a sorted date index and the tickers
+            as the columns.
+        target_weights (pd.DataFrame): Target weights with a date index and the
+            tickers as the columns. A target stays valid until the next one.
+        trading_cost_params (dict[str, Any]): Dictionary with the trading costs, see
+            `transaction_costs`.
+        rebalance_params (dict[str, Any]): "schedule" is "targets" (rebalance when
+            the target weights change, default), "daily" or a pandas period
+            frequency such as "W-FRI" or "M" (rebalance on the first date of every
+            period). "threshold" (optional) additionally rebalances when the
+            one-way turnover needed to reach the target exceeds it.
+        market_data (dict[str, pd.DataFrame], optional): Market data from
+            `create_market_data`, needed by the price based cost models.
+
+    Returns:
+    -------
+        pd.DataFrame: One row per date with the "Portfolio Returns", the columns of
+            `adjust_returns_for_trading_costs`, the "Turnover" and a "Rebalance"
+            flag.
+
+    """
+    index, columns, (price_values, target_values) = align_frames(prices, target_weights)
+    returns = np.nan_to_num(simple_returns(price_values))
+    has_target = ~np.isnan(target_values).all(axis=1)
+    target_positions = np.maximum.accumulate(
+        np.where(has_target, np.arange(len(index)), -1)
+    )
+    targets = np.nan_to_num(target_values[np.maximum(target_positions, 0)])
+    targets[target_positions < 0] = 0
+
+    rebalance = _rebalance_schedule(
+        index, targets, has_target, rebalance_params.get("schedule", "targets")
+    ) & (target_positions >= 0)
+    log_growth = np.cumsum(np.log1p(returns), axis=0)
+    threshold = rebalance_params.get("threshold")
+    if threshold is not None:
+        rebalance = _add_threshold_rebalances(log_growth, targets, rebalance, threshold)
+
+    holdings = _holdings(log_growth, targets, rebalance)
+    portfolio_returns = np.sum(holdings * returns, axis=1)
+    drifted = np.zeros(holdings.shape)
+    drifted[1:] = (
+        holdings[:-1] * (1 + returns[:-1]) / (1 + portfolio_returns[:-1, None])
+    )
+    trades = np.where(rebalance[:, None], holdings - drifted, 0.0)
+
+    backtest_data = {"trades": trades, "weights": holdings}
+    if market_data is not None:
+        backtest_data.update(align_market_data(market_data, index, columns))
+    adjustment = cost_adjustment(
+        portfolio_returns, transaction_costs(backtest_data, trading_cost_params)
+    )
+    return pd.DataFrame(
+        {
+            "Portfolio Returns": portfolio_returns,
+            **adjustment,
+            "Turnover": np.abs(trades).sum(axis=1),
+            "Rebalance": rebalance,
+        },
+        index=index,
+    )
+
+
+def _rebalance_schedule(
+    index: pd.Index, targets: np.ndarray, has_target: np.ndarray, schedule: str
+) -> np.ndarray:
+    """Flag the scheduled rebalance dates.
+
+    Args:
+    ----
+        index (pd.Index): Dates of the simulation.
+        targets (np.ndarray): Forward filled target weights.
+        has_target (np.ndarray): Flags of the dates with a new target.
+        schedule (str): "targets", "daily" or a pandas period frequency.
+
+    Returns:
+    -------
+        np.ndarray: One flag per date.
+
+    """
+    if schedule == "daily":
+        return np.ones(len(index), dtype=bool)
+    if schedule == "targets":
+        changed = np.ones(len(index), dtype=bool)
+        changed[1:] = (targets[1:] != targets[:-1]).any(axis=1)
+        first_target = np.zeros(len(index), dtype=bool)
+        first_target[np.argmax(has_target)] = has_target.any()
+        return (has_target & changed) | first_target
+    periods = pd.DatetimeIndex(index).to_period(schedule).asi8
+    first_of_period = np.ones(len(index), dtype=bool)
+    first_of_period[1:] = periods[1:] != periods[:-1]
+    return first_of_period
+
+
+def _holdings(
+    log_growth: np.ndarray, targets: np.ndarray, rebalance: np.ndarray
+) -> np.ndarray:
+    """Calculate the weights held on every date.
+
+    The weights of a date apply to its return. On a rebalance date they are the
+    targets, afterwards they are the targets scaled with the growth of each ticker
+    relative to the growth of the portfolio since the rebalance.
+
+    Args:
+    ----
+        log_growth (np.ndarray): Cumulative log returns per date and ticker.
+        targets (np.ndarray): Forward filled target weights.
+        rebalance (np.ndarray): Flags of the rebalance dates.
+
+    Returns:
+    -------
+        np.ndarray: Held weights per date and ticker, zero before the first
+            rebalance.
+
+    """
+    starts = np.maximum.accumulate(np.where(rebalance, np.arange(len(rebalance)), -1))
+    previous_growth = np.zeros(log_growth.shape)
+    previous_growth[1:] = log_growth[:-1]
+    period_weights = targets[np.maximum(starts, 0)]
+    period_weights[starts < 0] = 0
+    growth = np.exp(previous_growth - previous_growth[np.maximum(starts, 0)])
+    value = 1 + np.sum(period_weights * (growth - 1), axis=1, keepdims=True)
+    return period_weights * growth / value
+
+
+def _add_threshold_rebalances(
+    log_growth: np.ndarray,
+    targets: np.ndarray,
+    rebalance: np.ndarray,
+    threshold: float,
+) -> np.ndarray:
+    """Add the rebalances triggered by the drift from the target weights.
+
+    Every holding period is computed at once, the loop only runs once per
+    rebalance.
+
+    Args:
+    ----
+        log_growth (np.ndarray): Cumulative log returns per date and ticker.
+        targets (np.ndarray): Forward filled target weights.
+        rebalance (np.ndarray): Flags of the scheduled rebalance dates.
+        threshold (float): Maximum one-way turnover to the target weights.
+
+    Returns:
+    -------
+        np.ndarray: Flags of all rebalance dates.
+
+    """
+    rebalance = rebalance.copy()
+    scheduled = np.flatnonzero(rebalance)
+    if len(scheduled) == 0:
+        return rebalance
+    n_dates = len(rebalance)
+    start = scheduled[0]
+    while start < n_dates:
+        next_scheduled = np.searchsorted(scheduled, start, side="right")
+        stop = scheduled[next_scheduled] if next_scheduled < len(scheduled) else n_dates
+        period_rebalance = np.zeros(stop - start, dtype=bool)
+        period_rebalance[0] = True
+        holdings = _holdings(
+            log_growth[start:stop] - (log_growth[start - 1] if start > 0 else 0),
+            targets[start:stop],
+            period_rebalance,
+        )
+        drift = np.abs(holdings - targets[start:stop]).sum(axis=1) / 2
+        triggered = np.flatnonzero(drift[1:] > threshold)
+        if len(triggered):
+            start += triggered[0] + 1
+            rebalance[start] = True
+        else:
+            start = stop
+    return rebalance
@@ -0,0 +1,138 @@
+"""Resampling functions for confidence intervals of the performance metrics.
+
+All resamples are drawn as one resamples x dates array of positions into the
+returns, and the metrics of all resamples are evaluated by the array metrics kernel
+in one call per chunk of resamples.
+"""
+
+from typing import Any, Optional
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.evaluation import performance_metrics_array
+
+RESAMPLING_METHODS = ("stationary", "block", "permutation")
+
+
+def resample_positions(
+    n_dates: int,
+    n_resamples: int,
+    method: str = "stationary",
+    block_length: float = 20,
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Draw the positions of resampled return series.
+
+    The "stationary" bootstrap starts a new block at every date with probability
+    1 / block_length, the "block" bootstrap draws blocks of a fixed length. Blocks
+    wrap around the end of the series. The "permutation" method shuffles the dates
+    of every resample, which keeps the return distribution and only changes the path
+    dependent metrics such as the drawdown.
+
+    Args:
+    ----
+        n_dates (int): Number of dates of the series.
+        n_resamples (int): Number of resampled series.
+        method (str, optional): "stationary", "block" or "permutation". Defaults to
+            "stationary".
+        block_length (float, optional): (Expected) block length in dates. Defaults
+            to 20.
+        rng (np.random.Generator, optional): Random number generator. Defaults to a
+            new unseeded generator.
+
+    Raises:
+    ------
+        ValueError: If the method is unknown or the block length is below one.
+
+    Returns:
+    -------
+        np.ndarray: Positions with one resample per row and one date per column.
+
+    """
+    if method not in RESAMPLING_METHODS:
+        raise ValueError(f"Invalid resampling method '{method}'")
+    if block_length < 1:
+        raise ValueError(f"Invalid block length {block_length}")
+    rng = np.random.default_rng() if rng is None else rng
+
+    if method == "permutation":
+        return rng.permuted(
+            np.broadcast_to(np.arange(n_dates), (n_resamples, n_dates)), axis=-1
+        )
+
+    dates = np.arange(n_dates)
+    if method == "stationary":
+        block_starts = rng.random((n_resamples, n_dates)) < 1 / block_length
+        block_starts[:, 0] = True
+    else:
+        block_starts = np.broadcast_to(
+            dates % int(block_length) == 0, (n_resamples, n_dates)
+        )
+    # Date of the latest block start and the random first position of each block.
+    start_dates = np.maximum.accumulate(np.where(block_starts, dates, 0), axis=-1)
+    first_positions = rng.integers(n_dates, size=(n_resamples, n_dates))
+    return (
+        np.take_along_axis(first_positions, start_dates, axis=-1) + dates - start_dates
+    ) % n_dates
+
+
+def bootstrap_performance_metrics(
+    portfolio_returns: pd.DataFrame, bootstrap_params: dict[str, Any]
+) -> pd.DataFrame:
+    """Estimate confidence intervals of the performance metrics by resampling.
+
+    Args:
+    ----
+        portfolio_returns (pd.DataFrame): DataFrame containing the returns of the
+            portfolio that should be evaluated.
+        bootstrap_params (dict[str, Any]): Dictionary with the keys "column" (the
+            returns column, defaults to "Adjusted Portfolio Returns"), "method"
+            (see `resample_positions`), "n_resamples", "block_length",
+            "confidence_level" (defaults to 0.95), "seed", "risk_free_rate" and
+            "chunk_size" (resamples evaluated per call, defaults to 1000).
+
+    Returns:
+    -------
+        pd.DataFrame: One row per metric with the point estimate, the standard error
+            and the lower and upper bound of the confidence interval.
+
+    """
+    column = bootstrap_params.get("column", "Adjusted Portfolio Returns")
+    returns = portfolio_returns[column].dropna()
+    values = returns.to_numpy(dtype=float)
+    dates = pd.DatetimeIndex(returns.index)
+    risk_free_rate = bootstrap_params.get("risk_free_rate", 0.0)
+    n_resamples = bootstrap_params.get("n_resamples", 1000)
+    chunk_size = bootstrap_params.get("chunk_size", 1000)
+    rng = np.random.default_rng(bootstrap_params.get("seed"))
+
+    estimates = performance_metrics_array(values, dates, risk_free_rate)
+    chunks = []
+    for start in range(0, n_resamples, chunk_size):
+        positions = resample_positions(
+            len(values),
+            min(chunk_size, n_resamples - start),
+            bootstrap_params.get("method", "stationary"),
+            bootstrap_params.get("block_length", 20),
+            rng,
+        )
+        chunks.append(
+            performance_metrics_array(values[positions], dates, risk_free_rate)
+        )
+    resampled = {
+        name: np.concatenate([chunk[name] for chunk in chunks]) for name in estimates
+    }
+
+    alpha = 1 - bootstrap_params.get("confidence_level", 0.95)
+    metrics = list(estimates)
+    samples = np.column_stack([resampled[name] for name in metrics])
+    lower, upper = np.nanquantile(samples, [alpha / 2, 1 - alpha / 2], axis=0)
+    return pd.DataFrame(
+        {
+            "estimate": [estimates[name][0] for name in metrics],
+            "std_error": np.nanstd(samples, axis=0, ddof=1),
+            "lower": lower,
+            "upper": upper,
+        },
+        index=pd.Index(metrics, name="metric"),
+    )
@@ -1,6 +1,20 @@
 """Functions for return creation."""
 
+from typing import Any, Optional
+
 import pandas as pd
+from common.backtesting.functions.costs import (
+    align_market_data,
+    transaction_costs,
+)
+from common.backtesting.functions.engine import (
+    align_frames,
+    align_rows,
+    cost_adjustment,
+    portfolio_returns,
+    signal_changes,
+    simple_returns,
+)
 
 
 def create_portfolio_returns(
@@ -8,6 +22,9 @@ def create_portfolio_returns(
 ) -> pd.DataFrame:
     """Creation of portfolio returns.
 
+    Prices and weights are aligned once on the union of their dates and tickers,
+    the returns are then calculated on the aligned arrays.
+
     Args:
     ----
         prices (pd.DataFrame): Price dataframe with date index and stocks as the
@@ -21,18 +38,30 @@ def create_portfolio_returns(
             "Portfolio Returns".
 
     """
-    returns = prices.pct_change(fill_method=None)
-    portfolio_returns = (returns * weights).sum(axis=1)
-    return portfolio_returns.to_frame(name="Portfolio Returns")
+    returns = pd.DataFrame(
+        simple_returns(prices.to_numpy(dtype=float)),
+        index=prices.index,
+        columns=prices.columns,
+    )
+    index, _, (returns_array, weights_array) = align_frames(returns, weights)
+    return pd.DataFrame(
+        {"Portfolio Returns": portfolio_returns(returns_array, weights_array)},
+        index=index,
+    )
 
 
 def adjust_returns_for_trading_costs(
     portfolio_returns: pd.DataFrame,
     signals: pd.DataFrame,
-    trading_cost_params: dict[str, float],
+    trading_cost_params: dict[str, Any],
+    weights: Optional[pd.DataFrame] = None,
+    market_data: Optional[dict[str, pd.DataFrame]] = None,
 ) -> pd.DataFrame:
     """Adjust the portfolio returns for trading costs.
 
+    The input DataFrame is not modified. If the weights are given, the traded
+    amounts are the weight changes, otherwise the signal changes.
+
     Args:
     ----
         portfolio_returns (pd.DataFrame): Portfolio returns. DataFrame with one
@@ -40,9 +69,14 @@ def adjust_returns_for_trading_costs(
         signals (pd.DataFrame): Signals for the trades. This DataFrame contains the
             date as the index and the stocks on the columns. The signals are in the
             cells.
-        trading_cost_params (dict[str, float]): Dictionary with the trading costs.
-            The key is "bp_trading_cost" and the value is the trading cost in basis
-            points.
+        trading_cost_params (dict[str, Any]): Dictionary with the trading costs.
+            "bp_trading_cost" is a flat trading cost in basis points and
+            "cost_models" configures further cost models (see
+            `transaction_costs`).
+        weights (pd.DataFrame, optional): Weights with the same layout as the
+            signals.
+        market_data (dict[str, pd.DataFrame], optional): Market data from
+            `create_market_data`, needed by the price based cost models.
 
     Returns:
     -------
@@ -54,30 +88,24 @@ def adjust_returns_for_trading_costs(
             - Adjusted Portfolio Returns
 
     """
-    bp_trading_cost = trading_cost_params["bp_trading_cost"] / 10000
-
-    portfolio_returns.loc[:, "Cumulative Returns"] = (
-        1 + portfolio_returns.loc[:, "Portfolio Returns"]
-    ).cumprod()
+    index = portfolio_returns.index
+    positions = signals if weights is None else weights
 
     # Calculate the changes in trade signals (buy/sell)
-    trade_signals = signals.diff().fillna(
-        signals
-    )  # TODO: Not sure whether that is correct to fill the values with the original
+    # TODO: Not sure whether that is correct to fill the values with the original
     # TODO: signals since I would usually buy them before the signal is given on the
     # TODO: closing price yday.
-    # Calculate the position sizes at each time step
-    position_sizes = portfolio_returns.loc[:, "Cumulative Returns"].shift(1).fillna(1)
-    investment_changes = trade_signals.multiply(position_sizes, axis=0).abs()
-    # Calculate trading costs
-    trading_costs = investment_changes * bp_trading_cost
-    portfolio_returns.loc[:, "Total Trading Costs"] = trading_costs.sum(axis=1)
-    portfolio_returns.loc[:, "Normalized Trading Costs"] = (
-        portfolio_returns.loc[:, "Total Trading Costs"]
-        / portfolio_returns.loc[:, "Cumulative Returns"]
-    )
-    portfolio_returns.loc[:, "Adjusted Portfolio Returns"] = (
-        portfolio_returns.loc[:, "Portfolio Returns"]
-        - portfolio_returns.loc[:, "Normalized Trading Costs"]
+    position_values = positions.to_numpy(dtype=float)
+    backtest_data = {
+        "trades": align_rows(signal_changes(position_values), positions.index, index)
+    }
+    if weights is not None:
+        backtest_data["weights"] = align_rows(position_values, weights.index, index)
+    if market_data is not None:
+        backtest_data.update(align_market_data(market_data, index, positions.columns))
+
+    adjustment = cost_adjustment(
+        portfolio_returns.loc[:, "Portfolio Returns"].to_numpy(dtype=float),
+        transaction_costs(backtest_data, trading_cost_params),
     )
-    return portfolio_returns
+    return portfolio_returns.assign(**adjustment)
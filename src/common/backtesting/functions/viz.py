@@ -1,21 +1,35 @@
 """Functions for visualization of backtesting results."""
 
-import matplotlib.dates as mdates
-import matplotlib.pyplot as plt
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
 import pandas as pd
 
+if TYPE_CHECKING:
+    import matplotlib.pyplot as plt
+
+# LTTB keeps the first and the last point and needs at least one bucket between.
+_MIN_LTTB_POINTS = 3
+
 
 def plot_performance_metrics(
     portfolio_returns: pd.DataFrame,
-    plot_performance_params: dict[str, str],
-) -> plt.Figure:
+    plot_performance_params: dict[str, Any],
+) -> "plt.Figure":
     """Plot portfolio returns over time.
 
+    Long series are downsampled before plotting and the date ticks adapt to the
+    plotted period. Every call creates a new figure outside of the pyplot state, so
+    concurrent calls don't share it and no figure has to be closed.
+
     Args:
     ----
         portfolio_returns (pd.DataFrame): DataFrame containing the returns of the
-            portfolio that should be plotted.
-        plot_performance_params (dict[str, str]): List of columns to plot.
+            portfolio that should be plotted, e.g. one column per strategy.
+        plot_performance_params (dict[str, Any]): "columns" lists the columns to
+            plot. "cumulative" plots the cumulative returns instead of the returns
+            (defaults to False), "drawdown" adds a drawdown panel (defaults to True)
+            and "max_points" is the number of points per line (defaults to 2000).
 
     Raises:
     ------
@@ -27,38 +41,162 @@ def plot_performance_metrics(
         plt.Figure: Figure object containing the plot.
 
     """
+    import matplotlib.dates as mdates
+
     plotting_columns = plot_performance_params["columns"]
     if not plotting_columns or not all(
         col in portfolio_returns.columns for col in plotting_columns
     ):
         raise ValueError("Invalid column names in 'plotting_columns'")
-    fig, ax = plt.subplots(figsize=(12, 6))
+    cumulative = plot_performance_params.get("cumulative", False)
+    drawdown = plot_performance_params.get("drawdown", True)
+    max_points = plot_performance_params.get("max_points", 2000)
+
+    fig, axes = _create_figure(n_panels=2 if drawdown else 1)
+    dates = mdates.date2num(pd.DatetimeIndex(portfolio_returns.index).to_numpy())
+    returns = portfolio_returns.loc[:, plotting_columns].to_numpy(dtype=float)
+    growth = np.nancumprod(1 + returns, axis=0)
+    values = growth - 1 if cumulative else returns
+    drawdowns = growth / np.maximum.accumulate(growth, axis=0) - 1
+
     colors = {"Adjusted Portfolio Returns": "blue", "Portfolio Returns": "green"}
-    for column in plotting_columns:
-        ax.plot(
-            portfolio_returns.index,
-            portfolio_returns[column],
+    for position, column in enumerate(plotting_columns):
+        points = downsample_indices(dates, values[:, position], max_points)
+        axes[0].plot(
+            dates[points],
+            values[points, position],
             label=column,
-            color=colors.get(column, "black"),
+            color=colors.get(column),
         )
+        if drawdown:
+            points = downsample_indices(dates, drawdowns[:, position], max_points)
+            axes[1].fill_between(
+                dates[points], drawdowns[points, position], 0, alpha=0.3
+            )
 
-    # Formatting the x-axis
-    ax.xaxis.set_major_locator(
-        mdates.WeekdayLocator(interval=1)
-    )  # Set interval for weeks
-    ax.xaxis.set_major_formatter(
-        mdates.DateFormatter("%Y-%m-%d")
-    )  # Date format on x-axis
-
-    plt.xticks(rotation=45)
+    # Adaptive date ticks instead of one tick per week
+    locator = mdates.AutoDateLocator(maxticks=12)
+    axes[-1].xaxis.set_major_locator(locator)
+    axes[-1].xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
 
     # Set plot labels and title
-    ax.set_xlabel("Date", fontsize=14)
-    ax.set_ylabel("Returns", fontsize=14)
-    ax.set_title("Portfolio Returns Over Time", fontsize=16)
-
-    ax.legend(fontsize=12)
-    ax.grid(True)
-    plt.tight_layout()
+    axes[-1].set_xlabel("Date", fontsize=14)
+    axes[0].set_ylabel("Cumulative Returns" if cumulative else "Returns", fontsize=14)
+    axes[0].set_title("Portfolio Returns Over Time", fontsize=16)
+    axes[0].legend(fontsize=12)
+    if drawdown:
+        axes[1].set_ylabel("Drawdown", fontsize=14)
+    for ax in axes:
+        ax.grid(True)
 
     return fig
+
+
+def downsample_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Select the points of a line that keep its visual shape.
+
+    Largest-Triangle-Three-Buckets (LTTB) selects the points and the global min and
+    max are always added, so neither the highest peak nor the deepest trough (e.g.
+    the max drawdown) is lost. Long lines are first reduced to the min and the max
+    of small buckets. Missing values are dropped.
+
+    Args:
+    ----
+        x (np.ndarray): Sorted x values.
+        y (np.ndarray): y values.
+        n_out (int): Maximum number of points.
+
+    Returns:
+    -------
+        np.ndarray: Sorted positions of the selected points.
+
+    """
+    candidates = np.flatnonzero(~np.isnan(y))
+    if len(candidates) <= n_out or n_out < _MIN_LTTB_POINTS + 2:
+        return candidates
+    if len(candidates) > 4 * n_out:
+        candidates = candidates[_minmax_indices(y[candidates], 2 * n_out)]
+    # Two points are kept for the global extremes, in case LTTB drops them.
+    selected = _lttb_indices(x[candidates], y[candidates], n_out - 2)
+    extremes = [np.argmin(y[candidates]), np.argmax(y[candidates])]
+    return candidates[np.union1d(selected, extremes)]
+
+
+def _create_figure(n_panels: int) -> tuple["plt.Figure", list["plt.Axes"]]:
+    """Create a figure with vertically stacked panels sharing the date axis.
+
+    Args:
+    ----
+        n_panels (int): Number of vertically stacked panels.
+
+    Returns:
+    -------
+        tuple[plt.Figure, list[plt.Axes]]: The figure and its axes.
+
+    """
+    from matplotlib.figure import Figure
+
+    fig = Figure(figsize=(12, 6 + 2 * (n_panels - 1)), layout="constrained")
+    axes = fig.subplots(
+        n_panels, 1, sharex=True, squeeze=False, height_ratios=[3, 1][:n_panels]
+    )[:, 0]
+    return fig, list(axes)
+
+
+def _minmax_indices(y: np.ndarray, n_buckets: int) -> np.ndarray:
+    """Select the positions of the min and the max of every bucket.
+
+    Args:
+    ----
+        y (np.ndarray): y values without missing values.
+        n_buckets (int): Number of equally sized buckets.
+
+    Returns:
+    -------
+        np.ndarray: Sorted unique positions, including the first and the last one.
+
+    """
+    bucket_size = -(-len(y) // n_buckets)
+    # Padding with the last value fills the last bucket without new extremes.
+    padded = np.concatenate([y, np.full(bucket_size * n_buckets - len(y), y[-1])])
+    buckets = padded.reshape(n_buckets, bucket_size)
+    offsets = np.arange(n_buckets) * bucket_size
+    positions = np.concatenate(
+        [
+            [0, len(y) - 1],
+            offsets + buckets.argmin(axis=1),
+            offsets + buckets.argmax(axis=1),
+        ]
+    )
+    return np.unique(np.minimum(positions, len(y) - 1))
+
+
+def _lttb_indices(x: np.ndarray, y: np.ndarray, n_out: int) -> np.ndarray:
+    """Select points with the Largest-Triangle-Three-Buckets algorithm.
+
+    Args:
+    ----
+        x (np.ndarray): Sorted x values.
+        y (np.ndarray): y values without missing values.
+        n_out (int): Number of points, at least three.
+
+    Returns:
+    -------
+        np.ndarray: Sorted positions of the selected points.
+
+    """
+    edges = np.linspace(1, len(x) - 1, n_out - 1).astype(int)
+    selected = np.empty(n_out, dtype=int)
+    selected[0], selected[-1] = 0, len(x) - 1
+    for bucket in range(n_out - 2):
+        start, stop = edges[bucket], edges[bucket + 1]
+        next_stop = edges[bucket + 2] if bucket + 2 < n_out - 1 else len(x)
+        next_x = x[stop:next_stop].mean() if next_stop > stop else x[-1]
+        next_y = y[stop:next_stop].mean() if next_stop > stop else y[-1]
+        previous = selected[bucket]
+        areas = np.abs(
+            (x[previous] - next_x) * (y[start:stop] - y[previous])
+            - (x[previous] - x[start:stop]) * (next_y - y[previous])
+        )
+        selected[bucket + 1] = start + np.argmax(areas)
+    return selected
@@ -1,3 +1,8 @@
 """Init file."""
 
-from common.backtesting.pipelines.pipeline import create_pipeline
+from common.backtesting.pipelines.pipeline import (
+    create_batch_pipeline,
+    create_incremental_pipeline,
+    create_pipeline,
+    create_walk_forward_pipeline,
+)
@@ -1,6 +1,29 @@
 """Pipeline for price prediction."""
 
-from common.backtesting.functions.evaluation import calculate_performance_metrics
+from typing import Optional
+
+from common.backtesting.functions.batch import (
+    calculate_batch_performance_metrics,
+    create_batch_portfolio_returns,
+)
+from common.backtesting.functions.costs import create_market_data
+from common.backtesting.functions.evaluation import (
+    calculate_performance_metrics,
+    calculate_periodic_performance_metrics,
+    calculate_rolling_performance_metrics,
+)
+from common.backtesting.functions.incremental import (
+    update_performance_metrics,
+    update_portfolio_returns,
+)
+from common.backtesting.functions.preparation import (
+    create_price_matrix,
+    create_walk_forward_portfolio,
+    create_walk_forward_weights,
+    slice_prices_to_signals,
+)
+from common.backtesting.functions.rebalancing import simulate_rebalancing
+from common.backtesting.functions.resampling import bootstrap_performance_metrics
 from common.backtesting.functions.returns import (
     adjust_returns_for_trading_costs,
     create_portfolio_returns,
@@ -9,13 +32,22 @@ from common.backtesting.functions.viz import plot_performance_metrics
 from kedro.pipeline import Pipeline, node, pipeline
 
 
-def create_pipeline(top_level_namespace: str = "") -> Pipeline:
+def create_pipeline(
+    top_level_namespace: str = "", bootstrap: bool = False, rebalancing: bool = False
+) -> Pipeline:
     """Pipeline for machine learning techniques modeling.
 
     Parameters
     ----------
     top_level_namespace : str
         The namespace for the pipeline.
+    bootstrap : bool
+        Whether to add the bootstrap confidence intervals of the performance
+        metrics, configured by "params:bootstrap".
+    rebalancing : bool
+        Whether to simulate a portfolio that holds its positions between the
+        rebalance dates ("params:rebalancing") instead of resetting the weights
+        every date.
 
     Returns
     -------
@@ -25,34 +57,88 @@ def create_pipeline(top_level_namespace: str = "") -> Pipeline:
     """
     nodes = [
         node(
-            func=create_portfolio_returns,
+            func=create_market_data,
             inputs={
                 "prices": "price_data",
-                "weights": "weights",
+                "trading_cost_params": "params:trading_costs",
             },
-            outputs="portfolio_returns",
-            name="create_portfolio_returns",
+            outputs="market_data",
+            name="create_market_data",
             tags=["backtesting"],
         ),
+    ]
+    if rebalancing:
+        nodes.append(
+            node(
+                func=simulate_rebalancing,
+                inputs={
+                    "prices": "price_data",
+                    "target_weights": "weights",
+                    "trading_cost_params": "params:trading_costs",
+                    "rebalance_params": "params:rebalancing",
+                    "market_data": "market_data",
+                },
+                outputs="adjusted_portfolio_returns",
+                name="simulate_rebalancing",
+                tags=["backtesting"],
+            )
+        )
+    else:
+        nodes += [
+            node(
+                func=create_portfolio_returns,
+                inputs={
+                    "prices": "price_data",
+                    "weights": "weights",
+                },
+                outputs="portfolio_returns",
+                name="create_portfolio_returns",
+                tags=["backtesting"],
+            ),
+            node(
+                func=adjust_returns_for_trading_costs,
+                inputs={
+                    "portfolio_returns": "portfolio_returns",
+                    "signals": "signals",
+                    "trading_cost_params": "params:trading_costs",
+                    "weights": "weights",
+                    "market_data": "market_data",
+                },
+                outputs="adjusted_portfolio_returns",
+                name="adjust_portfolio_returns",
+                tags=["backtesting"],
+            ),
+        ]
+    nodes += [
         node(
-            func=adjust_returns_for_trading_costs,
+            func=calculate_performance_metrics,
             inputs={
-                "portfolio_returns": "portfolio_returns",
+                "portfolio_returns": "adjusted_portfolio_returns",
+                "performance_metric_params": "params:performance_metrics",
                 "signals": "signals",
-                "trading_cost_params": "params:trading_costs",
             },
-            outputs="adjusted_portfolio_returns",
-            name="adjust_portfolio_returns",
+            outputs="performance_metrics",
+            name="calculate_performance_metrics",
             tags=["backtesting"],
         ),
         node(
-            func=calculate_performance_metrics,
+            func=calculate_rolling_performance_metrics,
             inputs={
                 "portfolio_returns": "adjusted_portfolio_returns",
                 "performance_metric_params": "params:performance_metrics",
             },
-            outputs="performance_metrics",
-            name="calculate_performance_metrics",
+            outputs="rolling_performance_metrics",
+            name="calculate_rolling_performance_metrics",
+            tags=["backtesting"],
+        ),
+        node(
+            func=calculate_periodic_performance_metrics,
+            inputs={
+                "portfolio_returns": "adjusted_portfolio_returns",
+                "performance_metric_params": "params:performance_metrics",
+            },
+            outputs="periodic_performance_metrics",
+            name="calculate_periodic_performance_metrics",
             tags=["backtesting"],
         ),
         node(
@@ -66,4 +152,220 @@ def create_pipeline(top_level_namespace: str = "") -> Pipeline:
             tags=["backtesting"],
         ),
     ]
+    if bootstrap:
+        nodes.append(
+            node(
+                func=bootstrap_performance_metrics,
+                inputs={
+                    "portfolio_returns": "adjusted_portfolio_returns",
+                    "bootstrap_params": "params:bootstrap",
+                },
+                outputs="bootstrap_performance_metrics",
+                name="bootstrap_performance_metrics",
+                tags=["backtesting"],
+            )
+        )
     return pipeline(nodes, namespace=top_level_namespace)
+
+
+def create_batch_pipeline(top_level_namespace: str = "") -> Pipeline:
+    """Pipeline for backtesting many strategies in one pass.
+
+    The input "strategy_signals" maps strategy names to signals, e.g. the
+    partitioned signals written by the multi variant pipelines.
+
+    Parameters
+    ----------
+    top_level_namespace : str
+        The namespace for the pipeline.
+
+    Returns
+    -------
+    Pipeline
+        The batch backtesting pipeline.
+
+    """
+    nodes = [
+        node(
+            func=create_batch_portfolio_returns,
+            inputs={
+                "prices": "price_data",
+                "strategy_signals": "strategy_signals",
+                "trading_cost_params": "params:trading_costs",
+            },
+            outputs="batch_portfolio_returns",
+            name="create_batch_portfolio_returns",
+            tags=["backtesting"],
+        ),
+        node(
+            func=calculate_batch_performance_metrics,
+            inputs="batch_portfolio_returns",
+            outputs="strategy_metrics",
+            name="calculate_batch_performance_metrics",
+            tags=["backtesting"],
+        ),
+    ]
+    return pipeline(nodes, namespace=top_level_namespace)
+
+
+def create_incremental_pipeline(top_level_namespace: str = "") -> Pipeline:
+    """Pipeline that extends a backtest by the dates added since its last run.
+
+    The running states are read from "backtest_state" and "metric_state" and
+    written to "updated_backtest_state" and "updated_metric_state". Pointing each
+    pair to the same `RunningStateDataset` file persists the state between the
+    daily runs.
+
+    Parameters
+    ----------
+    top_level_namespace : str
+        The namespace for the pipeline.
+
+    Returns
+    -------
+    Pipeline
+        The incremental backtesting pipeline.
+
+    """
+    nodes = [
+        node(
+            func=create_market_data,
+            inputs={
+                "prices": "price_data",
+                "trading_cost_params": "params:trading_costs",
+            },
+            outputs="market_data",
+            name="create_market_data",
+            tags=["backtesting"],
+        ),
+        node(
+            func=update_portfolio_returns,
+            inputs={
+                "prices": "price_data",
+                "weights": "weights",
+                "trading_cost_params": "params:trading_costs",
+                "backtest_state": "backtest_state",
+                "market_data": "market_data",
+            },
+            outputs=["adjusted_portfolio_returns_update", "updated_backtest_state"],
+            name="update_portfolio_returns",
+            tags=["backtesting"],
+        ),
+        node(
+            func=update_performance_metrics,
+            inputs={
+                "portfolio_returns": "adjusted_portfolio_returns_update",
+                "performance_metric_params": "params:performance_metrics",
+                "metric_state": "metric_state",
+                "signals": "signals",
+            },
+            outputs=["performance_metrics", "updated_metric_state"],
+            name="update_performance_metrics",
+            tags=["backtesting"],
+        ),
+    ]
+    return pipeline(nodes, namespace=top_level_namespace)
+
+
+def create_walk_forward_pipeline(
+    top_level_namespace: str,
+    signals_namespace: str = "ml_technique_modeling",
+    use_portfolio: bool = False,
+    incremental: bool = False,
+    backtest_options: Optional[dict[str, bool]] = None,
+) -> Pipeline:
+    """Pipeline for the walk-forward backtest of the modeling signals.
+
+    The signals of all cutoffs are stitched into one out-of-sample weight matrix
+    and backtested in one pass by the backtesting pipeline, or only over the dates
+    added since the last run by the incremental backtesting pipeline.
+
+    Parameters
+    ----------
+    top_level_namespace : str
+        The namespace for the pipeline.
+    signals_namespace : str
+        The namespace of the modeling pipeline that produced the signals.
+    use_portfolio : bool
+        Whether to backtest the "portfolio_concatenated" weights of the portfolio
+        building instead of the weights derived from the signals.
+    incremental : bool
+        Whether to extend the persisted "backtest_state" and "metric_state" with
+        `create_incremental_pipeline` instead of backtesting the whole history.
+    backtest_options : dict[str, bool], optional
+        The optional nodes of the backtesting pipeline, i.e. the "bootstrap" and
+        "rebalancing" arguments of `create_pipeline`.
+
+    Raises
+    ------
+    ValueError
+        If backtest options are set for the incremental backtest.
+
+    Returns
+    -------
+    Pipeline
+        The walk-forward backtesting pipeline.
+
+    """
+    nodes = [
+        node(
+            func=create_price_matrix,
+            inputs={
+                "price_data": "price_data",
+                "price_matrix_params": "params:price_matrix",
+            },
+            outputs="price_matrix",
+            name="create_price_matrix",
+            tags=["backtesting"],
+        ),
+        node(
+            func=create_walk_forward_portfolio,
+            inputs="portfolio_concatenated",
+            outputs=["signals", "weights"],
+            name="create_walk_forward_portfolio",
+            tags=["backtesting"],
+        )
+        if use_portfolio
+        else node(
+            func=create_walk_forward_weights,
+            inputs={
+                "signals_concatenated": "signals_concatenated",
+                "stock_price_params": "params:stock_price_params",
+            },
+            outputs=["signals", "weights"],
+            name="create_walk_forward_weights",
+            tags=["backtesting"],
+        ),
+        node(
+            func=slice_prices_to_signals,
+            inputs={"prices": "price_matrix", "signals": "signals"},
+            outputs="walk_forward_prices",
+            name="slice_prices_to_signals",
+            tags=["backtesting"],
+        ),
+    ]
+    backtest_options = backtest_options or {}
+    if incremental and any(backtest_options.values()):
+        raise ValueError(
+            f"Invalid backtest options {backtest_options} of the incremental backtest"
+        )
+    backtest = pipeline(
+        create_incremental_pipeline()
+        if incremental
+        else create_pipeline(**backtest_options),
+        inputs={"price_data": "walk_forward_prices"},
+    )
+    if use_portfolio:
+        inputs = {
+            "portfolio_concatenated": f"{signals_namespace}.portfolio_concatenated"
+        }
+        parameters = {}
+    else:
+        inputs = {"signals_concatenated": f"{signals_namespace}.signals_concatenated"}
+        parameters = {"stock_price_params": f"{signals_namespace}.stock_price_params"}
+    return pipeline(
+        pipeline(nodes) + backtest,
+        namespace=top_level_namespace,
+        inputs={"price_data": "price_data", **inputs},
+        parameters=parameters,
+    )
@@ -0,0 +1,11 @@
+"""Init for datasets."""
+
+from common.datasets.running_state_dataset import RunningStateDataset
+from common.datasets.shared_memory_dataset import (
+    SharedMemoryDataset,
+    cleanup_shared_memory,
+)
+from common.datasets.streaming_polars_dataset import (
+    StreamingCSVDataset,
+    StreamingPolarsDataset,
+)
@@ -0,0 +1,27 @@
+"""Dataset for the running state of an incremental pipeline."""
+
+from typing import Any
+
+from kedro_datasets.pickle import PickleDataset
+
+
+class RunningStateDataset(PickleDataset):
+    """Pickled state that loads as an empty dictionary before the first run.
+
+    An incremental pipeline reads its state from one dataset and writes the updated
+    state to another. Pointing both to the same file persists the state between
+    runs, and the first run starts from an empty state without an initialized file.
+
+    Example catalog entry:
+
+    .. code-block:: yaml
+
+        incremental_backtest.backtest_state:
+          type: common.datasets.RunningStateDataset
+          filepath: data/08_reporting/incremental_backtest/backtest_state.pkl
+    """
+
+    def _load(self) -> Any:
+        if not self._exists():
+            return {}
+        return super()._load()
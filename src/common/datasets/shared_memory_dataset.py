@@ -0,0 +1,190 @@
+"""Dataset that shares DataFrames and arrays between processes via memory maps."""
+
+import atexit
+import os
+import pickle
+import shutil
+import tempfile
+import uuid
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+from kedro.io import AbstractDataset
+
+# Directories of the datasets created in this process. Worker processes receive
+# pickled copies of the datasets, which do not register their directory, so only
+# the process that created the catalog removes the data.
+_OWNED_PATHS: set[Path] = set()
+# Numpy dtype kinds that are stored as memory-mapped arrays, the other columns
+# (e.g. strings) are pickled.
+_MAPPED_KINDS = "biufcmM"
+_LATEST = "LATEST"
+
+
+class SharedMemoryDataset(AbstractDataset[Any, Any]):
+    """Store data once in shared memory and memory-map it in every process.
+
+    The columns of a DataFrame (or a Series or an array) are written as ``.npy``
+    files to ``/dev/shm``. Loading maps the files instead of reading them, so the
+    numeric and datetime columns of every load share the same physical memory, no
+    matter how many `ParallelRunner` workers load the data. Only the small
+    remainder (the index and the object columns) is unpickled per load. Other
+    objects are pickled completely.
+
+    The loaded arrays are read-only. The data is removed when the dataset is
+    released, by `SharedMemoryHooks` after the run and at interpreter exit.
+
+    Example catalog entry:
+
+    .. code-block:: yaml
+
+        "{namespace}.sorted_price_w_features":
+          type: common.datasets.SharedMemoryDataset
+    """
+
+    def __init__(
+        self,
+        shm_dir: Optional[Union[str, Path]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ):
+        """Create a dataset with its own directory below the shared memory mount.
+
+        Args:
+        ----
+            shm_dir (Union[str, Path], optional): Directory on a memory backed file
+                system. Defaults to "/dev/shm" or the temporary directory if it
+                does not exist.
+            metadata (dict[str, Any], optional): Any arbitrary metadata, ignored by
+                Kedro.
+
+        """
+        if shm_dir is None:
+            shm_dir = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        self._path = Path(shm_dir) / f"kedro-shm-{uuid.uuid4().hex}"
+        self.metadata = metadata
+        _OWNED_PATHS.add(self._path)
+
+    def _load(self) -> Any:
+        version = (self._path / _LATEST).read_text()
+        return _read(self._path / version)
+
+    def _save(self, data: Any) -> None:
+        version = uuid.uuid4().hex
+        _write(data, self._path / version)
+        previous = self._path / _LATEST
+        previous_version = previous.read_text() if previous.exists() else None
+        # Loads never see a partially written version, maps of the previous version
+        # stay valid after its files are deleted.
+        temporary = self._path / f"{_LATEST}.{version}"
+        temporary.write_text(version)
+        os.replace(temporary, previous)
+        if previous_version is not None:
+            shutil.rmtree(self._path / previous_version, ignore_errors=True)
+
+    def _exists(self) -> bool:
+        return (self._path / _LATEST).exists()
+
+    def _release(self) -> None:
+        super()._release()
+        shutil.rmtree(self._path, ignore_errors=True)
+
+    def _describe(self) -> dict[str, Any]:
+        return {"path": str(self._path)}
+
+
+def cleanup_shared_memory() -> None:
+    """Remove the data of all shared memory datasets created in this process."""
+    for path in list(_OWNED_PATHS):
+        shutil.rmtree(path, ignore_errors=True)
+        _OWNED_PATHS.discard(path)
+
+
+atexit.register(cleanup_shared_memory)
+
+
+def _write(data: Any, path: Path) -> None:
+    """Write the data as memory-mappable arrays and a pickled remainder.
+
+    Args:
+    ----
+        data (Any): DataFrame, Series, array or any picklable object.
+        path (Path): New directory for the data.
+
+    """
+    path.mkdir(parents=True)
+    if isinstance(data, np.ndarray) and data.dtype.kind in _MAPPED_KINDS:
+        np.save(path / "0.npy", data)
+        meta = {"kind": "array"}
+    elif isinstance(data, (pd.DataFrame, pd.Series)):
+        frame = data.to_frame() if isinstance(data, pd.Series) else data
+        objects = {}
+        for position in range(frame.shape[1]):
+            column = frame.iloc[:, position]
+            if (
+                isinstance(column.dtype, np.dtype)
+                and column.dtype.kind in _MAPPED_KINDS
+            ):
+                np.save(path / f"{position}.npy", column.to_numpy())
+            else:
+                objects[position] = column.array
+        meta = {
+            "kind": "series" if isinstance(data, pd.Series) else "frame",
+            "columns": frame.columns,
+            "index": frame.index,
+            "objects": objects,
+            "name": data.name if isinstance(data, pd.Series) else None,
+        }
+    else:
+        meta = {"kind": "object", "data": data}
+    with (path / "meta.pkl").open("wb") as file:
+        pickle.dump(meta, file, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _read(path: Path) -> Any:
+    """Map the arrays written by `_write` and restore the data.
+
+    Args:
+    ----
+        path (Path): Directory of the data.
+
+    Returns:
+    -------
+        Any: The data, arrays are read-only memory maps.
+
+    """
+    with (path / "meta.pkl").open("rb") as file:
+        meta = pickle.load(file)  # noqa: S301
+    if meta["kind"] == "object":
+        return meta["data"]
+    if meta["kind"] == "array":
+        return _map_array(path / "0.npy")
+
+    columns = {
+        position: meta["objects"][position]
+        if position in meta["objects"]
+        else _map_array(path / f"{position}.npy")
+        for position in range(len(meta["columns"]))
+    }
+    frame = pd.DataFrame(columns, index=meta["index"], copy=False)
+    frame.columns = meta["columns"]
+    if meta["kind"] == "series":
+        return frame.iloc[:, 0].rename(meta["name"])
+    return frame
+
+
+def _map_array(path: Path) -> np.ndarray:
+    """Map a ``.npy`` file read-only.
+
+    Args:
+    ----
+        path (Path): Path of the file.
+
+    Returns:
+    -------
+        np.ndarray: Plain array view of the memory map, so results of computations
+            are no memory maps.
+
+    """
+    return np.load(path, mmap_mode="r").view(np.ndarray)
@@ -0,0 +1,129 @@
+"""Datasets that scan and sink CSV or Parquet files as lazy Polars queries."""
+
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Optional, Union
+
+import pandas as pd
+from kedro.io import AbstractDataset, DatasetError
+from kedro.io.core import get_filepath_str
+from kedro_datasets.pandas import CSVDataset
+
+if TYPE_CHECKING:
+    import polars as pl
+
+_FILE_FORMATS = (".csv", ".parquet")
+
+
+class StreamingPolarsDataset(AbstractDataset[Any, "pl.LazyFrame"]):
+    """Load files as lazy Polars queries and write queries without collecting them.
+
+    Loading only scans the file, i.e. returns a `pl.LazyFrame` whose rows are read
+    when the query runs. Saving sinks a `pl.LazyFrame` (or a `pl.DataFrame`) with
+    the streaming engine of Polars, so the query runs batch by batch as far as its
+    operations allow. The format is set by the suffix of the file, ".csv" or
+    ".parquet".
+
+    Polars is only imported when the data is loaded or saved.
+
+    Example catalog entry:
+
+    .. code-block:: yaml
+
+        price_data_lazy:
+          type: common.datasets.StreamingPolarsDataset
+          filepath: data/02_intermediate/price_data.csv
+    """
+
+    DEFAULT_SAVE_ARGS: dict[str, Any] = {"engine": "streaming"}
+
+    def __init__(
+        self,
+        filepath: Union[str, Path],
+        load_args: Optional[dict[str, Any]] = None,
+        save_args: Optional[dict[str, Any]] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ):
+        """Create a dataset for a CSV or Parquet file.
+
+        Args:
+        ----
+            filepath (Union[str, Path]): Path of the file.
+            load_args (dict[str, Any], optional): Arguments of `pl.scan_csv` or
+                `pl.scan_parquet`. Defaults to None.
+            save_args (dict[str, Any], optional): Arguments of
+                `pl.LazyFrame.sink_csv` or `pl.LazyFrame.sink_parquet`, added to
+                `DEFAULT_SAVE_ARGS`. Defaults to None.
+            metadata (dict[str, Any], optional): Any arbitrary metadata, ignored by
+                Kedro.
+
+        Raises:
+        ------
+            DatasetError: If the suffix of the file is not ".csv" or ".parquet".
+
+        """
+        self._filepath = Path(filepath)
+        self._file_format = self._filepath.suffix.lower()
+        if self._file_format not in _FILE_FORMATS:
+            raise DatasetError(
+                f"Invalid file format '{self._file_format}' of '{filepath}', "
+                f"expected one of {_FILE_FORMATS}"
+            )
+        self._load_args = dict(load_args or {})
+        self._save_args = {**self.DEFAULT_SAVE_ARGS, **(save_args or {})}
+        self.metadata = metadata
+
+    def _load(self) -> "pl.LazyFrame":
+        import polars as pl
+
+        if self._file_format == ".csv":
+            return pl.scan_csv(self._filepath, **self._load_args)
+        return pl.scan_parquet(self._filepath, **self._load_args)
+
+    def _save(self, data: Union["pl.LazyFrame", "pl.DataFrame"]) -> None:
+        self._filepath.parent.mkdir(parents=True, exist_ok=True)
+        data = data.lazy()
+        if self._file_format == ".csv":
+            data.sink_csv(self._filepath, **self._save_args)
+        else:
+            data.sink_parquet(self._filepath, **self._save_args)
+
+    def _exists(self) -> bool:
+        return self._filepath.is_file()
+
+    def _describe(self) -> dict[str, Any]:
+        return {
+            "filepath": str(self._filepath),
+            "load_args": self._load_args,
+            "save_args": self._save_args,
+        }
+
+
+class StreamingCSVDataset(CSVDataset):
+    """pandas `CSVDataset` that also writes lazy Polars queries.
+
+    Loading returns a pandas DataFrame. Saving a pandas DataFrame writes it like the
+    `CSVDataset`, saving a `pl.LazyFrame` (or a `pl.DataFrame`) sinks it with the
+    streaming engine of Polars. So one dataset, e.g. "price_w_features", can be
+    written by a Polars node and read by pandas nodes, and Kedro orders them.
+
+    Example catalog entry:
+
+    .. code-block:: yaml
+
+        price_w_features:
+          type: common.datasets.StreamingCSVDataset
+          filepath: data/04_feature/stock_features/price_w_features.csv
+    """
+
+    def _save(self, data: Union[pd.DataFrame, "pl.LazyFrame", "pl.DataFrame"]) -> None:
+        if isinstance(data, pd.DataFrame):
+            super()._save(data)
+            return
+        if self._protocol != "file":
+            raise DatasetError(
+                f"Cannot sink a Polars query to the '{self._protocol}' file system"
+            )
+        save_path = Path(get_filepath_str(self._get_save_path(), self._protocol))
+        save_path.parent.mkdir(parents=True, exist_ok=True)
+        data.lazy().sink_csv(save_path, engine="streaming")
+        self._invalidate_cache()
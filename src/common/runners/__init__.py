@@ -0,0 +1,3 @@
+"""Init for runners."""
+
+from common.runners.async_io_runner import AsyncIORunner
@@ -0,0 +1,362 @@
+"""Runner that overlaps the loads and saves of the catalog with the node runs."""
+
+import inspect
+from collections import Counter
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import chain
+from typing import Any, Optional
+
+from kedro.io import DataCatalog
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+from kedro.runner import AbstractRunner, run_node
+from kedro.runner.runner import _call_node_run, _collect_inputs_from_hook
+from pluggy import PluginManager
+
+
+class AsyncIORunner(AbstractRunner):
+    """Run the nodes sequentially while the catalog I/O runs in background threads.
+
+    The nodes run in the topological order of the `SequentialRunner`. While a node
+    runs, the inputs of the next ``prefetch_nodes`` nodes are loaded as soon as the
+    nodes that produce them have finished, and the outputs of the finished nodes
+    are saved. At most ``max_pending_saves`` outputs are saved at the same time,
+    further outputs wait for a save to finish (back-pressure), which also bounds
+    the memory held by outputs that are not saved yet.
+
+    The semantics of the `SequentialRunner` are kept:
+
+    * A dataset is only loaded after all of its saves have finished, and the saves
+      of a dataset run in order.
+    * All loads and saves happen with the same dataset hooks, ``before_node_run``
+      and ``after_node_run`` hooks run in the main thread.
+    * A failing node or save stops the run: no further node is started, the saves
+      of the finished nodes are completed and the first error is raised. A node
+      only counts as done (e.g. for the resume suggestion) once its outputs are
+      saved.
+
+    Nodes wrapping generator functions are run with `run_node` after the pending
+    saves have finished, so their chunks are saved in order.
+
+    Usage::
+
+        kedro run --runner common.runners.AsyncIORunner
+    """
+
+    def __init__(
+        self,
+        is_async: bool = False,
+        extra_dataset_patterns: Optional[dict[str, dict[str, Any]]] = None,
+        prefetch_nodes: int = 2,
+        max_pending_saves: int = 4,
+    ):
+        """Instantiate the runner.
+
+        Args:
+        ----
+            is_async (bool): Ignored, the loads and saves are always asynchronous.
+                Accepted for the ``--async`` option of ``kedro run``.
+            extra_dataset_patterns (dict[str, dict[str, Any]], optional): Extra
+                dataset factory patterns, defaults to a `MemoryDataset` for all
+                datasets that are not in the catalog.
+            prefetch_nodes (int): Number of upcoming nodes whose inputs are loaded
+                in advance. Defaults to 2.
+            max_pending_saves (int): Maximum number of outputs that are saved at
+                the same time. Defaults to 4.
+
+        Raises:
+        ------
+            ValueError: If ``prefetch_nodes`` is negative or ``max_pending_saves``
+                is not positive.
+
+        """
+        if prefetch_nodes < 0:
+            raise ValueError(f"Invalid number of prefetched nodes {prefetch_nodes}")
+        if max_pending_saves < 1:
+            raise ValueError(f"Invalid number of pending saves {max_pending_saves}")
+        super().__init__(
+            is_async=is_async,
+            extra_dataset_patterns=extra_dataset_patterns
+            or {"{default}": {"type": "MemoryDataset"}},
+        )
+        self._prefetch_nodes = prefetch_nodes
+        self._max_pending_saves = max_pending_saves
+
+    def _run(
+        self,
+        pipeline: Pipeline,
+        catalog: DataCatalog,
+        hook_manager: PluginManager,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """Run the nodes with asynchronous loads and saves.
+
+        Args:
+        ----
+            pipeline (Pipeline): The pipeline to run.
+            catalog (DataCatalog): The catalog from which to fetch data.
+            hook_manager (PluginManager): The plugin manager to activate hooks.
+            session_id (str, optional): The id of the session.
+
+        Raises:
+        ------
+            Exception: The first error of a node, a load or a save.
+
+        """
+        # Materialize the datasets of factory patterns up front, so that the I/O
+        # threads never add the same dataset to the catalog concurrently.
+        for name in sorted(pipeline.datasets()):
+            catalog._get_dataset(name, suggest=False)  # noqa: SLF001
+
+        with ThreadPoolExecutor(
+            max_workers=self._prefetch_nodes + self._max_pending_saves,
+            thread_name_prefix="kedro-io",
+        ) as executor:
+            io = _CatalogIO(catalog, hook_manager, executor, self._max_pending_saves)
+            try:
+                self._run_nodes(pipeline, io, session_id)
+            finally:
+                io.cancel_loads()
+
+    def _run_nodes(
+        self, pipeline: Pipeline, io: "_CatalogIO", session_id: Optional[str]
+    ) -> None:
+        nodes = pipeline.nodes
+        producers = {name: node for node in nodes for name in node.outputs}
+        load_counts = Counter(chain.from_iterable(node.inputs for node in nodes))
+        finished: set[Node] = set()
+
+        for exec_index, node in enumerate(nodes):
+            try:
+                io.raise_failed_saves()
+                window_end = exec_index + self._prefetch_nodes + 1
+                for upcoming in nodes[exec_index:window_end]:
+                    if all(
+                        name not in producers or producers[name] in finished
+                        for name in upcoming.inputs
+                    ):
+                        io.prefetch(upcoming)
+                if inspect.isgeneratorfunction(node.func):
+                    io.wait_for_saves()
+                    run_node(node, io.catalog, io.hook_manager, False, session_id)
+                    io.saved_nodes.add(node)
+                else:
+                    self._run_node(node, io, session_id)
+            except Exception:
+                io.drain_saves()
+                self._suggest_resume_scenario(pipeline, io.saved_nodes, io.catalog)
+                raise
+            finished.add(node)
+
+            io.release_finished_datasets(node, load_counts, pipeline)
+
+            self._logger.info(
+                "Completed %d out of %d tasks", exec_index + 1, len(nodes)
+            )
+
+        io.drain_saves()
+        try:
+            io.raise_failed_saves()
+        except Exception:
+            self._suggest_resume_scenario(pipeline, io.saved_nodes, io.catalog)
+            raise
+
+    @staticmethod
+    def _run_node(node: Node, io: "_CatalogIO", session_id: Optional[str]) -> None:
+        inputs = io.collect_inputs(node)
+        inputs.update(
+            _collect_inputs_from_hook(
+                node, io.catalog, inputs, True, io.hook_manager, session_id=session_id
+            )
+        )
+        outputs = _call_node_run(
+            node, io.catalog, inputs, True, io.hook_manager, session_id=session_id
+        )
+        io.save(node, outputs)
+
+
+class _CatalogIO:
+    """Loads and saves of the catalog, running on a thread pool."""
+
+    def __init__(
+        self,
+        catalog: DataCatalog,
+        hook_manager: PluginManager,
+        executor: ThreadPoolExecutor,
+        max_pending_saves: int,
+    ):
+        """Track the loads and saves submitted to the executor.
+
+        Args:
+        ----
+            catalog (DataCatalog): The catalog of the run.
+            hook_manager (PluginManager): The plugin manager to activate hooks.
+            executor (ThreadPoolExecutor): The executor for the loads and saves.
+            max_pending_saves (int): Maximum number of unfinished saves.
+
+        """
+        self.catalog = catalog
+        self.hook_manager = hook_manager
+        self.saved_nodes: set[Node] = set()
+        self._executor = executor
+        self._max_pending_saves = max_pending_saves
+        self._loads: dict[Node, dict[str, Future]] = {}
+        # The last save of each dataset and the unfinished saves of each node.
+        self._saves: dict[str, Future] = {}
+        self._node_saves: dict[Node, list[Future]] = {}
+
+    def prefetch(self, node: Node) -> None:
+        """Start loading the inputs of the node, unless they are already loading.
+
+        Args:
+        ----
+            node (Node): The node, all nodes that produce its inputs are finished.
+                The inputs of generator nodes are loaded by `run_node`.
+
+        """
+        if node in self._loads or inspect.isgeneratorfunction(node.func):
+            return
+        self._loads[node] = {
+            name: self._executor.submit(self._load, node, name, self._saves.get(name))
+            for name in node.inputs
+        }
+
+    def collect_inputs(self, node: Node) -> dict[str, Any]:
+        """Wait for the inputs of the node.
+
+        Args:
+        ----
+            node (Node): The node to run next.
+
+        Returns:
+        -------
+            dict[str, Any]: The loaded inputs.
+
+        """
+        self.prefetch(node)
+        return {name: load.result() for name, load in self._loads.pop(node).items()}
+
+    def save(self, node: Node, outputs: dict[str, Any]) -> None:
+        """Start saving the outputs of the node, in the order of the outputs.
+
+        Args:
+        ----
+            node (Node): The finished node.
+            outputs (dict[str, Any]): The outputs of the node.
+
+        """
+        saves = []
+        for name, data in outputs.items():
+            self._apply_back_pressure()
+            save = self._executor.submit(
+                self._save, node, name, data, self._saves.get(name)
+            )
+            self._saves[name] = save
+            saves.append(save)
+        self._node_saves[node] = saves
+        if node.confirms:
+            self.wait_for_saves(saves)
+            for name in node.confirms:
+                self.catalog.confirm(name)
+        self._collect_saved_nodes()
+
+    def release(self, name: str) -> None:
+        """Release the dataset once its saves have finished.
+
+        Args:
+        ----
+            name (str): Name of the dataset.
+
+        """
+        if name in self._saves:
+            self.wait_for_saves([self._saves.pop(name)])
+        self.catalog.release(name)
+
+    def release_finished_datasets(
+        self, node: Node, load_counts: Counter, pipeline: Pipeline
+    ) -> None:
+        """Decrement the load counts and release the datasets no node loads anymore.
+
+        Args:
+        ----
+            node (Node): The finished node.
+            load_counts (Counter): Number of remaining loads of each dataset.
+            pipeline (Pipeline): The pipeline, its inputs and outputs are kept.
+
+        """
+        load_counts.subtract(node.inputs)
+        for name in node.inputs:
+            if load_counts[name] < 1 and name not in pipeline.inputs():
+                self.release(name)
+        for name in node.outputs:
+            if load_counts[name] < 1 and name not in pipeline.outputs():
+                self.release(name)
+
+    def raise_failed_saves(self) -> None:
+        """Raise the error of the first failed save, if any save has failed."""
+        for save in self._pending_saves():
+            if save.done() and save.exception() is not None:
+                raise save.exception()
+
+    def wait_for_saves(self, saves: Optional[list[Future]] = None) -> None:
+        """Wait for saves and raise the first error.
+
+        Args:
+        ----
+            saves (list[Future], optional): The saves, defaults to all saves.
+
+        """
+        for save in self._pending_saves() if saves is None else saves:
+            save.result()
+        self._collect_saved_nodes()
+
+    def drain_saves(self) -> None:
+        """Let all saves finish without raising their errors."""
+        wait(self._pending_saves())
+        self._collect_saved_nodes()
+
+    def cancel_loads(self) -> None:
+        """Cancel the loads that have not started."""
+        for loads in self._loads.values():
+            for load in loads.values():
+                load.cancel()
+        self._loads.clear()
+
+    def _pending_saves(self) -> list[Future]:
+        return list(chain.from_iterable(self._node_saves.values()))
+
+    def _apply_back_pressure(self) -> None:
+        unfinished = [save for save in self._pending_saves() if not save.done()]
+        while len(unfinished) >= self._max_pending_saves:
+            wait(unfinished, return_when=FIRST_COMPLETED)
+            unfinished = [save for save in unfinished if not save.done()]
+        self.raise_failed_saves()
+
+    def _collect_saved_nodes(self) -> None:
+        for node, saves in list(self._node_saves.items()):
+            if all(save.done() and save.exception() is None for save in saves):
+                self.saved_nodes.add(node)
+                del self._node_saves[node]
+
+    def _load(self, node: Node, name: str, previous_save: Optional[Future]) -> Any:
+        if previous_save is not None:
+            previous_save.result()
+        self.hook_manager.hook.before_dataset_loaded(dataset_name=name, node=node)
+        data = self.catalog.load(name)
+        self.hook_manager.hook.after_dataset_loaded(
+            dataset_name=name, data=data, node=node
+        )
+        return data
+
+    def _save(
+        self, node: Node, name: str, data: Any, previous_save: Optional[Future]
+    ) -> None:
+        if previous_save is not None:
+            previous_save.result()
+        self.hook_manager.hook.before_dataset_saved(
+            dataset_name=name, data=data, node=node
+        )
+        self.catalog.save(name, data)
+        self.hook_manager.hook.after_dataset_saved(
+            dataset_name=name, data=data, node=node
+        )
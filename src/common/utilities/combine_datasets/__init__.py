@@ -2,5 +2,7 @@
 
 from common.utilities.combine_datasets.combine_datasets import (
     concatenate_datasets,
+    create_partition,
     merge_datasets,
+    stream_concatenate_datasets,
 )
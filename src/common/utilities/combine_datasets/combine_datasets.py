@@ -1,45 +1,171 @@
 """Functions for combining datasets."""
 
 import functools
+from collections.abc import Callable
+from typing import Any
 
 import pandas as pd
 
+COLUMN_POLICIES = ("intersection", "union")
 
-def concatenate_datasets(*experiment_predictions: tuple[pd.DataFrame]) -> pd.DataFrame:
+
+def concatenate_datasets(
+    *experiment_predictions: tuple[pd.DataFrame], column_policy: str = "intersection"
+) -> pd.DataFrame:
     """Concatenation of datasets of various versions.
 
-    Concatenating list of dataframes. This is done on the common keys of all dataframes.
+    Concatenating list of dataframes. By default this is done on the common keys of
+    all dataframes.
+
+    Args:
+    ----
+        *experiment_predictions (tuple[pd.DataFrame]): DataFrames to concatenate.
+        column_policy (str, optional): "intersection" keeps the columns shared by
+            all DataFrames, "union" keeps every column. Defaults to "intersection".
 
-    Returns
+    Returns:
     -------
         pd.DataFrame: Concatenated dataframe.
 
     """
-    common_columns = list(
-        set.intersection(*[set(x.columns) for x in experiment_predictions])
+    columns = _resolve_columns(
+        [x.columns for x in experiment_predictions], column_policy
     )
 
     return pd.concat(
-        [x.loc[:, common_columns] for x in experiment_predictions]
+        [x.reindex(columns=columns) for x in experiment_predictions]
     ).reset_index()
 
 
+def create_partition(data: pd.DataFrame, partition_id: str) -> dict[str, pd.DataFrame]:
+    """Wrap a DataFrame into a single partition of a partitioned dataset.
+
+    The index is stored as a column, so that it survives file formats without an
+    index.
+
+    Args:
+    ----
+        data (pd.DataFrame): DataFrame to store.
+        partition_id (str): Name of the partition.
+
+    Returns:
+    -------
+        dict[str, pd.DataFrame]: Mapping from the partition id to the DataFrame.
+
+    """
+    return {partition_id: data.reset_index()}
+
+
+def stream_concatenate_datasets(
+    *partitioned_datasets: dict[str, Callable[[], pd.DataFrame]],
+    partition_ids: list[str] = None,
+    column_policy: str = "intersection",
+    fill_value: Any = None,
+) -> dict[str, Callable[[], pd.DataFrame]]:
+    """Concatenate partitioned datasets without holding all partitions in memory.
+
+    The partitions are loaded one at a time to resolve the combined columns. The
+    result is again a mapping of lazy loaders, which conform each partition to the
+    combined columns only when it is saved or read, so memory use does not grow
+    with the number of partitions. The loaders only give whole DataFrames, so every
+    partition is read twice: once for its columns and once when it is conformed.
+
+    Args:
+    ----
+        *partitioned_datasets (dict[str, Callable[[], pd.DataFrame]]): Loaded
+            partitioned datasets, i.e. mappings from partition ids to loaders.
+        partition_ids (list[str], optional): Partitions to combine. Defaults to all
+            partitions.
+        column_policy (str, optional): "intersection" keeps the columns shared by
+            all partitions, "union" keeps every column. Defaults to "intersection".
+        fill_value (Any, optional): Value for the columns missing in a partition
+            when using the "union" policy. Defaults to NaN.
+
+    Raises:
+    ------
+        ValueError: If a partition id is in more than one partitioned dataset.
+
+    Returns:
+    -------
+        dict[str, Callable[[], pd.DataFrame]]: Mapping from the partition ids to
+            loaders of the conformed partitions, ordered by partition id.
+
+    """
+    partitions = {}
+    for partitioned_dataset in partitioned_datasets:
+        duplicates = sorted(partitions.keys() & partitioned_dataset.keys())
+        if duplicates:
+            raise ValueError(f"Duplicate partition ids {duplicates}")
+        partitions.update(partitioned_dataset)
+    if partition_ids is not None:
+        partitions = {key: partitions[key] for key in partition_ids}
+
+    columns = _resolve_columns(
+        [partitions[key]().columns for key in sorted(partitions)], column_policy
+    )
+
+    def _conform(load: Callable[[], pd.DataFrame]) -> pd.DataFrame:
+        return load().reindex(columns=columns, fill_value=fill_value)
+
+    return {
+        key: functools.partial(_conform, partitions[key]) for key in sorted(partitions)
+    }
+
+
+def _resolve_columns(column_sets: list[pd.Index], column_policy: str) -> list[str]:
+    """Combine the columns of several DataFrames.
+
+    Args:
+    ----
+        column_sets (list[pd.Index]): Columns of each DataFrame.
+        column_policy (str): "intersection" or "union".
+
+    Raises:
+    ------
+        ValueError: If the column policy is unknown.
+
+    Returns:
+    -------
+        list[str]: Combined columns in the order in which they first appear.
+
+    """
+    if column_policy not in COLUMN_POLICIES:
+        raise ValueError(f"Invalid column policy '{column_policy}'")
+    columns = list(dict.fromkeys(col for cols in column_sets for col in cols))
+    if column_policy == "union":
+        return columns
+    common_columns = set.intersection(*[set(cols) for cols in column_sets])
+    return [col for col in columns if col in common_columns]
+
+
 def merge_datasets(**kwargs) -> pd.DataFrame:
     """Merge datasets based on the common keys.
 
-    Returns
+    Every dataset is indexed by the merge keys once and all datasets are joined in a
+    single multi-way join on the keys that are in every dataset, instead of merging
+    the growing result with one dataset after the other. When the keys are unique
+    within each dataset the join is a concatenation along the columns of the
+    aligned datasets, otherwise every combination of the rows with the same keys is
+    kept, like with `pd.merge`. The inputs are not modified.
+
+    Args:
+    ----
+        **kwargs: The datasets by variant name, and "params" with the merge keys.
+
+    Returns:
     -------
-        pd.DataFrame: Merged dataframe.
+        pd.DataFrame: Merged dataframe with the merge keys followed by the other
+            columns of every dataset, prefixed with its variant name. The rows are
+            sorted by the merge keys.
 
     """
     merge_keys = kwargs["params"]
-    dfs_list = []
+    indexed = []
     for key, df in kwargs.items():
         if key != "params":
-            rem_cols = set(df.columns).difference(merge_keys)
-            df.rename(columns={col: f"{key}_{col}" for col in rem_cols}, inplace=True)
-            dfs_list.append(df)
+            frame = df.set_index(merge_keys)
+            frame.columns = [f"{key}_{col}" for col in frame.columns]
+            indexed.append(frame)
 
-    return functools.reduce(
-        lambda df1, df2: pd.merge(df1, df2, on=merge_keys), dfs_list
-    )
+    merged = indexed[0].join(indexed[1:], how="inner")
+    return merged.sort_index(kind="stable").reset_index()
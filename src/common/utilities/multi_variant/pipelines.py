@@ -1,6 +1,13 @@
 """Pipelines for multi variant output."""
 
-from common.utilities.combine_datasets import concatenate_datasets, merge_datasets
+from functools import partial
+
+from common.utilities.combine_datasets import (
+    concatenate_datasets,
+    create_partition,
+    merge_datasets,
+    stream_concatenate_datasets,
+)
 from kedro.pipeline import Pipeline, node, pipeline
 
 
@@ -36,6 +43,66 @@ def create_experiment_predictions_variant_concat_pipeline(
     return pipeline(nodes, namespace=top_level_namespace)
 
 
+def create_experiment_predictions_variant_stream_pipeline(
+    top_level_namespace: str,
+    variants: list[str],
+    experiment_name: str,
+    column_policy: str = "union",
+    fill_value: float = 0,
+) -> Pipeline:
+    """Create pipeline that streams the DataFrames of all variants to disk.
+
+    Every variant's DataFrame is written as its own partition as soon as the variant
+    is done, so it can be released from memory. The combining node only receives
+    lazy partition loaders and returns lazy loaders conformed to the combined
+    columns.
+
+    Args:
+    ----
+        top_level_namespace (str): Namespace for the pipeline.
+        variants (list[str]): List of variants to include in the pipeline.
+        experiment_name (str): Name of the experiment.
+        column_policy (str, optional): "union" or "intersection" of the columns of
+            all variants. Defaults to "union".
+        fill_value (float, optional): Value for columns missing in a variant when
+            using the "union" policy. Defaults to 0.
+
+    Returns:
+    -------
+        Pipeline: The pipeline for streaming DataFrames.
+
+    """
+    exp_pred_partitions_list = [
+        f"{variant}.{experiment_name}_partition" for variant in variants
+    ]
+    nodes = [
+        node(
+            func=partial(create_partition, partition_id=variant),
+            inputs=f"{variant}.{experiment_name}",
+            outputs=partition,
+            name=f"{variant}.{experiment_name}_partition",
+            tags=["inference"],
+        )
+        for variant, partition in zip(variants, exp_pred_partitions_list)
+    ]
+    nodes.append(
+        node(
+            func=partial(
+                stream_concatenate_datasets,
+                partition_ids=variants,
+                column_policy=column_policy,
+                fill_value=fill_value,
+            ),
+            inputs=exp_pred_partitions_list,
+            outputs=f"{experiment_name}_streamed",
+            name=f"{experiment_name}_streamed",
+            tags=["inference"],
+        )
+    )
+
+    return pipeline(nodes, namespace=top_level_namespace)
+
+
 def create_experiment_predictions_variant_merge_pipeline(
     top_level_namespace: str,
     variants: list[str],
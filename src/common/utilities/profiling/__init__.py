@@ -0,0 +1,3 @@
+"""Init for profiling."""
+
+from common.utilities.profiling.profiling import StackSampler, write_profile
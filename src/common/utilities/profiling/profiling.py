@@ -0,0 +1,136 @@
+"""Sampling profiler for single function calls.
+
+A background thread takes the Python stack of the profiled thread at a fixed
+interval. Nothing is traced in between, so the overhead is independent of the
+number of calls, and the samples are written as collapsed stacks, the input of
+flamegraph tools such as ``flamegraph.pl`` or speedscope.
+"""
+
+import sys
+import threading
+from collections import Counter
+from pathlib import Path
+from types import CodeType, FrameType
+from typing import Optional, Union
+
+
+class StackSampler:
+    """Sample the stack of a thread while the sampler is active.
+
+    Only the frames called by the frame of ``root_code`` (the profiled call) are
+    kept. Use the sampler as a context manager in the thread to profile.
+    """
+
+    def __init__(self, root_code: Optional[CodeType] = None, interval: float = 0.005):
+        """Create the sampler.
+
+        Args:
+        ----
+            root_code (CodeType, optional): Code of the frame whose callees are
+                kept. Defaults to None, i.e. the whole stack.
+            interval (float, optional): Seconds between two samples. Defaults to
+                0.005.
+
+        """
+        self.root_code = root_code
+        self.interval = interval
+        self.stacks: Counter[tuple[str, ...]] = Counter()
+        self._thread_id: Optional[int] = None
+        self._stop = threading.Event()
+        self._sampler: Optional[threading.Thread] = None
+
+    def __enter__(self) -> "StackSampler":
+        """Start sampling the current thread."""
+        self._thread_id = threading.get_ident()
+        self._stop.clear()
+        self._sampler = threading.Thread(target=self._sample, daemon=True)
+        self._sampler.start()
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        """Stop sampling."""
+        self._stop.set()
+        self._sampler.join()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self._thread_id)  # noqa: SLF001
+            if frame is not None:
+                stack = self._stack(frame)
+                if stack:
+                    self.stacks[stack] += 1
+
+    def _stack(self, frame: Optional[FrameType]) -> tuple[str, ...]:
+        """Get the frames from the root to the sampled frame.
+
+        Args:
+        ----
+            frame (FrameType, optional): Innermost frame of the thread.
+
+        Returns:
+        -------
+            tuple[str, ...]: Names of the frames, outermost first.
+
+        """
+        names = []
+        while frame is not None and frame.f_code is not self.root_code:
+            names.append(_frame_name(frame.f_code))
+            frame = frame.f_back
+        if self.root_code is not None and frame is None:
+            return ()
+        return tuple(reversed(names))
+
+
+def write_profile(
+    stacks: Counter, path: Union[str, Path], top: int = 30
+) -> tuple[Path, Path]:
+    """Write the collapsed stacks and a summary of the hottest functions.
+
+    Args:
+    ----
+        stacks (Counter): Samples per stack, e.g. `StackSampler.stacks`.
+        path (Union[str, Path]): Path of the profile without a suffix.
+        top (int, optional): Number of functions in the summary. Defaults to 30.
+
+    Returns:
+    -------
+        tuple[Path, Path]: Paths of the collapsed stacks (".collapsed") and of the
+            summary ("_top.txt").
+
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    collapsed_path = path.with_name(f"{path.name}.collapsed")
+    collapsed_path.write_text(
+        "".join(f"{';'.join(stack)} {count}\n" for stack, count in stacks.items())
+    )
+
+    own: Counter[str] = Counter()
+    total: Counter[str] = Counter()
+    for stack, count in stacks.items():
+        own[stack[-1]] += count
+        for name in set(stack):
+            total[name] += count
+    n_samples = sum(stacks.values()) or 1
+    lines = [
+        f"{n_samples} samples",
+        f"{'own %':>7} {'total %':>7}  function",
+        *(
+            f"{100 * own[name] / n_samples:7.1f} {100 * total[name] / n_samples:7.1f}"
+            f"  {name}"
+            for name, _ in sorted(
+                total.items(), key=lambda item: (own[item[0]], item[1]), reverse=True
+            )[:top]
+        ),
+    ]
+    top_path = path.with_name(f"{path.name}_top.txt")
+    top_path.write_text("\n".join(lines) + "\n")
+    return collapsed_path, top_path
+
+
+def _frame_name(code: CodeType) -> str:
+    """Name a frame by its function and the last two parts of its file path."""
+    file_name = "/".join(Path(code.co_filename).parts[-2:])
+    name = getattr(code, "co_qualname", code.co_name)
+    # Semicolons separate the frames of a collapsed stack.
+    return f"{name} ({file_name}:{code.co_firstlineno})".replace(";", ",")
@@ -0,0 +1,10 @@
+"""Init for telemetry."""
+
+from common.utilities.telemetry.telemetry import (
+    data_size,
+    pop_phase_seconds,
+    read_events,
+    summarize_slowest_nodes,
+    summarize_trends,
+    timed,
+)
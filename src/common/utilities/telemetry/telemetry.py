@@ -0,0 +1,211 @@
+"""Functions for recording and summarizing the telemetry of pipeline runs.
+
+The events are written by the `TelemetryHooks` of the project as JSON lines, one
+object per node run (``"event": "node"``) and per pipeline run
+(``"event": "pipeline"``).
+"""
+
+import json
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+# Seconds spent in the named phases (e.g. "model_fit") of the node that currently
+# runs in this thread.
+_PHASES = threading.local()
+
+
+@contextmanager
+def timed(phase: str) -> Iterator[None]:
+    """Add the time spent in a block to a phase of the running node.
+
+    The phases of a node are added to its telemetry event, e.g. the time spent
+    fitting models, which is otherwise hidden in the duration of the node.
+
+    Args:
+    ----
+        phase (str): Name of the phase.
+
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        phases = _phase_seconds()
+        phases[phase] = phases.get(phase, 0.0) + time.perf_counter() - start
+
+
+def pop_phase_seconds() -> dict[str, float]:
+    """Get and reset the phase times recorded in this thread.
+
+    Returns
+    -------
+        dict[str, float]: Seconds per phase since the last call.
+
+    """
+    phases = _phase_seconds()
+    _PHASES.seconds = {}
+    return phases
+
+
+def data_size(data: Any) -> tuple[int, int]:
+    """Count the rows and the bytes of a node input or output.
+
+    DataFrames, Series and arrays are counted without inspecting their objects
+    (e.g. strings count as pointers), containers are counted element by element
+    and other objects count as zero.
+
+    Args:
+    ----
+        data (Any): Loaded or returned data.
+
+    Returns:
+    -------
+        tuple[int, int]: Number of rows and number of bytes.
+
+    """
+    if isinstance(data, pd.DataFrame):
+        return len(data), int(data.memory_usage(index=True, deep=False).sum())
+    if isinstance(data, pd.Series):
+        return len(data), int(data.memory_usage(index=True, deep=False))
+    if isinstance(data, np.ndarray):
+        return (len(data) if data.ndim else 1), int(data.nbytes)
+    if isinstance(data, dict):
+        data = list(data.values())
+    if isinstance(data, (list, tuple)):
+        sizes = [data_size(item) for item in data]
+        return sum(rows for rows, _ in sizes), sum(size for _, size in sizes)
+    return 0, 0
+
+
+def read_events(path: Union[str, Path]) -> pd.DataFrame:
+    """Read the telemetry events.
+
+    Args:
+    ----
+        path (Union[str, Path]): JSON lines file written by the telemetry hooks.
+
+    Returns:
+    -------
+        pd.DataFrame: One row per event, ordered as written. Incomplete lines
+            (e.g. of a killed run) are skipped.
+
+    """
+    events = []
+    with Path(path).open() as file:
+        for line in file:
+            try:
+                events.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+    events = pd.DataFrame(events)
+    if "start" in events:
+        events["start"] = pd.to_datetime(events["start"])
+    return events
+
+
+def summarize_slowest_nodes(
+    events: pd.DataFrame, top: int = 10, run_id: Optional[str] = None
+) -> pd.DataFrame:
+    """Summarize the slowest nodes of a run.
+
+    Args:
+    ----
+        events (pd.DataFrame): Events from `read_events`.
+        top (int, optional): Number of nodes. Defaults to 10.
+        run_id (str, optional): Run to summarize. Defaults to the latest run.
+
+    Returns:
+    -------
+        pd.DataFrame: The slowest nodes with their duration, share of the run time,
+            rows, memory, fit time and cache status.
+
+    """
+    nodes = events[events["event"] == "node"]
+    if nodes.empty:
+        return nodes
+    if run_id is None:
+        run_id = nodes["run_id"].iloc[-1]
+    nodes = nodes[nodes["run_id"] == run_id]
+    columns = [
+        "node",
+        "duration_s",
+        "rows_in",
+        "rows_out",
+        "peak_rss_mb",
+        "rss_increase_mb",
+        "model_fit_s",
+        "cache",
+        "status",
+    ]
+    summary = nodes.assign(
+        model_fit_s=[
+            phases.get("model_fit", np.nan) if isinstance(phases, dict) else np.nan
+            for phases in nodes.get("phases", pd.Series(None, index=nodes.index))
+        ],
+    ).reindex(columns=columns)
+    summary.insert(2, "share", summary["duration_s"] / summary["duration_s"].sum())
+    return summary.nlargest(top, "duration_s").reset_index(drop=True)
+
+
+def summarize_trends(
+    events: pd.DataFrame, last_runs: int = 5, top: int = 10
+) -> pd.DataFrame:
+    """Compare the duration and the rows of every node across the latest runs.
+
+    Args:
+    ----
+        events (pd.DataFrame): Events from `read_events`.
+        last_runs (int, optional): Number of runs to compare. Defaults to 5.
+        top (int, optional): Number of nodes. Defaults to 10.
+
+    Returns:
+    -------
+        pd.DataFrame: The nodes with the largest slowdown, i.e. the ratio of the
+            duration in the latest run to the median duration in the previous runs,
+            with the durations per run (oldest first) and the growth of the input
+            rows.
+
+    """
+    nodes = events[(events["event"] == "node") & (events["status"] == "success")]
+    if nodes.empty:
+        return nodes
+    runs = list(dict.fromkeys(nodes["run_id"]))[-last_runs:]
+    nodes = nodes[nodes["run_id"].isin(runs)]
+    durations = nodes.pivot_table(
+        index="node", columns="run_id", values="duration_s", aggfunc="sum"
+    ).reindex(columns=runs)
+    rows = nodes.pivot_table(
+        index="node", columns="run_id", values="rows_in", aggfunc="sum"
+    ).reindex(columns=runs)
+
+    latest, previous = durations[runs[-1]], durations[runs[:-1]]
+    trends = pd.DataFrame(
+        {
+            "latest_s": latest,
+            "previous_median_s": previous.median(axis=1),
+            "slowdown": latest / previous.median(axis=1),
+            "rows_growth": rows[runs[-1]] / rows[runs[:-1]].median(axis=1),
+        }
+    )
+    durations.columns = [f"run_{position}_s" for position in range(len(runs))]
+    trends = trends.join(durations)
+    return (
+        trends.sort_values(
+            ["slowdown", "latest_s"], ascending=False, na_position="last"
+        )
+        .head(top)
+        .reset_index()
+    )
+
+
+def _phase_seconds() -> dict[str, float]:
+    if not hasattr(_PHASES, "seconds"):
+        _PHASES.seconds = {}
+    return _PHASES.seconds
@@ -1,3 +1,4 @@
 """Functions for data collection."""
 
 from data_collection.functions.data_collection import data_collection
+from data_collection.functions.synthetic_data import generate_price_data
@@ -1,7 +1,6 @@
 """Functions for data collection."""
 
 import pandas as pd
-import yfinance as yf
 
 
 def data_collection(
@@ -39,6 +38,8 @@ def _download_all_stock_information(
         dict[str, pd.DataFrame]: Dictionary with the stock information for each symbol.
 
     """
+    import yfinance as yf
+
     period = data_loader_params["period"]
 
     data = yf.download(list_symbols, period=period)
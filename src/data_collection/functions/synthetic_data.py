@@ -0,0 +1,246 @@
+"""Functions for generating synthetic price data."""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+_RATE_PARAMS = (
+    "market_correlation",
+    "missing_bar_rate",
+    "ipo_rate",
+    "delisting_rate",
+    "split_rate",
+)
+
+
+def generate_price_data(synthetic_data_params: dict[str, Any]) -> pd.DataFrame:
+    """Generate deterministic price data with the schema of `data_collection`.
+
+    The daily log returns of every ticker mix a market shock, shared by all tickers,
+    with an idiosyncratic shock. Their volatility follows market regimes of random
+    length. All values are drawn at once as (days x tickers) arrays, so millions of
+    rows take seconds. The same parameters always generate the same data.
+
+    Args:
+    ----
+        synthetic_data_params (dict[str, Any]): Parameters of the generator:
+            - n_tickers, n_days: Size of the universe and number of business days.
+            - start_date: First date. Defaults to "2010-01-04".
+            - seed: Seed of the random generator. Defaults to 0.
+            - drift: Mean daily log return. Defaults to 0.0003.
+            - volatility_regimes: Daily volatilities of the regimes. Defaults to
+              [0.01, 0.025].
+            - mean_regime_days: Mean length of a regime in days. Defaults to 60.
+            - market_correlation: Share of the return variance explained by the
+              market shock. Defaults to 0.3.
+            - missing_bar_rate: Probability that a (date, ticker) row is missing.
+            - ipo_rate, delisting_rate: Share of the tickers that start trading
+              after the first date and stop trading before the last date.
+            - split_rate: Share of the tickers with a stock split, which divides
+              the unadjusted prices (and multiplies the volume) by one of the
+              "split_ratios" (defaults to [2, 3]) from the split date on.
+            - dividend_yield: Yearly dividend yield by which "adj_close" is
+              discounted against "close" for earlier dates.
+            The rates default to 0.
+
+    Raises:
+    ------
+        ValueError: If the size is not positive or a rate is not in [0, 1].
+
+    Returns:
+    -------
+        pd.DataFrame: Price data sorted by date and ticker with the columns "date"
+            (formatted as "%Y-%m-%d"), "stock_ticker", "adj_close", "close",
+            "high", "low", "open" and "volume".
+
+    """
+    n_tickers = synthetic_data_params["n_tickers"]
+    n_days = synthetic_data_params["n_days"]
+    if n_tickers < 1 or n_days < 1:
+        raise ValueError(f"Invalid size {n_tickers} tickers x {n_days} days")
+    for name in _RATE_PARAMS:
+        if not 0 <= synthetic_data_params.get(name, 0) <= 1:
+            raise ValueError(f"Invalid {name} {synthetic_data_params[name]}")
+
+    rng = np.random.default_rng(synthetic_data_params.get("seed", 0))
+    volatility = _regime_volatility(
+        rng,
+        n_days,
+        synthetic_data_params.get("volatility_regimes", [0.01, 0.025]),
+        synthetic_data_params.get("mean_regime_days", 60),
+    )[:, None] * rng.uniform(0.5, 1.5, n_tickers)
+    market_correlation = synthetic_data_params.get("market_correlation", 0.3)
+    log_returns = synthetic_data_params.get("drift", 3e-4) + volatility * (
+        np.sqrt(market_correlation) * rng.standard_normal((n_days, 1))
+        + np.sqrt(1 - market_correlation) * rng.standard_normal((n_days, n_tickers))
+    )
+    log_returns[0] = 0
+    # Split-adjusted prices, continuous through the corporate actions.
+    adjusted = np.exp(
+        rng.uniform(np.log(10), np.log(500), n_tickers) + np.cumsum(log_returns, axis=0)
+    )
+    columns = _ohlcv(rng, adjusted, volatility, log_returns)
+
+    split_factor = _split_factor(rng, n_days, n_tickers, synthetic_data_params)
+    for name in ["close", "high", "low", "open"]:
+        columns[name] = columns[name] * split_factor
+    columns["volume"] = np.round(columns["volume"] / split_factor)
+    dividend_yield = synthetic_data_params.get("dividend_yield", 0.0)
+    columns["adj_close"] = (
+        adjusted
+        * np.exp(-dividend_yield / 252 * np.arange(n_days - 1, -1, -1))[:, None]
+    )
+
+    rows = _listed_rows(rng, n_days, n_tickers, synthetic_data_params).ravel()
+    dates = pd.bdate_range(
+        start=synthetic_data_params.get("start_date", "2010-01-04"), periods=n_days
+    ).strftime("%Y-%m-%d")
+    width = max(4, len(str(n_tickers - 1)))
+    tickers = np.array(
+        [f"TICKER_{i:0{width}d}" for i in range(n_tickers)], dtype=object
+    )
+    return pd.DataFrame(
+        {
+            "date": np.repeat(dates.to_numpy(dtype=object), n_tickers)[rows],
+            "stock_ticker": np.tile(tickers, n_days)[rows],
+            **{
+                name: columns[name].ravel()[rows]
+                for name in ["adj_close", "close", "high", "low", "open", "volume"]
+            },
+        }
+    )
+
+
+def _regime_volatility(
+    rng: np.random.Generator,
+    n_days: int,
+    volatility_regimes: list[float],
+    mean_regime_days: float,
+) -> np.ndarray:
+    """Draw the volatility of every day from regimes of geometric length.
+
+    Args:
+    ----
+        rng (np.random.Generator): Random generator.
+        n_days (int): Number of days.
+        volatility_regimes (list[float]): Daily volatility of each regime.
+        mean_regime_days (float): Mean length of a regime in days.
+
+    Returns:
+    -------
+        np.ndarray: Daily volatility of the market, one value per day.
+
+    """
+    # Every regime lasts at least one day, so n_days regimes always cover all days.
+    lengths = rng.geometric(1 / max(mean_regime_days, 1), n_days)
+    regimes = rng.integers(len(volatility_regimes), size=n_days)
+    return np.repeat(np.asarray(volatility_regimes, dtype=float)[regimes], lengths)[
+        :n_days
+    ]
+
+
+def _ohlcv(
+    rng: np.random.Generator,
+    close: np.ndarray,
+    volatility: np.ndarray,
+    log_returns: np.ndarray,
+) -> dict[str, np.ndarray]:
+    """Create the open, high, low and volume around the close prices.
+
+    Args:
+    ----
+        rng (np.random.Generator): Random generator.
+        close (np.ndarray): Close prices (days x tickers).
+        volatility (np.ndarray): Daily volatility (days x tickers).
+        log_returns (np.ndarray): Daily log returns of the close (days x tickers).
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: The "close", "high", "low", "open" and "volume".
+
+    """
+    previous_close = np.vstack([close[:1], close[:-1]])
+    open_ = previous_close * np.exp(
+        0.25 * volatility * rng.standard_normal(close.shape)
+    )
+    range_ = 0.5 * volatility * np.abs(rng.standard_normal((2, *close.shape)))
+    # Trading volume is higher on days with large moves.
+    volume = (
+        np.exp(rng.uniform(np.log(1e5), np.log(1e7), close.shape[1]))
+        * rng.lognormal(0, 0.3, close.shape)
+        * (1 + np.abs(log_returns) / volatility)
+    )
+    return {
+        "close": close,
+        "high": np.maximum(open_, close) * np.exp(range_[0]),
+        "low": np.minimum(open_, close) * np.exp(-range_[1]),
+        "open": open_,
+        "volume": volume,
+    }
+
+
+def _split_factor(
+    rng: np.random.Generator,
+    n_days: int,
+    n_tickers: int,
+    synthetic_data_params: dict[str, Any],
+) -> np.ndarray:
+    """Draw the stock splits as factors of the unadjusted prices.
+
+    Args:
+    ----
+        rng (np.random.Generator): Random generator.
+        n_days (int): Number of days.
+        n_tickers (int): Number of tickers.
+        synthetic_data_params (dict[str, Any]): See `generate_price_data`.
+
+    Returns:
+    -------
+        np.ndarray: Split ratio before the split date of a ticker with a split, 1
+            otherwise (days x tickers).
+
+    """
+    has_split = rng.random(n_tickers) < synthetic_data_params.get("split_rate", 0.0)
+    split_day = rng.integers(1, max(n_days, 2), n_tickers)
+    ratio = rng.choice(synthetic_data_params.get("split_ratios", [2, 3]), n_tickers)
+    before_split = np.arange(n_days)[:, None] < split_day
+    return np.where(before_split & has_split, ratio, 1).astype(float)
+
+
+def _listed_rows(
+    rng: np.random.Generator,
+    n_days: int,
+    n_tickers: int,
+    synthetic_data_params: dict[str, Any],
+) -> np.ndarray:
+    """Draw the rows that exist, given the IPOs, delistings and missing bars.
+
+    Args:
+    ----
+        rng (np.random.Generator): Random generator.
+        n_days (int): Number of days.
+        n_tickers (int): Number of tickers.
+        synthetic_data_params (dict[str, Any]): See `generate_price_data`.
+
+    Returns:
+    -------
+        np.ndarray: Boolean mask (days x tickers) of the rows in the price data.
+            Every ticker keeps at least its first listed day.
+
+    """
+    first_day = np.where(
+        rng.random(n_tickers) < synthetic_data_params.get("ipo_rate", 0.0),
+        rng.integers(0, n_days, n_tickers),
+        0,
+    )
+    last_day = np.where(
+        rng.random(n_tickers) < synthetic_data_params.get("delisting_rate", 0.0),
+        first_day + (rng.random(n_tickers) * (n_days - first_day)).astype(int),
+        n_days - 1,
+    )
+    days = np.arange(n_days)[:, None]
+    missing = rng.random((n_days, n_tickers)) < synthetic_data_params.get(
+        "missing_bar_rate", 0.0
+    )
+    return (days >= first_day) & (days <= last_day) & (~missing | (days == first_day))
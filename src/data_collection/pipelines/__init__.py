@@ -1,3 +1,6 @@
 """Pipeline for data collection."""
 
-from data_collection.pipelines.pipeline import create_data_collection_pipeline
+from data_collection.pipelines.pipeline import (
+    create_data_collection_pipeline,
+    create_synthetic_data_collection_pipeline,
+)
@@ -1,6 +1,6 @@
 """Pipeline for data collection."""
 
-from data_collection.functions import data_collection
+from data_collection.functions import data_collection, generate_price_data
 from kedro.pipeline import Pipeline, node, pipeline
 
 
@@ -21,6 +21,31 @@ def create_data_collection_pipeline() -> Pipeline:
             },
             outputs="price_data",
             name="data_collection",
+            # Downloads the latest prices, which the inputs do not identify.
+            tags=["data_collection", "no_cache"],
+        ),
+    ]
+
+    return pipeline(nodes)
+
+
+def create_synthetic_data_collection_pipeline() -> Pipeline:
+    """Pipeline that generates synthetic price data instead of downloading it.
+
+    The synthetic "price_data" has the schema of the downloaded data, so the
+    downstream pipelines run offline and at any scale ("params:synthetic_data").
+
+    Returns
+    -------
+        Pipeline: The synthetic data collection pipeline.
+
+    """
+    nodes = [
+        node(
+            func=generate_price_data,
+            inputs="params:synthetic_data",
+            outputs="price_data",
+            name="synthetic_data_collection",
             tags=["data_collection"],
         ),
     ]
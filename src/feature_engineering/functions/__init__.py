@@ -1,8 +1,17 @@
 """Init file functions for feature engineering."""
 
+from feature_engineering.functions.lazy_preprocessing import (
+    FEATURE_BACKENDS,
+    check_lazy_feature_params,
+    concatenate_partitions,
+    create_features_lazy,
+    create_partitioned_features,
+    partition_by_ticker,
+)
 from feature_engineering.functions.preprocessing import (
     basic_arithmetic,
     calculate_rolling_aggregations,
+    create_features,
     log_returns,
     shift_features,
 )
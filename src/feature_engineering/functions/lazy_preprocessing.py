@@ -0,0 +1,255 @@
+"""Functions for computing the features out of core with Polars.
+
+Polars is only imported when the functions run.
+"""
+
+import functools
+import math
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from feature_engineering.functions.preprocessing import _filter_strings
+
+if TYPE_CHECKING:
+    import polars as pl
+
+FEATURE_BACKENDS = ("pandas", "polars")
+LAZY_AGGREGATION_TYPES = ("mean", "std")
+
+
+def check_lazy_feature_params(
+    arithmetic_params: list[dict[str, str]], aggregation_params: list[dict[str, Any]]
+) -> None:
+    """Check that `create_features_lazy` supports the configured features.
+
+    `create_features` skips the formulas without "-" and the aggregation types
+    other than "mean" and "std", the Polars backend rejects them instead.
+
+    Args:
+    ----
+        arithmetic_params (list[dict[str, str]]): See `basic_arithmetic`.
+        aggregation_params (list[dict[str, Any]]): See
+            `calculate_rolling_aggregations`.
+
+    Raises:
+    ------
+        ValueError: If a formula is not a difference "<column> - <column>" or an
+            aggregation type is not supported.
+
+    """
+    for operation in arithmetic_params:
+        if len(operation["formula"].split(" - ")) != 2:  # noqa: PLR2004
+            raise ValueError(
+                f"Unsupported formula '{operation['formula']}' for the Polars "
+                "feature backend, expected '<column> - <column>'"
+            )
+    for param in aggregation_params:
+        if param["aggregation_type"] not in LAZY_AGGREGATION_TYPES:
+            raise ValueError(
+                f"Unsupported aggregation type '{param['aggregation_type']}' for the "
+                f"Polars feature backend, expected one of {LAZY_AGGREGATION_TYPES}"
+            )
+
+
+def create_features_lazy(
+    price_data: "pl.LazyFrame",
+    arithmetic_params: list[dict[str, str]],
+    aggregation_params: list[dict[str, Any]],
+    shift_params: dict[str, Any],
+    log_return_params: dict[str, Any],
+) -> "pl.LazyFrame":
+    """Add the feature columns of `create_features` to a lazy query.
+
+    Nothing is computed here: the query only runs when its result is collected or
+    written, e.g. by the `StreamingPolarsDataset`. The rolling, shifted and log
+    return columns are window expressions over the rows of every ticker, so the
+    result equals `create_features`. The sort and the windows hold the whole input
+    in memory, `create_partitioned_features` bounds it by running the query per
+    partition of whole tickers.
+
+    Args:
+    ----
+        price_data (pl.LazyFrame): Lazy query of the price data.
+        arithmetic_params (list[dict[str, str]]): See `basic_arithmetic`.
+        aggregation_params (list[dict[str, Any]]): See
+            `calculate_rolling_aggregations`.
+        shift_params (dict[str, Any]): See `shift_features`.
+        log_return_params (dict[str, Any]): See `log_returns`.
+
+    Raises:
+    ------
+        ValueError: If a feature is not supported, see `check_lazy_feature_params`.
+
+    Returns:
+    -------
+        pl.LazyFrame: The price data sorted by ticker with all feature columns.
+
+    """
+    import polars as pl
+
+    check_lazy_feature_params(arithmetic_params, aggregation_params)
+    ticker = "stock_ticker"
+    price_data = price_data.sort(ticker, maintain_order=True)
+    columns = list(price_data.collect_schema().names())
+
+    arithmetic = []
+    for operation in arithmetic_params:
+        left, right = operation["formula"].split(" - ")
+        arithmetic.append(
+            (pl.col(left) - pl.col(right)).alias(f"ftr_{operation['new_column']}")
+        )
+
+    rolling = []
+    for param in aggregation_params:
+        aggregation_type = param["aggregation_type"]
+        for column in param["aggregation_columns"]:
+            values = pl.col(column).cast(pl.Float64)
+            for length in param["aggregation_lengths"]:
+                aggregated = getattr(values, f"rolling_{aggregation_type}")(length)
+                rolling.append(
+                    aggregated.over(ticker).alias(
+                        f"ftr_{column}_{aggregation_type}_{length}"
+                    )
+                )
+
+    # The shifted features include the new columns, in the order they are added.
+    columns = list(
+        dict.fromkeys(
+            [*columns, *(expr.meta.output_name() for expr in arithmetic + rolling)]
+        )
+    )
+    shift_period = shift_params["shift_period"]
+    shifted = [
+        pl.col(column)
+        .cast(pl.Float64)
+        .shift(shift_period)
+        .over(ticker)
+        .alias(f"{column}_shifted_{shift_period}")
+        for column in _filter_strings(columns, "ftr.*")
+    ]
+
+    log_returns = [
+        (pl.col(column).cast(pl.Float64) / pl.col(column).cast(pl.Float64).shift(1))
+        .log()
+        .over(ticker)
+        .alias(f"log_return_{column}")
+        for column in log_return_params["columns"]
+    ]
+
+    for expressions in [arithmetic, rolling, shifted, log_returns]:
+        if expressions:
+            price_data = price_data.with_columns(expressions)
+    return price_data
+
+
+def partition_by_ticker(
+    price_data: "pl.LazyFrame", feature_backend_params: dict[str, Any]
+) -> dict[str, Callable[[], "pl.LazyFrame"]]:
+    """Split the price data into partitions of whole tickers.
+
+    The sorted tickers are cut into contiguous ranges, so the partitions in the
+    order of their ids are sorted by ticker. Only the tickers are collected here,
+    every partition is a filter of the lazy price data that runs when it is saved.
+
+    Args:
+    ----
+        price_data (pl.LazyFrame): Lazy query of the price data.
+        feature_backend_params (dict[str, Any]): Parameters with the number of
+            partitions "n_partitions".
+
+    Raises:
+    ------
+        ValueError: If the number of partitions is not positive.
+
+    Returns:
+    -------
+        dict[str, Callable[[], pl.LazyFrame]]: Mapping from the partition ids to
+            the lazy queries of the partitions.
+
+    """
+    import polars as pl
+
+    n_partitions = feature_backend_params["n_partitions"]
+    if n_partitions < 1:
+        raise ValueError(f"Invalid number of partitions {n_partitions}")
+    tickers = sorted(
+        price_data.select(pl.col("stock_ticker").unique())
+        .collect()["stock_ticker"]
+        .to_list()
+    )
+    size = max(math.ceil(len(tickers) / n_partitions), 1)
+
+    def _select(partition_tickers: list[str]) -> "pl.LazyFrame":
+        return price_data.filter(pl.col("stock_ticker").is_in(partition_tickers))
+
+    return {
+        f"part_{start // size:04d}": functools.partial(
+            _select, tickers[start : start + size]
+        )
+        for start in range(0, len(tickers), size)
+    }
+
+
+def create_partitioned_features(
+    price_data_partitions: dict[str, Callable[[], "pl.LazyFrame"]],
+    arithmetic_params: list[dict[str, str]],
+    aggregation_params: list[dict[str, Any]],
+    shift_params: dict[str, Any],
+    log_return_params: dict[str, Any],
+) -> dict[str, Callable[[], "pl.LazyFrame"]]:
+    """Add the feature columns to every partition of whole tickers.
+
+    The result is again a mapping of lazy loaders, which are called one at a time
+    when the partitions are saved, so memory use is bounded by the largest
+    partition instead of the whole universe.
+
+    Args:
+    ----
+        price_data_partitions (dict[str, Callable[[], pl.LazyFrame]]): Loaded
+            partitioned price data, see `partition_by_ticker`.
+        arithmetic_params (list[dict[str, str]]): See `basic_arithmetic`.
+        aggregation_params (list[dict[str, Any]]): See
+            `calculate_rolling_aggregations`.
+        shift_params (dict[str, Any]): See `shift_features`.
+        log_return_params (dict[str, Any]): See `log_returns`.
+
+    Returns:
+    -------
+        dict[str, Callable[[], pl.LazyFrame]]: Mapping from the partition ids to
+            the lazy queries of the partitions with the feature columns.
+
+    """
+
+    def _features(load: Callable[[], "pl.LazyFrame"]) -> "pl.LazyFrame":
+        return create_features_lazy(
+            load(),
+            arithmetic_params,
+            aggregation_params,
+            shift_params,
+            log_return_params,
+        )
+
+    return {
+        key: functools.partial(_features, price_data_partitions[key])
+        for key in sorted(price_data_partitions)
+    }
+
+
+def concatenate_partitions(
+    partitions: dict[str, Callable[[], "pl.LazyFrame"]],
+) -> "pl.LazyFrame":
+    """Concatenate the partitions in the order of their ids as one lazy query.
+
+    Args:
+    ----
+        partitions (dict[str, Callable[[], pl.LazyFrame]]): Loaded partitioned
+            dataset.
+
+    Returns:
+    -------
+        pl.LazyFrame: Lazy query of all rows.
+
+    """
+    import polars as pl
+
+    return pl.concat([partitions[key]() for key in sorted(partitions)])
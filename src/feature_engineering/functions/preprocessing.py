@@ -1,12 +1,66 @@
 """Functions for preprocessing the data."""
 
 import re
+from collections.abc import Mapping
 from typing import Any
 
 import numpy as np
 import pandas as pd
 
 
+def create_features(
+    price_data: pd.DataFrame,
+    arithmetic_params: list[dict[str, str]],
+    aggregation_params: list[dict[str, Any]],
+    shift_params: dict[str, Any],
+    log_return_params: dict[str, Any],
+) -> pd.DataFrame:
+    """Run all feature steps as one transform on a single frame.
+
+    The rows are sorted by ticker once and every step only adds its new columns,
+    computed from the columns of the earlier steps, so no intermediate frame is
+    created or copied. The result equals chaining `basic_arithmetic`,
+    `calculate_rolling_aggregations`, `shift_features` and `log_returns`.
+
+    Args:
+    ----
+        price_data (pd.DataFrame): DataFrame with the price data.
+        arithmetic_params (list[dict[str, str]]): See `basic_arithmetic`.
+        aggregation_params (list[dict[str, Any]]): See
+            `calculate_rolling_aggregations`.
+        shift_params (dict[str, Any]): See `shift_features`.
+        log_return_params (dict[str, Any]): See `log_returns`.
+
+    Returns:
+    -------
+        pd.DataFrame: The price data sorted by ticker with all feature columns.
+
+    """
+    price_data = _sort_by_ticker(price_data)
+    from_start, from_end = _group_offsets(price_data["stock_ticker"].to_numpy())
+    original = {name: price_data[name] for name in price_data.columns}
+    columns = dict(original)
+    columns.update(_arithmetic_columns(columns, arithmetic_params))
+    columns.update(_rolling_columns(columns, from_start, aggregation_params))
+    columns.update(
+        _shift_columns(
+            columns,
+            _filter_strings(columns, "ftr.*"),
+            (from_start, from_end),
+            shift_params["shift_period"],
+        )
+    )
+    columns.update(_log_return_columns(columns, from_start, log_return_params))
+    return _with_columns(
+        price_data,
+        {
+            name: values
+            for name, values in columns.items()
+            if original.get(name) is not values
+        },
+    )
+
+
 def basic_arithmetic(
     price_data: pd.DataFrame, arithmetic_params: dict[str, str]
 ) -> pd.DataFrame:
@@ -22,14 +76,7 @@ def basic_arithmetic(
         pd.DataFrame: DataFrame with the new columns.
 
     """
-    for operation in arithmetic_params:
-        new_column = f"ftr_{operation['new_column']}"
-        formula = operation["formula"]
-
-        if "-" in formula:
-            columns = formula.split(" - ")
-            price_data[new_column] = price_data[columns[0]] - price_data[columns[1]]
-    return price_data
+    return _with_columns(price_data, _arithmetic_columns(price_data, arithmetic_params))
 
 
 def calculate_rolling_aggregations(
@@ -44,31 +91,15 @@ def calculate_rolling_aggregations(
 
     Returns:
     -------
-        pd.DataFrame: DataFrame with the new columns.
+        pd.DataFrame: DataFrame sorted by ticker with the new columns.
 
     """
-
-    def apply_rolling(group, aggregation_params):
-        for param in aggregation_params:
-            columns = param["aggregation_columns"]
-            aggregation_type = param["aggregation_type"]
-            aggregation_lengths = param["aggregation_lengths"]
-
-            for column in columns:
-                for length in aggregation_lengths:
-                    column_name = f"ftr_{column}_{aggregation_type}_{length}"
-                    if aggregation_type == "mean":
-                        group[column_name] = group[column].rolling(window=length).mean()
-                    elif aggregation_type == "std":
-                        group[column_name] = group[column].rolling(window=length).std()
-        return group
-
-    price_data = price_data.groupby("stock_ticker").apply(
-        apply_rolling, aggregation_params
+    price_data = _sort_by_ticker(price_data)
+    from_start, _ = _group_offsets(price_data["stock_ticker"].to_numpy())
+    return _with_columns(
+        price_data, _rolling_columns(price_data, from_start, aggregation_params)
     )
 
-    return price_data.reset_index(drop=True)
-
 
 def shift_features(
     price_data: pd.DataFrame, shift_params: dict[str, Any]
@@ -84,25 +115,17 @@ def shift_features(
 
     Returns:
     -------
-        pd.DataFrame: DataFrame with the shifted features.
+        pd.DataFrame: DataFrame sorted by ticker with the shifted features.
 
     """
-
-    def apply_shifts(
-        group: pd.DataFrame, shift_params: dict[str, str], columns: list[str]
-    ):
-        shift_period = shift_params["shift_period"]
-        for column in columns:
-            group[f"{column}_shifted_{shift_period}"] = group[column].shift(
-                shift_period
-            )
-        return group
-
+    price_data = _sort_by_ticker(price_data)
+    offsets = _group_offsets(price_data["stock_ticker"].to_numpy())
     feature_columns = _filter_strings(price_data.columns, "ftr.*")
-    return (
-        price_data.groupby("stock_ticker")
-        .apply(apply_shifts, shift_params, feature_columns)
-        .reset_index(drop=True)
+    return _with_columns(
+        price_data,
+        _shift_columns(
+            price_data, feature_columns, offsets, shift_params["shift_period"]
+        ),
     )
 
 
@@ -121,18 +144,226 @@ def log_returns(
         pd.DataFrame: DataFrame with the log returns.
 
     """
+    order = np.argsort(price_data["stock_ticker"].to_numpy(), kind="stable")
+    sorted_columns = {
+        column: price_data[column].to_numpy()[order]
+        for column in log_return_params["columns"]
+    }
+    from_start, _ = _group_offsets(price_data["stock_ticker"].to_numpy()[order])
+    new_columns = {}
+    for name, values in _log_return_columns(
+        sorted_columns, from_start, log_return_params
+    ).items():
+        new_columns[name] = np.empty(len(values))
+        new_columns[name][order] = values
+    return _with_columns(price_data, new_columns)
+
+
+def _sort_by_ticker(price_data: pd.DataFrame) -> pd.DataFrame:
+    """Sort the rows by ticker, keeping the order of the rows of every ticker.
+
+    Args:
+    ----
+        price_data (pd.DataFrame): DataFrame with the column "stock_ticker".
+
+    Returns:
+    -------
+        pd.DataFrame: Sorted DataFrame with a new range index.
+
+    """
+    tickers = price_data["stock_ticker"].to_numpy()
+    if (tickers[1:] >= tickers[:-1]).all():
+        sorted_data = price_data.copy(deep=False)
+    else:
+        sorted_data = price_data.take(np.argsort(tickers, kind="stable"))
+    sorted_data.index = pd.RangeIndex(len(sorted_data))
+    return sorted_data
 
-    def log_return(series):
-        return np.log(series / series.shift(1))
 
-    columns = log_return_params["columns"]
-    for column in columns:
-        log_return_column = f"log_return_{column}"
-        price_data[log_return_column] = price_data.groupby("stock_ticker")[
-            column
-        ].transform(log_return)
+def _group_offsets(tickers: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Get the offset of every row from the first and the last row of its ticker.
+
+    Args:
+    ----
+        tickers (np.ndarray): Tickers sorted so that every ticker is contiguous.
+
+    Returns:
+    -------
+        tuple[np.ndarray, np.ndarray]: Offsets from the first and from the last row.
+
+    """
+    positions = np.arange(len(tickers))
+    new_group = np.ones(len(tickers), dtype=bool)
+    new_group[1:] = tickers[1:] != tickers[:-1]
+    starts = np.flatnonzero(new_group)
+    stops = np.append(starts[1:], len(tickers))
+    group = np.cumsum(new_group) - 1
+    return positions - starts[group], stops[group] - 1 - positions
+
+
+def _with_columns(
+    price_data: pd.DataFrame, new_columns: dict[str, np.ndarray]
+) -> pd.DataFrame:
+    """Append columns without copying the existing ones.
+
+    Args:
+    ----
+        price_data (pd.DataFrame): DataFrame to extend.
+        new_columns (dict[str, np.ndarray]): New columns, aligned with the rows.
 
-    return price_data
+    Returns:
+    -------
+        pd.DataFrame: DataFrame with the existing and the new columns.
+
+    """
+    if not new_columns:
+        return price_data
+    existing = [name for name in new_columns if name in price_data.columns]
+    if existing:
+        price_data = price_data.assign(**{name: new_columns[name] for name in existing})
+        new_columns = {
+            name: values for name, values in new_columns.items() if name not in existing
+        }
+    return pd.concat(
+        [price_data, pd.DataFrame(new_columns, index=price_data.index, copy=False)],
+        axis=1,
+        copy=False,
+    )
+
+
+def _arithmetic_columns(
+    columns: Mapping[str, Any], arithmetic_params: list[dict[str, str]]
+) -> dict[str, np.ndarray]:
+    """Compute the differences of two columns.
+
+    Args:
+    ----
+        columns (Mapping[str, Any]): Existing columns by name.
+        arithmetic_params (list[dict[str, str]]): Operations with the name of the
+            "new_column" and a "formula" such as "high - low".
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: New columns by name.
+
+    """
+    new_columns = {}
+    for operation in arithmetic_params:
+        formula = operation["formula"]
+        if "-" in formula:
+            left, right = formula.split(" - ")
+            new_columns[f"ftr_{operation['new_column']}"] = np.asarray(
+                columns[left]
+            ) - np.asarray(columns[right])
+    return new_columns
+
+
+def _rolling_columns(
+    columns: Mapping[str, Any],
+    from_start: np.ndarray,
+    aggregation_params: list[dict[str, Any]],
+) -> dict[str, np.ndarray]:
+    """Compute rolling aggregations within every ticker.
+
+    The windows are rolled over the whole column, windows reaching into the
+    previous ticker are then set to NaN.
+
+    Args:
+    ----
+        columns (Mapping[str, Any]): Existing columns by name, sorted by ticker.
+        from_start (np.ndarray): Offset of every row from the first row of its
+            ticker.
+        aggregation_params (list[dict[str, Any]]): Aggregations with the
+            "aggregation_type" ("mean" or "std"), the "aggregation_columns" and
+            the "aggregation_lengths".
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: New columns by name.
+
+    """
+    new_columns = {}
+    for param in aggregation_params:
+        aggregation_type = param["aggregation_type"]
+        if aggregation_type not in ("mean", "std"):
+            continue
+        for column in param["aggregation_columns"]:
+            values = pd.Series(np.asarray(columns[column], dtype=float))
+            for length in param["aggregation_lengths"]:
+                aggregated = getattr(values.rolling(window=length), aggregation_type)()
+                aggregated = aggregated.to_numpy()
+                aggregated[from_start < length - 1] = np.nan
+                new_columns[f"ftr_{column}_{aggregation_type}_{length}"] = aggregated
+    return new_columns
+
+
+def _shift_columns(
+    columns: Mapping[str, Any],
+    feature_columns: list[str],
+    offsets: tuple[np.ndarray, np.ndarray],
+    shift_period: int,
+) -> dict[str, np.ndarray]:
+    """Shift columns within every ticker.
+
+    Args:
+    ----
+        columns (Mapping[str, Any]): Existing columns by name, sorted by ticker.
+        feature_columns (list[str]): Columns to shift.
+        offsets (tuple[np.ndarray, np.ndarray]): Offsets of every row from the
+            first and the last row of its ticker.
+        shift_period (int): Number of rows to shift, negative values shift
+            backwards.
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: Shifted columns named "<column>_shifted_<period>".
+
+    """
+    from_start, from_end = offsets
+    invalid = (
+        from_start < shift_period if shift_period >= 0 else from_end < -shift_period
+    )
+    new_columns = {}
+    for column in feature_columns:
+        values = np.asarray(columns[column], dtype=float)
+        shifted = np.full(len(values), np.nan)
+        if shift_period >= 0:
+            shifted[shift_period:] = values[: len(values) - shift_period]
+        else:
+            shifted[:shift_period] = values[-shift_period:]
+        shifted[invalid] = np.nan
+        new_columns[f"{column}_shifted_{shift_period}"] = shifted
+    return new_columns
+
+
+def _log_return_columns(
+    columns: Mapping[str, Any],
+    from_start: np.ndarray,
+    log_return_params: dict[str, Any],
+) -> dict[str, np.ndarray]:
+    """Compute the log returns within every ticker.
+
+    Args:
+    ----
+        columns (Mapping[str, Any]): Existing columns by name, sorted by ticker.
+        from_start (np.ndarray): Offset of every row from the first row of its
+            ticker.
+        log_return_params (dict[str, Any]): "columns" lists the price columns.
+
+    Returns:
+    -------
+        dict[str, np.ndarray]: Log returns named "log_return_<column>".
+
+    """
+    new_columns = {}
+    for column in log_return_params["columns"]:
+        values = np.asarray(columns[column], dtype=float)
+        previous = np.full(len(values), np.nan)
+        previous[1:] = values[:-1]
+        previous[from_start < 1] = np.nan
+        with np.errstate(divide="ignore", invalid="ignore"):
+            new_columns[f"log_return_{column}"] = np.log(values / previous)
+    return new_columns
 
 
 def _filter_strings(lst_with_strings: list, pattern: str) -> list[str]:
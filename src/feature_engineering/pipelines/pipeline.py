@@ -1,9 +1,17 @@
 """Pipeline for feature engineering."""
 
+from typing import Any, Optional
+
 from feature_engineering.functions import (
+    FEATURE_BACKENDS,
     basic_arithmetic,
     calculate_rolling_aggregations,
+    check_lazy_feature_params,
+    concatenate_partitions,
+    create_features,
+    create_partitioned_features,
     log_returns,
+    partition_by_ticker,
     shift_features,
 )
 from kedro.pipeline import Pipeline, node, pipeline
@@ -69,12 +77,123 @@ def _create_feature_pipeline() -> Pipeline:
     return pipeline(nodes)
 
 
-def create_pipeline() -> Pipeline:
-    """Create the feature engineering pipeline.
+def _create_fused_feature_pipeline() -> Pipeline:
+    """Pipeline that runs all feature steps in one node.
 
     Returns
+    -------
+    Pipeline
+        The fused feature engineering pipeline.
+
+    """
+    nodes = [
+        node(
+            func=create_features,
+            inputs={
+                "price_data": "price_data",
+                "arithmetic_params": "params:arithmetic",
+                "aggregation_params": "params:aggregation",
+                "shift_params": "params:shift",
+                "log_return_params": "params:log_returns",
+            },
+            outputs="price_w_features",
+            name="create_features",
+            tags=["feature_engineering"],
+        ),
+    ]
+    return pipeline(nodes)
+
+
+def _create_polars_feature_pipeline() -> Pipeline:
+    """Pipeline that computes the features out of core with Polars.
+
+    The price data is split into partitions of whole tickers, the features are
+    computed and written one partition at a time and the partitions are streamed
+    into "price_w_features" in ticker order.
+
+    Returns
+    -------
+    Pipeline
+        The Polars feature engineering pipeline.
+
+    """
+    # The outputs are lazy queries and loaders, which are not cached.
+    tags = ["feature_engineering", "no_cache"]
+    nodes = [
+        node(
+            func=partition_by_ticker,
+            inputs={
+                "price_data": "price_data_lazy",
+                "feature_backend_params": "params:feature_backend",
+            },
+            outputs="price_data_partitioned",
+            name="partition_by_ticker",
+            tags=tags,
+        ),
+        node(
+            func=create_partitioned_features,
+            inputs={
+                "price_data_partitions": "price_data_partitioned",
+                "arithmetic_params": "params:arithmetic",
+                "aggregation_params": "params:aggregation",
+                "shift_params": "params:shift",
+                "log_return_params": "params:log_returns",
+            },
+            outputs="price_w_features_partitioned",
+            name="create_partitioned_features",
+            tags=tags,
+        ),
+        node(
+            func=concatenate_partitions,
+            inputs="price_w_features_partitioned",
+            outputs="price_w_features",
+            name="concatenate_feature_partitions",
+            tags=tags,
+        ),
+    ]
+    return pipeline(nodes)
+
+
+def create_pipeline(
+    fused: bool = True,
+    backend: str = "pandas",
+    arithmetic_params: Optional[list[dict[str, str]]] = None,
+    aggregation_params: Optional[list[dict[str, Any]]] = None,
+) -> Pipeline:
+    """Create the feature engineering pipeline.
+
+    Args:
+    ----
+        fused (bool, optional): Whether to run the feature steps as one node on a
+            single frame. The unfused pipeline passes the intermediate frames
+            "price_data_temp1" to "price_data_temp3" between the steps, which is
+            useful for debugging them. Only used by the "pandas" backend.
+            Defaults to True.
+        backend (str, optional): "pandas" computes the features in memory,
+            "polars" per partition of whole tickers, for universes larger than
+            the memory. Both write "price_w_features". Defaults to "pandas".
+        arithmetic_params (list[dict[str, str]], optional): The "arithmetic"
+            parameters, checked against the "polars" backend when the pipeline
+            is built, i.e. before any data is read. Defaults to None.
+        aggregation_params (list[dict[str, Any]], optional): The "aggregation"
+            parameters, checked like the `arithmetic_params`. Defaults to None.
+
+    Raises:
+    ------
+        ValueError: If the backend is unknown or does not support the features.
+
+    Returns:
     -------
         Pipeline: The feature engineering pipeline.
 
     """
+    if backend not in FEATURE_BACKENDS:
+        raise ValueError(
+            f"Invalid feature backend '{backend}', expected one of {FEATURE_BACKENDS}"
+        )
+    if backend == "polars":
+        check_lazy_feature_params(arithmetic_params or [], aggregation_params or [])
+        return _create_polars_feature_pipeline()
+    if fused:
+        return _create_fused_feature_pipeline()
     return _create_feature_pipeline()
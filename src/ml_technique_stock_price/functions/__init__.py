@@ -1,4 +1,16 @@
 """Init file for functions module."""
 
+from ml_technique_stock_price.functions.data_filtering import (
+    create_ticker_date_index,
+    filter_data,
+)
 from ml_technique_stock_price.functions.portfolio_building import portfolio_building
-from ml_technique_stock_price.functions.stock_selection import stock_selection
+from ml_technique_stock_price.functions.stock_selection import (
+    select_stocks,
+    stock_selection,
+)
+from ml_technique_stock_price.functions.variants import (
+    batch_cutoff_dates,
+    batch_name,
+    create_cutoff_dates,
+)
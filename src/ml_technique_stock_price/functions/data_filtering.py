@@ -0,0 +1,111 @@
+"""Functions for filtering the price data on cutoff dates."""
+
+import numpy as np
+import pandas as pd
+
+
+def create_ticker_date_index(
+    price_data: pd.DataFrame,
+) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """Sort the price data by ticker and date and index the rows of every ticker.
+
+    The index only has to be created once and can then be reused by `filter_data`
+    for every cutoff date. The input DataFrame is not modified.
+
+    Args:
+    ----
+        price_data (pd.DataFrame): Price data with the columns "stock_ticker" and
+            "date".
+
+    Returns:
+    -------
+        tuple[pd.DataFrame, pd.DataFrame]: The price data sorted by ticker and date
+            (with a datetime "date" column) and the ticker date index with one row
+            per ticker and the columns "stock_ticker", "start", "stop",
+            "first_date" and "last_date". "start" and "stop" are the positions of
+            the ticker's rows in the sorted price data.
+
+    """
+    sorted_price_data = price_data.assign(
+        date=pd.to_datetime(price_data["date"])
+    ).sort_values(["stock_ticker", "date"], kind="stable", ignore_index=True)
+
+    tickers = sorted_price_data["stock_ticker"].to_numpy()
+    dates = sorted_price_data["date"].to_numpy()
+    boundaries = np.flatnonzero(tickers[1:] != tickers[:-1]) + 1
+    starts = np.concatenate([[0], boundaries]) if len(tickers) else boundaries
+    stops = np.concatenate([boundaries, [len(tickers)]]) if len(tickers) else starts
+
+    ticker_date_index = pd.DataFrame(
+        {
+            "stock_ticker": tickers[starts],
+            "start": starts,
+            "stop": stops,
+            "first_date": dates[starts],
+            "last_date": dates[stops - 1],
+        }
+    )
+    return sorted_price_data, ticker_date_index
+
+
+def filter_data(
+    unfiltered_df: pd.DataFrame,
+    cutoff_date: str,
+    ticker_date_index: pd.DataFrame = None,
+) -> pd.DataFrame:
+    """Filter the data based on the cutoff date.
+
+    Only tickers that are still traded at the cutoff date are kept, and for those
+    only the rows up to and including the cutoff date. With a ticker date index the
+    rows of a ticker are a contiguous slice of the sorted data, so the cutoff is a
+    binary search per ticker instead of a mask over the full DataFrame.
+
+    Args:
+    ----
+        unfiltered_df (pd.DataFrame): The unfiltered DataFrame. If
+            `ticker_date_index` is given, this has to be the sorted price data
+            returned by `create_ticker_date_index`.
+        cutoff_date (str): The cutoff date.
+        ticker_date_index (pd.DataFrame, optional): Ticker date index from
+            `create_ticker_date_index`. Created on the fly if not given.
+
+    Returns:
+    -------
+        pd.DataFrame: The filtered DataFrame, sorted by ticker and date.
+
+    """
+    if ticker_date_index is None:
+        unfiltered_df, ticker_date_index = create_ticker_date_index(unfiltered_df)
+
+    cutoff_date = pd.to_datetime(cutoff_date).to_datetime64()
+    valid_stocks = ticker_date_index[ticker_date_index["last_date"] >= cutoff_date]
+    starts = valid_stocks["start"].to_numpy()
+    stops = valid_stocks["stop"].to_numpy()
+
+    dates = unfiltered_df["date"].to_numpy()
+    ends = np.array(
+        [
+            start + np.searchsorted(dates[start:stop], cutoff_date, side="right")
+            for start, stop in zip(starts, stops)
+        ],
+        dtype=np.int64,
+    )
+    return unfiltered_df.take(_concatenate_ranges(starts, ends))
+
+
+def _concatenate_ranges(starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    """Concatenate the integer ranges [start, end) without a Python loop.
+
+    Args:
+    ----
+        starts (np.ndarray): Start of each range.
+        ends (np.ndarray): End (exclusive) of each range.
+
+    Returns:
+    -------
+        np.ndarray: Positions of all ranges one after another.
+
+    """
+    lengths = ends - starts
+    offsets = np.cumsum(lengths) - lengths
+    return np.arange(lengths.sum()) + np.repeat(starts - offsets, lengths)
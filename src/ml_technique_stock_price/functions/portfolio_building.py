@@ -0,0 +1,377 @@
+"""Functions for turning the selected stocks into optimized portfolio weights.
+
+The covariance of the returns is estimated over a trailing window with Ledoit-Wolf
+shrinkage. The window statistics are running sums, so moving from one signal date
+(or cutoff) to the next only adds the new returns and removes the dropped ones
+instead of re-estimating the covariance from the full window.
+"""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.engine import simple_returns
+from common.backtesting.functions.preparation import create_price_matrix
+
+PORTFOLIO_METHODS = ("equal", "inverse_volatility", "risk_parity", "mean_variance")
+_TOLERANCE = 1e-10
+_RISK_PARITY_MAX_ITERATIONS = 100
+
+
+def portfolio_building(
+    signals: pd.DataFrame,
+    price_data: pd.DataFrame,
+    portfolio_params: dict[str, Any],
+) -> pd.DataFrame:
+    """Build the portfolio weights of the selected stocks.
+
+    The sign of a signal is the side of the ticker, zero signals are not held. The
+    weights of a date only use the returns before that date.
+
+    Args:
+    ----
+        signals (pd.DataFrame): Output of the stock selection, either with the dates
+            as the index or, like the concatenated signals, with a "timestamp"
+            column, and one column per ticker.
+        price_data (pd.DataFrame): Long price data, see `create_price_matrix`.
+        portfolio_params (dict[str, Any]): Parameters for the portfolio:
+            - method: One of `PORTFOLIO_METHODS`. Defaults to "equal".
+              "mean_variance" uses the absolute signals as the expected returns.
+            - lookback: Number of returns of the covariance window. Defaults to 252.
+            - min_periods: Minimum number of returns, below it the equal weights
+              are used. Defaults to 20.
+            - shrinkage: If True (default) the covariance is shrunk with
+              Ledoit-Wolf.
+            - gross_exposure, max_position and max_net_exposure: Constraints, see
+              `apply_constraints`.
+            - date_column, id_column and price_column: See `create_price_matrix`.
+
+    Raises:
+    ------
+        ValueError: If the method is unknown.
+
+    Returns:
+    -------
+        pd.DataFrame: Weights with the same layout as the signals.
+
+    """
+    method = portfolio_params.get("method", "equal")
+    if method not in PORTFOLIO_METHODS:
+        raise ValueError(f"Invalid portfolio method '{method}'")
+    lookback = portfolio_params.get("lookback", 252)
+    min_periods = portfolio_params.get("min_periods", 20)
+    shrinkage = portfolio_params.get("shrinkage", True)
+
+    if "timestamp" in signals.columns:
+        tickers = signals.columns.drop("timestamp")
+        dates = pd.to_datetime(signals["timestamp"]).to_numpy()
+    else:
+        tickers = signals.columns
+        dates = pd.to_datetime(signals.index).to_numpy()
+    signal_values = np.nan_to_num(signals[tickers].to_numpy(dtype=float))
+
+    prices = create_price_matrix(price_data, portfolio_params).reindex(columns=tickers)
+    returns = np.nan_to_num(simple_returns(prices.to_numpy(dtype=float))[1:])
+    return_dates = prices.index.to_numpy()[1:]
+
+    weights = np.zeros(signal_values.shape)
+    window = _RollingMoments(len(tickers))
+    covariance = None
+    for date in np.unique(dates):
+        stop = np.searchsorted(return_dates, date, side="left")
+        start = max(stop - lookback, 0)
+        if covariance is None or (start, stop) != window.bounds:
+            window.move(returns, start, stop)
+            covariance = window.covariance(shrinkage)
+        for row in np.flatnonzero(dates == date):
+            weights[row] = _row_weights(
+                signal_values[row],
+                covariance if window.count >= min_periods else None,
+                method,
+                portfolio_params,
+            )
+
+    result = signals.copy()
+    result[tickers] = weights
+    return result
+
+
+def ledoit_wolf_covariance(returns: np.ndarray) -> tuple[np.ndarray, float]:
+    """Estimate the covariance with Ledoit-Wolf shrinkage to a scaled identity.
+
+    Args:
+    ----
+        returns (np.ndarray): Returns with one row per date and one column per
+            ticker.
+
+    Returns:
+    -------
+        tuple[np.ndarray, float]: The shrunk covariance and the shrinkage intensity.
+
+    """
+    moments = _RollingMoments(returns.shape[1])
+    moments.move(returns, 0, len(returns))
+    return moments.ledoit_wolf()
+
+
+def apply_constraints(
+    scores: np.ndarray, sides: np.ndarray, portfolio_params: dict[str, Any]
+) -> np.ndarray:
+    """Scale non-negative scores into weights that meet the portfolio constraints.
+
+    The scores are scaled to the gross exposure. Positions above the position limit
+    are capped and the excess is spread over the other positions. If the net
+    exposure exceeds its limit, the larger side is scaled down.
+
+    Args:
+    ----
+        scores (np.ndarray): Non-negative size of every position.
+        sides (np.ndarray): Side of every position, +1, -1 or 0.
+        portfolio_params (dict[str, Any]): "gross_exposure" is the sum of the
+            absolute weights (defaults to 1.0), "max_position" (optional) the
+            maximum absolute weight and "max_net_exposure" (optional) the maximum
+            absolute sum of the weights.
+
+    Returns:
+    -------
+        np.ndarray: Signed weights.
+
+    """
+    gross_exposure = portfolio_params.get("gross_exposure", 1.0)
+    max_position = portfolio_params.get("max_position")
+    max_net_exposure = portfolio_params.get("max_net_exposure")
+
+    sizes = np.where(sides != 0, np.maximum(scores, 0.0), 0.0)
+    if sizes.sum() <= 0:
+        return np.zeros(len(sizes))
+    sizes = sizes / sizes.sum() * gross_exposure
+
+    if max_position is not None:
+        capped = np.zeros(len(sizes), dtype=bool)
+        while True:
+            capped |= sizes >= max_position
+            sizes[capped] = max_position
+            free = ~capped & (sizes > 0)
+            excess = gross_exposure - sizes.sum()
+            if excess <= _TOLERANCE or not free.any():
+                break
+            sizes[free] += excess * sizes[free] / sizes[free].sum()
+            if not (sizes[free] > max_position).any():
+                break
+
+    weights = sides * sizes
+    net_exposure = weights.sum()
+    if max_net_exposure is not None and abs(net_exposure) > max_net_exposure:
+        larger_side = np.sign(weights) == np.sign(net_exposure)
+        side_exposure = abs(weights[larger_side].sum())
+        reduction = abs(net_exposure) - max_net_exposure
+        weights[larger_side] *= (side_exposure - reduction) / side_exposure
+    return weights
+
+
+class _RollingMoments:
+    """Running sums of a window of returns for the covariance estimation.
+
+    Besides the sum and the cross products, the sums needed by the Ledoit-Wolf
+    shrinkage intensity are kept, so the estimate of a moved window does not need
+    the returns of the whole window.
+    """
+
+    def __init__(self, n_tickers: int):
+        self.bounds = (0, 0)
+        self._reset(n_tickers)
+
+    @property
+    def count(self) -> int:
+        """Number of returns in the window."""
+        return self.bounds[1] - self.bounds[0]
+
+    def move(self, returns: np.ndarray, start: int, stop: int) -> None:
+        """Move the window to the rows [start, stop) of the returns.
+
+        Args:
+        ----
+            returns (np.ndarray): Returns with one row per date.
+            start (int): First row of the window.
+            stop (int): Row after the window.
+
+        """
+        old_start, old_stop = self.bounds
+        overlap = min(old_stop, stop) - max(old_start, start)
+        changed_rows = (stop - start - overlap) + (self.count - overlap)
+        if overlap <= 0 or changed_rows >= stop - start:
+            # Rebuilding is cheaper and drops the accumulated rounding errors.
+            self._reset(returns.shape[1])
+            self._update(returns[start:stop], 1.0)
+        else:
+            self._update(returns[old_start : min(old_stop, start)], -1.0)
+            self._update(returns[max(old_start, stop) : old_stop], -1.0)
+            self._update(returns[start : min(stop, old_start)], 1.0)
+            self._update(returns[max(start, old_stop) : stop], 1.0)
+        self.bounds = (start, stop)
+
+    def covariance(self, shrinkage: bool = True) -> np.ndarray:
+        """Estimate the covariance of the window.
+
+        Args:
+        ----
+            shrinkage (bool, optional): Whether to apply the Ledoit-Wolf shrinkage.
+                Defaults to True.
+
+        Returns:
+        -------
+            np.ndarray: Covariance matrix.
+
+        """
+        if shrinkage:
+            return self.ledoit_wolf()[0]
+        return self._sample_covariance()
+
+    def ledoit_wolf(self) -> tuple[np.ndarray, float]:
+        """Estimate the covariance of the window with Ledoit-Wolf shrinkage.
+
+        Returns
+        -------
+            tuple[np.ndarray, float]: The shrunk covariance and the shrinkage
+                intensity.
+
+        """
+        n_tickers = len(self._sum)
+        count = self.count
+        if count == 0:
+            return np.zeros((n_tickers, n_tickers)), 0.0
+        covariance = self._sample_covariance()
+        mean = self._sum / count
+        mean_norm = mean @ mean
+
+        # Sum over the dates of the fourth power of the norm of the centered
+        # returns, expanded into the running sums.
+        fourth_moment = (
+            self._norm4_sum
+            + 4 * mean @ self._cross @ mean
+            + count * mean_norm**2
+            - 4 * self._norm2_weighted_sum @ mean
+            + 2 * mean_norm * self._norm2_sum
+            - 4 * mean_norm * self._sum @ mean
+        )
+        trace_mean = np.trace(covariance) / n_tickers
+        squared_norm = np.sum(covariance**2)
+        beta = (fourth_moment / count - squared_norm) / (n_tickers * count)
+        delta = (
+            squared_norm - 2 * trace_mean * np.trace(covariance)
+        ) / n_tickers + trace_mean**2
+        beta = min(beta, delta)
+        intensity = 0.0 if beta <= 0 else beta / delta
+        shrunk = (1 - intensity) * covariance
+        shrunk.flat[:: n_tickers + 1] += intensity * trace_mean
+        return shrunk, float(intensity)
+
+    def _sample_covariance(self) -> np.ndarray:
+        """Calculate the covariance of the window normalized by the count."""
+        mean = self._sum / max(self.count, 1)
+        return self._cross / max(self.count, 1) - np.outer(mean, mean)
+
+    def _reset(self, n_tickers: int) -> None:
+        """Empty the running sums."""
+        self._sum = np.zeros(n_tickers)
+        self._cross = np.zeros((n_tickers, n_tickers))
+        self._norm2_sum = 0.0
+        self._norm2_weighted_sum = np.zeros(n_tickers)
+        self._norm4_sum = 0.0
+
+    def _update(self, rows: np.ndarray, sign: float) -> None:
+        """Add (sign 1) or remove (sign -1) rows from the running sums."""
+        if len(rows) == 0:
+            return
+        norm2 = np.einsum("ij,ij->i", rows, rows)
+        self._sum += sign * rows.sum(axis=0)
+        self._cross += sign * rows.T @ rows
+        self._norm2_sum += sign * norm2.sum()
+        self._norm2_weighted_sum += sign * norm2 @ rows
+        self._norm4_sum += sign * (norm2**2).sum()
+
+
+def _row_weights(
+    signals: np.ndarray,
+    covariance: np.ndarray,
+    method: str,
+    portfolio_params: dict[str, Any],
+) -> np.ndarray:
+    """Calculate the weights of one signal row.
+
+    Args:
+    ----
+        signals (np.ndarray): Signals of the row.
+        covariance (np.ndarray): Covariance of all tickers or None if the history
+            is too short, which falls back to equal weights.
+        method (str): One of `PORTFOLIO_METHODS`.
+        portfolio_params (dict[str, Any]): Parameters for the constraints.
+
+    Returns:
+    -------
+        np.ndarray: Signed weights of the row.
+
+    """
+    sides = np.sign(signals)
+    selected = np.flatnonzero(sides)
+    scores = np.zeros(len(signals))
+    if len(selected) == 0:
+        return scores
+    if covariance is None or method == "equal":
+        scores[selected] = 1.0
+        return apply_constraints(scores, sides, portfolio_params)
+
+    # Covariance of the signed positions, so every method works on long sizes.
+    signed = covariance[np.ix_(selected, selected)] * np.outer(
+        sides[selected], sides[selected]
+    )
+    volatility = np.sqrt(np.maximum(np.diag(signed), 0.0))
+    if method == "inverse_volatility":
+        scores[selected] = np.divide(
+            1.0, volatility, out=np.zeros(len(selected)), where=volatility > 0
+        )
+    elif method == "risk_parity":
+        scores[selected] = _risk_parity(signed)
+    else:
+        expected_returns = np.abs(signals[selected])
+        scores[selected] = np.maximum(
+            np.linalg.lstsq(signed, expected_returns, rcond=None)[0], 0.0
+        )
+    if scores.sum() <= 0:
+        scores[selected] = 1.0
+    return apply_constraints(scores, sides, portfolio_params)
+
+
+def _risk_parity(covariance: np.ndarray) -> np.ndarray:
+    """Solve for long sizes with equal risk contributions.
+
+    Newton's method minimizes ``x'Cx / 2 - sum(log(x)) / n``, whose minimum has
+    equal risk contributions ``x * (Cx)``.
+
+    Args:
+    ----
+        covariance (np.ndarray): Covariance of the positions.
+
+    Returns:
+    -------
+        np.ndarray: Positive sizes, not normalized.
+
+    """
+    n_positions = len(covariance)
+    budget = np.full(n_positions, 1 / n_positions)
+    variance = np.diag(covariance)
+    if (variance <= 0).any():
+        return np.ones(n_positions)
+    sizes = 1 / np.sqrt(variance)
+    sizes /= np.sqrt(sizes @ covariance @ sizes)
+    for _ in range(_RISK_PARITY_MAX_ITERATIONS):
+        gradient = covariance @ sizes - budget / sizes
+        if np.abs(gradient).max() < _TOLERANCE:
+            break
+        hessian = covariance + np.diag(budget / sizes**2)
+        step = np.linalg.solve(hessian, gradient)
+        scale = 1.0
+        while (sizes - scale * step <= 0).any():
+            scale /= 2
+        sizes = sizes - scale * step
+    return sizes
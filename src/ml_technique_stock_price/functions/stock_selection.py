@@ -0,0 +1,140 @@
+"""Functions for selecting stocks based on the predicted returns."""
+
+import numpy as np
+import pandas as pd
+
+SELECTION_MODES = ("quantile", "top_k")
+WEIGHTING_SCHEMES = ("indicator", "equal", "score")
+
+
+def stock_selection(
+    predictions: pd.DataFrame, stock_price_params: dict[str, str]
+) -> pd.DataFrame:
+    """Select the stocks based on the predictions.
+
+    The predicted returns are summed per ticker, the tickers are ranked once and the
+    wide signal matrix (timestamps x tickers) is filled directly from the integer
+    codes of the predictions. The input DataFrame is not modified.
+
+    Args:
+    ----
+        predictions (pd.DataFrame): Predictions of the returns with the columns
+            "item_id", "timestamp" and "mean".
+        stock_price_params (dict[str, str]): Parameters for the stock selection. See
+            `select_stocks` for the supported keys.
+
+    Returns:
+    -------
+        pd.DataFrame: The selected stocks with the timestamps as the index, the
+            tickers as the columns and the signal (or weight) in the cells.
+
+    """
+    tickers, ticker_codes = np.unique(
+        predictions["item_id"].to_numpy(), return_inverse=True
+    )
+    timestamps, timestamp_codes = np.unique(
+        predictions["timestamp"].to_numpy(), return_inverse=True
+    )
+    scores = np.bincount(
+        ticker_codes,
+        weights=np.nan_to_num(predictions["mean"].to_numpy(dtype=float)),
+        minlength=len(tickers),
+    )
+    ticker_weights = select_stocks(scores, stock_price_params)
+
+    signals = np.zeros((len(timestamps), len(tickers)), dtype=ticker_weights.dtype)
+    signals[timestamp_codes, ticker_codes] = ticker_weights[ticker_codes]
+    return pd.DataFrame(
+        signals,
+        index=pd.Index(timestamps, name="timestamp"),
+        columns=pd.Index(tickers, name="item_id"),
+    )
+
+
+def select_stocks(scores: np.ndarray, stock_price_params: dict[str, str]) -> np.ndarray:
+    """Turn the scores of the tickers into signals or weights.
+
+    The tickers are ranked with a single `np.argpartition`, which places the k
+    lowest and the k highest scores at the two ends of the array without sorting it.
+
+    Args:
+    ----
+        scores (np.ndarray): One score (summed predicted return) per ticker.
+        stock_price_params (dict[str, str]): Parameters for the stock selection:
+            - selection_mode: "quantile" (default) selects
+              `int(n_tickers * cutoff_percentile)` tickers per side, "top_k" selects
+              `top_k` tickers per side.
+            - long_only: If True only the long side is selected. Defaults to False.
+            - weighting: "indicator" (default) returns +1/-1 signals, "equal"
+              returns equal weights and "score" returns weights proportional to the
+              absolute score. Each side sums to 1 (long-only) or to 0.5 in absolute
+              terms (long-short), so the gross exposure is 1.
+
+    Raises:
+    ------
+        ValueError: If the selection mode or the weighting scheme is unknown.
+
+    Returns:
+    -------
+        np.ndarray: One signal or weight per ticker.
+
+    """
+    selection_mode = stock_price_params.get("selection_mode", "quantile")
+    weighting = stock_price_params.get("weighting", "indicator")
+    long_only = stock_price_params.get("long_only", False)
+    if selection_mode not in SELECTION_MODES:
+        raise ValueError(f"Invalid selection mode '{selection_mode}'")
+    if weighting not in WEIGHTING_SCHEMES:
+        raise ValueError(f"Invalid weighting scheme '{weighting}'")
+
+    n_tickers = len(scores)
+    if selection_mode == "quantile":
+        n_selected = int(n_tickers * stock_price_params["cutoff_percentile"])
+    else:
+        n_selected = stock_price_params["top_k"]
+    n_selected = min(n_selected, n_tickers)
+
+    dtype = np.int64 if weighting == "indicator" else np.float64
+    weights = np.zeros(n_tickers, dtype=dtype)
+    if n_selected == 0:
+        return weights
+
+    order = np.argpartition(scores, (n_selected - 1, n_tickers - n_selected))
+    top_performer = order[n_tickers - n_selected :]
+    lowest_performer = order[:n_selected]
+
+    side_exposure = 1.0 if long_only else 0.5
+    weights[top_performer] = _side_weights(
+        scores[top_performer], weighting, side_exposure
+    )
+    if not long_only:
+        weights[lowest_performer] = -_side_weights(
+            scores[lowest_performer], weighting, side_exposure
+        )
+    return weights
+
+
+def _side_weights(
+    side_scores: np.ndarray, weighting: str, side_exposure: float
+) -> np.ndarray:
+    """Calculate the absolute weights of one side of the portfolio.
+
+    Args:
+    ----
+        side_scores (np.ndarray): Scores of the selected tickers of one side.
+        weighting (str): Weighting scheme.
+        side_exposure (float): Absolute exposure of the side.
+
+    Returns:
+    -------
+        np.ndarray: Absolute weights of the side.
+
+    """
+    if weighting == "indicator":
+        return np.ones(len(side_scores), dtype=np.int64)
+    if weighting == "score":
+        abs_scores = np.abs(side_scores)
+        total = abs_scores.sum()
+        if total > 0:
+            return side_exposure * abs_scores / total
+    return np.full(len(side_scores), side_exposure / len(side_scores))
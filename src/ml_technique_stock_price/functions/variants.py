@@ -0,0 +1,81 @@
+"""Functions for creating the cutoff variants of the modeling pipeline."""
+
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+
+def create_cutoff_dates(variant_params: dict[str, Any]) -> list[str]:
+    """Create the cutoff dates of the model variants.
+
+    Args:
+    ----
+        variant_params (dict[str, Any]): Either "cutoffs" with an explicit list of
+            dates or, if "cutoffs" is missing or None, "start_date", "end_date"
+            and "freq" (a pandas frequency, defaults to "W-FRI") for one cutoff
+            per period between the two dates.
+
+    Raises:
+    ------
+        ValueError: If no cutoff date is created.
+
+    Returns:
+    -------
+        list[str]: Sorted unique cutoff dates formatted as "%Y-%m-%d".
+
+    """
+    if variant_params.get("cutoffs") is not None:
+        dates = pd.to_datetime(variant_params["cutoffs"])
+    else:
+        dates = pd.date_range(
+            start=variant_params["start_date"],
+            end=variant_params["end_date"],
+            freq=variant_params.get("freq", "W-FRI"),
+        )
+    if dates.empty:
+        raise ValueError(f"No cutoff dates for the variant parameters {variant_params}")
+    return dates.unique().sort_values().strftime("%Y-%m-%d").tolist()
+
+
+def batch_cutoff_dates(cutoff_dates: list[str], max_batches: int) -> list[list[str]]:
+    """Split the cutoff dates into contiguous batches of (nearly) equal size.
+
+    Args:
+    ----
+        cutoff_dates (list[str]): Sorted cutoff dates.
+        max_batches (int): Maximum number of batches.
+
+    Raises:
+    ------
+        ValueError: If the maximum number of batches is not positive.
+
+    Returns:
+    -------
+        list[list[str]]: The batches, ordered by cutoff date.
+
+    """
+    if max_batches < 1:
+        raise ValueError(f"Invalid maximum number of batches {max_batches}")
+    n_batches = min(max_batches, len(cutoff_dates))
+    return [
+        batch.tolist() for batch in np.array_split(np.asarray(cutoff_dates), n_batches)
+    ]
+
+
+def batch_name(cutoff_dates: list[str]) -> str:
+    """Name of the namespace of a batch of cutoff dates.
+
+    Args:
+    ----
+        cutoff_dates (list[str]): Sorted cutoff dates of the batch.
+
+    Returns:
+    -------
+        str: The cutoff date for a single cutoff, otherwise the first and the last
+            cutoff date joined by "_", so the names sort like the cutoff dates.
+
+    """
+    if len(cutoff_dates) == 1:
+        return cutoff_dates[0]
+    return f"{cutoff_dates[0]}_{cutoff_dates[-1]}"
@@ -1,37 +1,27 @@
 """Pipeline for price prediction."""
 
 from functools import partial
+from typing import Any, Optional
 
 import pandas as pd
 from common.utilities.multi_variant.pipelines import (
     create_experiment_predictions_variant_concat_pipeline,
+    create_experiment_predictions_variant_stream_pipeline,
 )
+from common.utilities.telemetry import timed
 from kedro.pipeline import Pipeline, node, pipeline
+from ml_technique_stock_price.functions import (
+    batch_cutoff_dates,
+    batch_name,
+    create_cutoff_dates,
+    create_ticker_date_index,
+    filter_data,
+    portfolio_building,
+    stock_selection,
+)
 
-
-def filter_data(unfiltered_df: pd.DataFrame, cutoff_date: str) -> pd.DataFrame:
-    """Filter the data based on the cutoff date.
-
-    Args:
-    ----
-        unfiltered_df (pd.DataFrame): The unfiltered DataFrame.
-        cutoff_date (str): The cutoff date.
-
-    Returns:
-    -------
-        pd.DataFrame: The filtered DataFrame.
-
-    """
-    cutoff_date = pd.to_datetime(cutoff_date)
-    unfiltered_df["date"] = pd.to_datetime(unfiltered_df["date"])
-
-    latest_dates = unfiltered_df.groupby("stock_ticker")["date"].max()
-    valid_stocks = latest_dates[latest_dates >= cutoff_date].index
-
-    return unfiltered_df[
-        unfiltered_df["stock_ticker"].isin(valid_stocks)
-        & (unfiltered_df["date"] <= cutoff_date)
-    ]
+# Used when no variant parameters are passed, e.g. by tests.
+DEFAULT_VARIANT_PARAMS = {"cutoffs": ["2023-01-06", "2023-01-13"], "max_batches": 16}
 
 
 def train_model(stock_prices: pd.DataFrame, modeling_params: dict) -> dict:
@@ -56,7 +46,8 @@ def train_model(stock_prices: pd.DataFrame, modeling_params: dict) -> dict:
     temp_dict = modeling_params["autogluon_init"]
     temp_dict["path"] = temp_location
     predictor = TimeSeriesPredictor(**temp_dict)
-    predictor.fit(ts_df, **modeling_params["model_fit"])
+    with timed("model_fit"):
+        predictor.fit(ts_df, **modeling_params["model_fit"])
     return ts_df, predictor
 
 
@@ -79,38 +70,42 @@ def inference(stock_prices: pd.DataFrame, predictor: dict) -> pd.DataFrame:
     return predictions.loc[:, ["item_id", "mean", "timestamp"]]
 
 
-def stock_selection(
-    predictions: pd.DataFrame, stock_price_params: dict[str, str]
-) -> pd.DataFrame:
-    """Select the stocks based on the predictions.
+def model_cutoff_batch(
+    sorted_price_w_features: pd.DataFrame,
+    ticker_date_index: pd.DataFrame,
+    modeling_params: dict,
+    stock_price_params: dict,
+    cutoff_dates: list[str],
+) -> tuple[dict[str, pd.DataFrame], pd.DataFrame]:
+    """Train, predict and select the stocks for several cutoff dates in one node.
+
+    The cutoffs are processed one after another, so only the model of one cutoff is
+    held in memory at a time.
 
     Args:
     ----
-        predictions (pd.DataFrame): Predictions of the returns.
-        stock_price_params (dict[str, str]): Parameters for the stock prices.
+        sorted_price_w_features (pd.DataFrame): Sorted price data from
+            `create_ticker_date_index`.
+        ticker_date_index (pd.DataFrame): The ticker date index.
+        modeling_params (dict): The modeling parameters.
+        stock_price_params (dict): Parameters for the stock selection.
+        cutoff_dates (list[str]): Sorted cutoff dates of the batch.
 
     Returns:
     -------
-        pd.DataFrame: The selected stocks.
+        tuple[dict[str, pd.DataFrame], pd.DataFrame]: The predictions per cutoff date
+            and the signals of all cutoffs stacked in cutoff order, restricted to the
+            tickers of all cutoffs like `concatenate_datasets`.
 
     """
-    cutoff_percentile = stock_price_params["cutoff_percentile"]
-    log_return_sums = predictions.groupby("item_id")["mean"].sum()
-
-    top_performer = log_return_sums.nlargest(
-        int(len(log_return_sums) * cutoff_percentile)
-    ).index
-    lowest_performer = log_return_sums.nsmallest(
-        int(len(log_return_sums) * cutoff_percentile)
-    ).index
-
-    predictions["indicator"] = 0
-    predictions.loc[predictions["item_id"].isin(list(top_performer)), "indicator"] = 1
-    predictions.loc[predictions["item_id"].isin(lowest_performer), "indicator"] = -1
-
-    return pd.DataFrame(predictions).pivot_table(
-        index="timestamp", columns="item_id", values="indicator", fill_value=0
-    )
+    predictions = {}
+    signals = []
+    for cutoff_date in cutoff_dates:
+        filtered = filter_data(sorted_price_w_features, cutoff_date, ticker_date_index)
+        ts_df, predictor = train_model(filtered, modeling_params)
+        predictions[cutoff_date] = inference(ts_df, predictor)
+        signals.append(stock_selection(predictions[cutoff_date], stock_price_params))
+    return predictions, pd.concat(signals, join="inner")
 
 
 def _create_modeling_pipeline(top_level_namespace: str, variant: str) -> Pipeline:
@@ -132,7 +127,10 @@ def _create_modeling_pipeline(top_level_namespace: str, variant: str) -> Pipelin
     nodes = [
         node(
             func=partial(filter_data, cutoff_date=variant),
-            inputs="price_w_features",
+            inputs={
+                "unfiltered_df": "sorted_price_w_features",
+                "ticker_date_index": "ticker_date_index",
+            },
             outputs="filtered_price_w_features",
             name="",
             tags=["modeling"],
@@ -145,7 +143,9 @@ def _create_modeling_pipeline(top_level_namespace: str, variant: str) -> Pipelin
             },
             outputs=["ts_df", "predictor"],
             name="train_model",
-            tags=["modeling"],
+            # The predictor refers to the model files in the shared "./temp"
+            # directory, which the later variants overwrite.
+            tags=["modeling", "no_cache"],
         ),
         node(
             func=inference,
@@ -155,7 +155,7 @@ def _create_modeling_pipeline(top_level_namespace: str, variant: str) -> Pipelin
             },
             outputs="predictions",
             name="inference",
-            tags=["modeling"],
+            tags=["modeling", "no_cache"],
         ),
         node(
             func=stock_selection,
@@ -172,7 +172,10 @@ def _create_modeling_pipeline(top_level_namespace: str, variant: str) -> Pipelin
     return pipeline(
         nodes,
         namespace=namespace,
-        inputs={"price_w_features"},
+        inputs={
+            "sorted_price_w_features": f"{top_level_namespace}.sorted_price_w_features",
+            "ticker_date_index": f"{top_level_namespace}.ticker_date_index",
+        },
         parameters={
             "modeling_params": f"{top_level_namespace}.modeling_params",
             "stock_price_params": f"{top_level_namespace}.stock_price_params",
@@ -180,37 +183,171 @@ def _create_modeling_pipeline(top_level_namespace: str, variant: str) -> Pipelin
     )
 
 
-def _create_all_relevant_cutoffs(start_year: int, end_year: int) -> list[str]:
-    dates = pd.date_range(
-        start=f"{start_year}-01-01", end=f"{end_year}-12-31", freq="W-FRI"
+def _create_batch_modeling_pipeline(
+    top_level_namespace: str, cutoff_dates: list[str]
+) -> Pipeline:
+    """Pipeline for machine learning techniques modeling of several cutoffs.
+
+    Parameters
+    ----------
+    top_level_namespace : str
+        The namespace for the pipeline.
+    cutoff_dates : list[str]
+        The sorted cutoff dates of the batch.
+
+    Returns
+    -------
+    Pipeline
+        The ML modeling pipeline with a single node for all cutoffs.
+
+    """
+    nodes = [
+        node(
+            func=partial(model_cutoff_batch, cutoff_dates=cutoff_dates),
+            inputs={
+                "sorted_price_w_features": "sorted_price_w_features",
+                "ticker_date_index": "ticker_date_index",
+                "modeling_params": "params:modeling_params",
+                "stock_price_params": "params:stock_price_params",
+            },
+            outputs=["predictions_batch", "signals"],
+            name="model_cutoff_batch",
+            tags=["modeling"],
+        ),
+    ]
+    return pipeline(
+        nodes,
+        namespace=f"{top_level_namespace}.{batch_name(cutoff_dates)}",
+        inputs={
+            "sorted_price_w_features": f"{top_level_namespace}.sorted_price_w_features",
+            "ticker_date_index": f"{top_level_namespace}.ticker_date_index",
+        },
+        parameters={
+            "modeling_params": f"{top_level_namespace}.modeling_params",
+            "stock_price_params": f"{top_level_namespace}.stock_price_params",
+        },
     )
-    business_dates = dates[dates.isin(pd.bdate_range(dates.min(), dates.max()))]
-    return business_dates.strftime("%Y-%m-%d").tolist()
 
 
-def create_modeling_pipeline(top_level_namespace: str) -> Pipeline:
+def _create_ticker_date_index_pipeline(top_level_namespace: str) -> Pipeline:
+    """Pipeline that sorts and indexes the features once for all variants.
+
+    Parameters
+    ----------
+    top_level_namespace : str
+        The namespace for the pipeline.
+
+    Returns
+    -------
+    Pipeline
+        The pipeline creating the sorted features and the ticker date index.
+
+    """
+    nodes = [
+        node(
+            func=create_ticker_date_index,
+            inputs="price_w_features",
+            outputs=["sorted_price_w_features", "ticker_date_index"],
+            name="create_ticker_date_index",
+            tags=["modeling"],
+        ),
+    ]
+    return pipeline(nodes, namespace=top_level_namespace, inputs={"price_w_features"})
+
+
+def _create_portfolio_pipeline(top_level_namespace: str) -> Pipeline:
+    """Pipeline that turns the concatenated signals into portfolio weights.
+
+    All cutoffs are handled by one node, so the covariance window is rolled forward
+    from one signal date to the next instead of being estimated per variant.
+
+    Parameters
+    ----------
+    top_level_namespace : str
+        The namespace for the pipeline.
+
+    Returns
+    -------
+    Pipeline
+        The portfolio building pipeline.
+
+    """
+    nodes = [
+        node(
+            func=portfolio_building,
+            inputs={
+                "signals": "signals_concatenated",
+                "price_data": "price_data",
+                "portfolio_params": "params:portfolio_params",
+            },
+            outputs="portfolio_concatenated",
+            name="portfolio_building",
+            tags=["modeling"],
+        ),
+    ]
+    return pipeline(nodes, namespace=top_level_namespace, inputs={"price_data"})
+
+
+def create_modeling_pipeline(
+    top_level_namespace: str,
+    combine_mode: str = "concat",
+    variant_params: Optional[dict[str, Any]] = None,
+) -> Pipeline:
     """Create the pipeline for the closing price prediction.
 
+    The cutoff dates are split into at most "max_batches" batches. A batch with a
+    single cutoff gets the per-step nodes in the namespace of its cutoff, a larger
+    batch is modeled by a single node, so the size of the pipeline does not grow
+    with the number of cutoffs. The pipelines of all batches are combined at once
+    instead of being added one by one, which would copy the growing pipeline for
+    every batch.
+
     Args:
     ----
         top_level_namespace (str): The top level namespace.
-        variants (list[str]): The list of variants to include in the pipeline.
+        combine_mode (str, optional): How the signals of the variants are combined.
+            "concat" concatenates them in memory into "signals_concatenated" and
+            builds the "portfolio_concatenated" weights from them, "stream" writes
+            every variant as a partition of "signals_streamed". Defaults to
+            "concat".
+        variant_params (dict[str, Any], optional): The cutoff dates, see
+            `create_cutoff_dates`, and "max_batches" (defaults to 16). Defaults to
+            `DEFAULT_VARIANT_PARAMS`.
+
+    Raises:
+    ------
+        ValueError: If the combine mode is unknown.
 
     Returns:
     -------
         Pipeline: The closing price prediction pipeline.
 
     """
-    # variants = _create_all_relevant_cutoffs(start_year=2021, end_year=2023)
-    variants = ["2023-01-06", "2023-01-13"]
-
-    return sum(
-        _create_modeling_pipeline(
-            top_level_namespace=top_level_namespace, variant=variant
+    combine_pipelines = {
+        "concat": create_experiment_predictions_variant_concat_pipeline,
+        "stream": create_experiment_predictions_variant_stream_pipeline,
+    }
+    if combine_mode not in combine_pipelines:
+        raise ValueError(f"Invalid combine mode '{combine_mode}'")
+
+    variant_params = variant_params or DEFAULT_VARIANT_PARAMS
+    batches = batch_cutoff_dates(
+        create_cutoff_dates(variant_params), variant_params.get("max_batches", 16)
+    )
+    pipelines = [_create_ticker_date_index_pipeline(top_level_namespace)]
+    for batch in batches:
+        if len(batch) == 1:
+            batch_pipeline = _create_modeling_pipeline(top_level_namespace, batch[0])
+        else:
+            batch_pipeline = _create_batch_modeling_pipeline(top_level_namespace, batch)
+        pipelines.append(batch_pipeline)
+    pipelines.append(
+        combine_pipelines[combine_mode](
+            top_level_namespace=top_level_namespace,
+            variants=[batch_name(batch) for batch in batches],
+            experiment_name="signals",
         )
-        for variant in variants
-    ) + create_experiment_predictions_variant_concat_pipeline(
-        top_level_namespace=top_level_namespace,
-        variants=variants,
-        experiment_name="signals",
     )
+    if combine_mode == "concat":
+        pipelines.append(_create_portfolio_pipeline(top_level_namespace))
+    return Pipeline(pipelines)
@@ -0,0 +1,3 @@
+"""Init file functions for parameter sweeps."""
+
+from parameter_sweep.functions.sweep import create_parameter_grid, run_parameter_sweep
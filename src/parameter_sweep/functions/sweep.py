@@ -0,0 +1,257 @@
+"""Functions for sweeping the stock selection and backtest parameters."""
+
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any
+
+import numpy as np
+import pandas as pd
+from common.backtesting.functions.costs import create_market_data
+from common.backtesting.functions.evaluation import calculate_performance_metrics
+from common.backtesting.functions.preparation import (
+    combine_cutoff_signals,
+    selection_to_signals_and_weights,
+    slice_prices_to_signals,
+)
+from common.backtesting.functions.returns import (
+    adjust_returns_for_trading_costs,
+    create_portfolio_returns,
+)
+from ml_technique_stock_price.functions import stock_selection
+
+PARAMETER_GROUPS = ("stock_price_params", "trading_costs")
+SEARCH_METHODS = ("grid", "random")
+
+# Filled once per worker process by `_init_worker`, so that the predictions and
+# prices are only sent to every worker once instead of once per task.
+_WORKER_CONTEXT: dict[str, Any] = {}
+
+
+def create_parameter_grid(sweep_params: dict[str, Any]) -> pd.DataFrame:
+    """Create the parameter combinations that should be evaluated.
+
+    Args:
+    ----
+        sweep_params (dict[str, Any]): Sweep parameters. "parameters" maps each
+            parameter group ("stock_price_params" or "trading_costs") to the
+            candidate values of its parameters. "search" is either "grid" (all
+            combinations, default) or "random" ("n_samples" combinations drawn
+            without replacement, seeded with "seed").
+
+    Raises:
+    ------
+        ValueError: If the search method or a parameter group is unknown.
+
+    Returns:
+    -------
+        pd.DataFrame: One row per combination and one column per parameter. The
+            columns are named "<group>.<parameter>".
+
+    """
+    search = sweep_params.get("search", "grid")
+    if search not in SEARCH_METHODS:
+        raise ValueError(f"Invalid search method '{search}'")
+    parameters = sweep_params["parameters"]
+    invalid_groups = set(parameters).difference(PARAMETER_GROUPS)
+    if invalid_groups:
+        raise ValueError(f"Invalid parameter groups {sorted(invalid_groups)}")
+
+    columns = [f"{group}.{name}" for group in parameters for name in parameters[group]]
+    candidates = [values for group in parameters.values() for values in group.values()]
+    shape = tuple(len(values) for values in candidates)
+    n_combinations = int(np.prod(shape))
+
+    positions = np.arange(n_combinations)
+    if search == "random":
+        rng = np.random.default_rng(sweep_params.get("seed"))
+        n_samples = min(sweep_params["n_samples"], n_combinations)
+        positions = np.sort(rng.choice(n_combinations, size=n_samples, replace=False))
+
+    value_positions = np.unravel_index(positions, shape)
+    return pd.DataFrame(
+        {
+            column: [values[i] for i in position]
+            for column, values, position in zip(columns, candidates, value_positions)
+        },
+        columns=columns,
+    )
+
+
+def run_parameter_sweep(
+    predictions: dict[str, Callable[[], pd.DataFrame]],
+    prices: pd.DataFrame,
+    parameter_grid: pd.DataFrame,
+    sweep_params: dict[str, Any],
+    stock_price_params: dict[str, Any],
+) -> pd.DataFrame:
+    """Evaluate every parameter combination on the cached predictions.
+
+    The combinations are grouped by their stock selection parameters, so the
+    signals are only created once per group and every trading cost setting reuses
+    them. The groups are evaluated in a process pool with "n_jobs" workers.
+
+    Args:
+    ----
+        predictions (dict[str, Callable[[], pd.DataFrame]]): Partitioned predictions
+            with one partition per cutoff.
+        prices (pd.DataFrame): Price matrix with a date index and the tickers as
+            the columns.
+        parameter_grid (pd.DataFrame): Parameter combinations from
+            `create_parameter_grid`.
+        sweep_params (dict[str, Any]): Sweep parameters with the keys "n_jobs",
+            "trading_costs" (base trading cost parameters) and
+            "performance_metrics" (parameters for the performance metrics).
+        stock_price_params (dict[str, Any]): Base stock selection parameters.
+
+    Returns:
+    -------
+        pd.DataFrame: One row per combination with the parameters and the
+            performance metrics.
+
+    """
+    context = {
+        "predictions": [predictions[key]() for key in sorted(predictions)],
+        "prices": prices,
+        "stock_price_params": stock_price_params,
+        "trading_costs": sweep_params.get("trading_costs", {}),
+        "performance_metrics": sweep_params["performance_metrics"],
+    }
+    tasks = _create_tasks(parameter_grid)
+
+    n_jobs = sweep_params.get("n_jobs", 1)
+    if n_jobs == 1:
+        _init_worker(context)
+        try:
+            results = list(map(_evaluate_selection, tasks))
+        finally:
+            _WORKER_CONTEXT.clear()
+    else:
+        with ProcessPoolExecutor(
+            max_workers=n_jobs, initializer=_init_worker, initargs=(context,)
+        ) as executor:
+            results = list(executor.map(_evaluate_selection, tasks))
+
+    rows = [row for result in results for row in result]
+    return (
+        pd.DataFrame(rows)
+        .sort_values("combination", kind="stable")
+        .reset_index(drop=True)
+    )
+
+
+def _create_tasks(
+    parameter_grid: pd.DataFrame,
+) -> list[tuple[dict[str, Any], list[dict[str, Any]]]]:
+    """Group the parameter combinations by their stock selection parameters.
+
+    Args:
+    ----
+        parameter_grid (pd.DataFrame): Parameter combinations.
+
+    Returns:
+    -------
+        list[tuple[dict[str, Any], list[dict[str, Any]]]]: One task per stock
+            selection setting with the selection parameters and the combinations
+            (including their position in the grid) that share them.
+
+    """
+    combinations = parameter_grid.to_dict(orient="records")
+    tasks: dict[tuple, tuple[dict[str, Any], list[dict[str, Any]]]] = {}
+    for position, combination in enumerate(combinations):
+        selection = {
+            key: value
+            for key, value in combination.items()
+            if key.startswith("stock_price_params.")
+        }
+        key = tuple(selection.items())
+        tasks.setdefault(key, (selection, []))[1].append(
+            {"combination": position, **combination}
+        )
+    return list(tasks.values())
+
+
+def _init_worker(context: dict[str, Any]) -> None:
+    """Store the shared inputs of the sweep in the worker process.
+
+    Args:
+    ----
+        context (dict[str, Any]): Predictions, prices and base parameters.
+
+    """
+    _WORKER_CONTEXT.update(context)
+
+
+def _evaluate_selection(
+    task: tuple[dict[str, Any], list[dict[str, Any]]],
+) -> list[dict[str, Any]]:
+    """Backtest all combinations sharing one stock selection setting.
+
+    Args:
+    ----
+        task (tuple[dict[str, Any], list[dict[str, Any]]]): Stock selection
+            parameters and the combinations to evaluate.
+
+    Returns:
+    -------
+        list[dict[str, Any]]: One row per combination with the parameters and the
+            performance metrics.
+
+    """
+    selection, combinations = task
+    stock_price_params = {
+        **_WORKER_CONTEXT["stock_price_params"],
+        **_strip_group(selection, "stock_price_params"),
+    }
+    signals, weights = selection_to_signals_and_weights(
+        combine_cutoff_signals(
+            [
+                stock_selection(predictions, stock_price_params)
+                for predictions in _WORKER_CONTEXT["predictions"]
+            ]
+        ),
+        stock_price_params,
+    )
+
+    prices = slice_prices_to_signals(_WORKER_CONTEXT["prices"], signals)
+    portfolio_returns = create_portfolio_returns(prices, weights)
+    portfolio_returns = portfolio_returns[portfolio_returns.index.isin(signals.index)]
+
+    rows = []
+    for combination in combinations:
+        trading_cost_params = {
+            **_WORKER_CONTEXT["trading_costs"],
+            **_strip_group(combination, "trading_costs"),
+        }
+        adjusted_portfolio_returns = adjust_returns_for_trading_costs(
+            portfolio_returns,
+            signals,
+            trading_cost_params,
+            weights,
+            create_market_data(prices, trading_cost_params),
+        )
+        metrics = calculate_performance_metrics(
+            adjusted_portfolio_returns, _WORKER_CONTEXT["performance_metrics"], signals
+        )
+        rows.append({**combination, **metrics})
+    return rows
+
+
+def _strip_group(parameters: dict[str, Any], group: str) -> dict[str, Any]:
+    """Select the parameters of one group and remove the group prefix.
+
+    Args:
+    ----
+        parameters (dict[str, Any]): Parameters named "<group>.<parameter>".
+        group (str): Parameter group.
+
+    Returns:
+    -------
+        dict[str, Any]: Parameters of the group without the prefix.
+
+    """
+    prefix = f"{group}."
+    return {
+        key[len(prefix) :]: value
+        for key, value in parameters.items()
+        if key.startswith(prefix)
+    }
@@ -0,0 +1,3 @@
+"""Init file for parameter_sweep pipelines."""
+
+from parameter_sweep.pipelines.pipeline import create_pipeline
@@ -0,0 +1,73 @@
+"""Pipeline for parameter sweeps."""
+
+from common.backtesting.functions.preparation import create_price_matrix
+from kedro.pipeline import Pipeline, node, pipeline
+from parameter_sweep.functions import create_parameter_grid, run_parameter_sweep
+
+
+def create_pipeline(
+    top_level_namespace: str, predictions_namespace: str = "ml_technique_modeling"
+) -> Pipeline:
+    """Pipeline for sweeping stock selection and backtest parameters.
+
+    The sweep reuses the predictions that the modeling pipeline stored per cutoff,
+    so no model has to be retrained.
+
+    Parameters
+    ----------
+    top_level_namespace : str
+        The namespace for the pipeline.
+    predictions_namespace : str
+        The namespace of the modeling pipeline that produced the predictions.
+
+    Returns
+    -------
+    Pipeline
+        The parameter sweep pipeline.
+
+    """
+    nodes = [
+        node(
+            func=create_price_matrix,
+            inputs={
+                "price_data": "price_data",
+                "price_matrix_params": "params:price_matrix",
+            },
+            outputs="price_matrix",
+            name="create_price_matrix",
+            tags=["parameter_sweep"],
+        ),
+        node(
+            func=create_parameter_grid,
+            inputs={"sweep_params": "params:sweep_params"},
+            outputs="parameter_grid",
+            name="create_parameter_grid",
+            tags=["parameter_sweep"],
+        ),
+        node(
+            func=run_parameter_sweep,
+            inputs={
+                "predictions": "predictions_partitioned",
+                "prices": "price_matrix",
+                "parameter_grid": "parameter_grid",
+                "sweep_params": "params:sweep_params",
+                "stock_price_params": "params:stock_price_params",
+            },
+            outputs="sweep_results",
+            name="run_parameter_sweep",
+            tags=["parameter_sweep"],
+        ),
+    ]
+    return pipeline(
+        nodes,
+        namespace=top_level_namespace,
+        inputs={
+            "price_data": "price_data",
+            "predictions_partitioned": (
+                f"{predictions_namespace}.predictions_partitioned"
+            ),
+        },
+        parameters={
+            "stock_price_params": f"{predictions_namespace}.stock_price_params",
+        },
+    )
@@ -2,6 +2,8 @@
 as `fictional-disco` and `python -m fictional_disco`
 """
 import importlib
+import os
+import sys
 from pathlib import Path
 
 from kedro.framework.cli.utils import KedroCliError, load_entry_points
@@ -36,10 +38,36 @@ def _find_run_command_in_plugins(plugins):
             return group.commands["run"]
 
 
+PROFILE_NODES_OPTION = "--profile-nodes"
+
+
+def _pop_profile_nodes(args):
+    """Remove the "--profile-nodes" option from the command line arguments.
+
+    Its value is passed to the profiling hooks as the environment variable
+    KEDRO_PROFILE_NODES, the other arguments are left to the run command.
+    """
+    args = list(args)
+    remaining = []
+    while args:
+        arg = args.pop(0)
+        if arg == PROFILE_NODES_OPTION and args:
+            os.environ["KEDRO_PROFILE_NODES"] = args.pop(0)
+        elif arg.startswith(f"{PROFILE_NODES_OPTION}="):
+            os.environ["KEDRO_PROFILE_NODES"] = arg.split("=", 1)[1]
+        else:
+            remaining.append(arg)
+    return remaining
+
+
 def main(*args, **kwargs):
     package_name = Path(__file__).parent.name
     configure_project(package_name)
     run = _find_run_command(package_name)
+    if args:
+        args = (_pop_profile_nodes(args[0]), *args[1:])
+    else:
+        sys.argv[1:] = _pop_profile_nodes(sys.argv[1:])
     run(*args, **kwargs)
 
 
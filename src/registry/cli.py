@@ -0,0 +1,44 @@
+"""Project commands, added to the Kedro CLI of the project."""
+
+from pathlib import Path
+
+import click
+from kedro.framework.cli.project import run  # noqa: F401, used by `__main__`
+
+TELEMETRY_PATH = Path(__file__).parents[2] / "data" / "08_reporting" / "telemetry.jsonl"
+
+
+@click.group(name="registry")
+def cli() -> None:
+    """Project commands."""
+
+
+@cli.command("telemetry-summary")
+@click.option(
+    "--path",
+    type=click.Path(exists=True, dir_okay=False, path_type=Path),
+    default=TELEMETRY_PATH,
+    show_default=True,
+    help="JSON lines file written by the telemetry hooks.",
+)
+@click.option("--top", default=10, show_default=True, help="Number of nodes.")
+@click.option("--runs", default=5, show_default=True, help="Number of runs to compare.")
+@click.option("--run-id", default=None, help="Run to summarize, the latest by default.")
+def telemetry_summary(path: Path, top: int, runs: int, run_id: str) -> None:
+    """Show the slowest nodes of a run and the nodes that slowed down the most."""
+    import pandas as pd
+    from common.utilities.telemetry import (
+        read_events,
+        summarize_slowest_nodes,
+        summarize_trends,
+    )
+
+    events = read_events(path)
+    if events.empty:
+        click.echo(f"No telemetry events in {path}")
+        return
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        click.echo(f"Slowest nodes of run {run_id or events['run_id'].iloc[-1]}:")
+        click.echo(summarize_slowest_nodes(events, top, run_id).to_string(index=False))
+        click.echo(f"\nNodes with the largest slowdown over the last {runs} runs:")
+        click.echo(summarize_trends(events, runs, top).to_string(index=False))
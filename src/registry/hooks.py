@@ -0,0 +1,720 @@
+"""Project hooks."""
+
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import pickle
+import sys
+import time
+import uuid
+from datetime import datetime, timezone
+from fnmatch import fnmatch
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, Optional, Union
+
+from kedro.framework.context import KedroContext
+from kedro.framework.hooks import hook_impl
+from kedro.pipeline import Pipeline
+from kedro.pipeline.node import Node
+
+logger = logging.getLogger(__name__)
+
+# Setting the environment variable to "1" enables the node cache for a run.
+NODE_CACHE_ENV = "KEDRO_NODE_CACHE"
+# Nodes with this tag are always executed.
+NO_CACHE_TAG = "no_cache"
+# Comma separated glob patterns of the node names or functions to profile, also
+# set by the "--profile-nodes" option of `python -m registry`.
+PROFILE_NODES_ENV = "KEDRO_PROFILE_NODES"
+# Passed from the pipeline run to the node events of the worker processes.
+TELEMETRY_RUN_ENV = "KEDRO_TELEMETRY_RUN_ID"
+TELEMETRY_PIPELINE_ENV = "KEDRO_TELEMETRY_PIPELINE"
+# Changes of the modules below this directory invalidate the cached outputs.
+PROJECT_SOURCE_PATH = Path(__file__).resolve().parents[1]
+
+
+class _UncacheableError(Exception):
+    """Raised for inputs or outputs that cannot be fingerprinted or stored."""
+
+
+class NodeCache:
+    """Directory of pickled node outputs addressed by their fingerprint.
+
+    The modification time of a file is its last use, so the least recently used
+    outputs are evicted first once the directory exceeds its size limit.
+    """
+
+    def __init__(self, cache_dir: Union[str, Path], max_size_mb: float):
+        """Create the cache.
+
+        Args:
+        ----
+            cache_dir (Union[str, Path]): Directory of the cached outputs, created
+                on the first save.
+            max_size_mb (float): Maximum total size of the cached outputs.
+
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 2**20)
+
+    def load(self, key: str) -> tuple[bool, Any]:
+        """Load the outputs stored under a fingerprint.
+
+        Args:
+        ----
+            key (str): Fingerprint of the node call.
+
+        Returns:
+        -------
+            tuple[bool, Any]: Whether the outputs were found and the outputs.
+
+        """
+        path = self.cache_dir / f"{key}.pkl"
+        try:
+            with path.open("rb") as file:
+                outputs = pickle.load(file)  # noqa: S301
+        except (FileNotFoundError, EOFError, pickle.UnpicklingError):
+            return False, None
+        path.touch()
+        return True, outputs
+
+    def save(self, key: str, outputs: Any) -> None:
+        """Store the outputs under a fingerprint and evict old outputs.
+
+        Args:
+        ----
+            key (str): Fingerprint of the node call.
+            outputs (Any): Return value of the node function.
+
+        Raises:
+        ------
+            _UncacheableError: If the outputs cannot be pickled.
+
+        """
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        path = self.cache_dir / f"{key}.pkl"
+        temporary = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        try:
+            with temporary.open("wb") as file:
+                pickle.dump(outputs, file, protocol=pickle.HIGHEST_PROTOCOL)
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            temporary.unlink(missing_ok=True)
+            raise _UncacheableError(str(error)) from error
+        # Renaming makes the file visible only once it is complete.
+        os.replace(temporary, path)
+        self.evict()
+
+    def evict(self) -> None:
+        """Delete the least recently used outputs above the size limit."""
+        entries = []
+        for path in self.cache_dir.glob("*.pkl"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        total_size = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total_size <= self.max_size_bytes:
+                break
+            path.unlink(missing_ok=True)
+            total_size -= size
+
+
+class CachedFunction:
+    """Node function that returns the cached outputs of identical calls.
+
+    The fingerprint of a call covers the source of the function's module and of
+    every project module it reaches through imports, the arguments of a
+    `functools.partial` and the content of every input, i.e. the loaded datasets
+    and the parameter values. Changes in installed packages are not detected.
+    """
+
+    def __init__(self, func: Callable, cache: NodeCache, node_name: str):
+        """Wrap a node function.
+
+        Args:
+        ----
+            func (Callable): Node function.
+            cache (NodeCache): Cache of the outputs.
+            node_name (str): Name of the node for the log messages.
+
+        """
+        self.func = func
+        self.cache = cache
+        self.node_name = node_name
+        # "hit", "miss" or "uncacheable" for the last call, read by the telemetry.
+        self.last_status: Optional[str] = None
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """Run the function unless its outputs are cached."""
+        try:
+            key = fingerprint(self.func, args, kwargs)
+        except _UncacheableError as error:
+            logger.debug("Not caching node %s: %s", self.node_name, error)
+            self.last_status = "uncacheable"
+            return self.func(*args, **kwargs)
+
+        found, outputs = self.cache.load(key)
+        self.last_status = "hit" if found else "miss"
+        if found:
+            logger.info("Restored the outputs of node %s from cache", self.node_name)
+            return outputs
+        outputs = self.func(*args, **kwargs)
+        try:
+            self.cache.save(key, outputs)
+        except _UncacheableError as error:
+            logger.debug("Not caching node %s: %s", self.node_name, error)
+        return outputs
+
+
+class ContextParametersHooks:
+    """Build the pipelines from the parameters of the run's Kedro context.
+
+    The pipelines read the arguments that change their structure, e.g. the model
+    variants, from the parameters. With these hooks they are the parameters of the
+    context, including the "--env" and "--params" options of `kedro run`.
+    """
+
+    @hook_impl
+    def after_context_created(self, context: KedroContext) -> None:
+        """Pass the parameters of the context to the pipeline registry."""
+        from registry.pipeline_registry import use_context_parameters
+
+        use_context_parameters(context.params)
+
+
+class NodeCacheHooks:
+    """Skip the nodes whose function and inputs are unchanged since an earlier run.
+
+    The cache is opt-in (KEDRO_NODE_CACHE=1). Before a pipeline runs, the function
+    of every node with outputs is wrapped in a `CachedFunction`, after the run the
+    original functions are restored. Nodes without outputs (e.g. plots) and nodes
+    tagged "no_cache" (e.g. downloads or models stored outside the catalog) are
+    always executed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Union[str, Path] = "data/09_node_cache",
+        max_size_mb: float = 2048,
+        enabled: Optional[bool] = None,
+    ):
+        """Create the hooks.
+
+        Args:
+        ----
+            cache_dir (Union[str, Path], optional): Directory of the cached outputs,
+                shared by all pipelines. Defaults to "data/09_node_cache".
+            max_size_mb (float, optional): Maximum total size of the cached
+                outputs. Defaults to 2048.
+            enabled (bool, optional): Whether to use the cache. Defaults to None,
+                i.e. only if the environment variable KEDRO_NODE_CACHE is "1".
+
+        """
+        self.cache = NodeCache(cache_dir, max_size_mb)
+        self.enabled = enabled
+        self._wrappers: list[tuple[Node, Callable]] = []
+
+    @hook_impl
+    def before_pipeline_run(self, pipeline: Pipeline) -> None:
+        """Wrap the node functions with the cache."""
+        enabled = self.enabled
+        if enabled is None:
+            enabled = os.environ.get(NODE_CACHE_ENV, "0") == "1"
+        if not enabled:
+            return
+        for node in pipeline.nodes:
+            if not node.outputs or NO_CACHE_TAG in node.tags:
+                continue
+            # Profiled nodes always run, so they can be profiled.
+            if isinstance(node.func, (CachedFunction, ProfiledFunction)):
+                continue
+            node.func = CachedFunction(node.func, self.cache, node.name)
+            self._wrappers.append((node, node.func))
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        """Restore the original node functions."""
+        self._restore()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        """Restore the original node functions."""
+        self._restore()
+
+    def _restore(self) -> None:
+        for node, wrapper in self._wrappers:
+            _remove_wrapper(node, wrapper)
+        self._wrappers.clear()
+
+
+class SharedMemoryHooks:
+    """Remove the data of the shared memory datasets after every run.
+
+    The datasets already delete their data when the runner releases them, the hooks
+    also cover failed runs and datasets that are never released, e.g. pipeline
+    outputs.
+    """
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        """Remove the shared memory data."""
+        _cleanup_shared_memory()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        """Remove the shared memory data."""
+        _cleanup_shared_memory()
+
+
+def _cleanup_shared_memory() -> None:
+    # Imported here, so the settings do not import pandas.
+    from common.datasets import cleanup_shared_memory
+
+    cleanup_shared_memory()
+
+
+class TelemetryHooks:
+    """Write one JSON line per node run and per pipeline run.
+
+    A node event holds the duration, the rows and bytes of the inputs and outputs
+    (parameters excluded), the peak resident memory of the process after the node
+    and how much the node raised it, the phases recorded with
+    `common.utilities.telemetry.timed` (e.g. "model_fit"), the cache status and
+    whether the node failed. Events of `ParallelRunner` workers are appended to the
+    same file and carry the same run id. Summarize them with
+    `kedro telemetry-summary`.
+    """
+
+    def __init__(self, path: Union[str, Path] = "data/08_reporting/telemetry.jsonl"):
+        """Create the hooks.
+
+        Args:
+        ----
+            path (Union[str, Path], optional): JSON lines file the events are
+                appended to. Defaults to "data/08_reporting/telemetry.jsonl".
+
+        """
+        self.path = Path(path)
+        self._node_starts: dict[str, tuple[str, float, tuple[int, int], float]] = {}
+        self._pipeline_start: Optional[tuple[str, float]] = None
+
+    @hook_impl
+    def before_pipeline_run(self, run_params: dict[str, Any]) -> None:
+        """Set the run id, which is inherited by the worker processes."""
+        run_id = run_params.get("session_id") or uuid.uuid4().hex
+        os.environ[TELEMETRY_RUN_ENV] = run_id
+        os.environ[TELEMETRY_PIPELINE_ENV] = run_params.get("pipeline_name") or ""
+        self._pipeline_start = (_now(), time.perf_counter())
+
+    @hook_impl
+    def after_pipeline_run(self, pipeline: Pipeline) -> None:
+        """Write the pipeline event."""
+        self._write_pipeline_event(pipeline, "success")
+
+    @hook_impl
+    def on_pipeline_error(self, pipeline: Pipeline) -> None:
+        """Write the pipeline event of a failed run."""
+        self._write_pipeline_event(pipeline, "error")
+
+    @hook_impl
+    def before_node_run(self, node: Node, inputs: dict[str, Any]) -> None:
+        """Record the start of a node."""
+        from common.utilities.telemetry import data_size, pop_phase_seconds
+
+        pop_phase_seconds()
+        self._node_starts[node.name] = (
+            _now(),
+            time.perf_counter(),
+            data_size(_without_parameters(inputs)),
+            _peak_rss_mb(),
+        )
+
+    @hook_impl
+    def after_node_run(self, node: Node, outputs: dict[str, Any]) -> None:
+        """Write the node event."""
+        self._write_node_event(node, outputs, "success")
+
+    @hook_impl
+    def on_node_error(self, node: Node) -> None:
+        """Write the node event of a failed node."""
+        self._write_node_event(node, {}, "error")
+
+    def _write_node_event(
+        self, node: Node, outputs: dict[str, Any], status: str
+    ) -> None:
+        from common.utilities.telemetry import data_size, pop_phase_seconds
+
+        # Without a start, e.g. if loading the inputs failed, the node took no time.
+        start, start_counter, (rows_in, bytes_in), start_rss = self._node_starts.pop(
+            node.name, (_now(), time.perf_counter(), (0, 0), _peak_rss_mb())
+        )
+        rows_out, bytes_out = data_size(outputs)
+        peak_rss = _peak_rss_mb()
+        self._write(
+            {
+                "event": "node",
+                "node": node.name,
+                "start": start,
+                "duration_s": time.perf_counter() - start_counter,
+                "rows_in": rows_in,
+                "rows_out": rows_out,
+                "bytes_in": bytes_in,
+                "bytes_out": bytes_out,
+                "peak_rss_mb": peak_rss,
+                "rss_increase_mb": peak_rss - start_rss,
+                "phases": pop_phase_seconds(),
+                "cache": getattr(node.func, "last_status", None),
+                "status": status,
+            }
+        )
+
+    def _write_pipeline_event(self, pipeline: Pipeline, status: str) -> None:
+        start, start_counter = self._pipeline_start or (_now(), time.perf_counter())
+        self._write(
+            {
+                "event": "pipeline",
+                "start": start,
+                "duration_s": time.perf_counter() - start_counter,
+                "nodes": len(pipeline.nodes),
+                "peak_rss_mb": _peak_rss_mb(),
+                "status": status,
+            }
+        )
+        self._pipeline_start = None
+
+    def _write(self, event: dict[str, Any]) -> None:
+        event = {
+            "run_id": os.environ.get(TELEMETRY_RUN_ENV),
+            "pipeline": os.environ.get(TELEMETRY_PIPELINE_ENV),
+            "pid": os.getpid(),
+            **event,
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        # A single write per line in append mode keeps the lines of parallel
+        # workers intact.
+        with self.path.open("a") as file:
+            file.write(json.dumps(event, default=str) + "\n")
+
+
+class ProfiledFunction:
+    """Node function that is profiled by a `StackSampler` on every call."""
+
+    def __init__(self, func: Callable, path: Path, interval: float):
+        """Wrap a node function.
+
+        Args:
+        ----
+            func (Callable): Node function.
+            path (Path): Path of the profile without a suffix.
+            interval (float): Seconds between two samples.
+
+        """
+        self.func = func
+        self.path = path
+        self.interval = interval
+        functools.update_wrapper(self, func)
+
+    def __call__(self, *args: Any, **kwargs: Any) -> Any:
+        """Run the function and write its profile."""
+        from common.utilities.profiling import StackSampler, write_profile
+
+        sampler = StackSampler(type(self).__call__.__code__, self.interval)
+        try:
+            with sampler:
+                return self.func(*args, **kwargs)
+        finally:
+            paths = write_profile(sampler.stacks, self.path)
+            logger.info("Wrote the profile of %s to %s", self.path.name, paths[0])
+
+
+class ProfilingHooks:
+    """Profile the nodes that match the patterns given with "--profile-nodes".
+
+    The patterns are comma separated globs, matched against the node names and the
+    names of the node functions, e.g. ``python -m registry --pipeline
+    feature_engineering --profile-nodes "*create_features*"``. Every matching node
+    writes its collapsed stacks ("<node>.collapsed") and the hottest functions
+    ("<node>_top.txt") to the output directory.
+    """
+
+    def __init__(
+        self,
+        output_dir: Union[str, Path] = "data/08_reporting/profiles",
+        patterns: Optional[str] = None,
+        interval: float = 0.005,
+    ):
+        """Create the hooks.
+
+        Args:
+        ----
+            output_dir (Union[str, Path], optional): Directory of the profiles.
+                Defaults to "data/08_reporting/profiles".
+            patterns (str, optional): Comma separated glob patterns. Defaults to
+                None, i.e. the environment variable KEDRO_PROFILE_NODES.
+            interval (float, optional): Seconds between two samples. Defaults to
+                0.005.
+
+        """
+        self.output_dir = Path(output_dir)
+        self.patterns = patterns
+        self.interval = interval
+        self._wrappers: list[tuple[Node, Callable]] = []
+
+    @hook_impl
+    def before_pipeline_run(self, pipeline: Pipeline) -> None:
+        """Wrap the functions of the matching nodes with the profiler."""
+        patterns = self.patterns or os.environ.get(PROFILE_NODES_ENV, "")
+        patterns = [pattern.strip() for pattern in patterns.split(",") if pattern]
+        for node in pipeline.nodes:
+            names = [node.name, getattr(node.func, "__name__", "")]
+            if not any(fnmatch(name, p) for name in names for p in patterns):
+                continue
+            node.func = ProfiledFunction(
+                node.func, self.output_dir / node.name, self.interval
+            )
+            self._wrappers.append((node, node.func))
+
+    @hook_impl
+    def after_pipeline_run(self) -> None:
+        """Restore the original node functions."""
+        self._restore()
+
+    @hook_impl
+    def on_pipeline_error(self) -> None:
+        """Restore the original node functions."""
+        self._restore()
+
+    def _restore(self) -> None:
+        for node, wrapper in self._wrappers:
+            _remove_wrapper(node, wrapper)
+        self._wrappers.clear()
+
+
+def _remove_wrapper(node: Node, wrapper: Callable) -> None:
+    """Replace a wrapper of a node function by the function it wraps.
+
+    The wrapper does not have to be the outermost one, so the hooks that wrap node
+    functions can restore them in any order.
+
+    Args:
+    ----
+        node (Node): Node whose function is wrapped.
+        wrapper (Callable): Wrapper with the wrapped function as ``func``.
+
+    """
+    if node.func is wrapper:
+        node.func = wrapper.func
+        return
+    outer = node.func
+    while isinstance(outer, (CachedFunction, ProfiledFunction)):
+        if outer.func is wrapper:
+            outer.func = wrapper.func
+            return
+        outer = outer.func
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat()
+
+
+def _peak_rss_mb() -> float:
+    """Peak resident memory of the process in MiB."""
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return peak / 2**20 if sys.platform == "darwin" else peak / 2**10
+
+
+def _without_parameters(inputs: dict[str, Any]) -> dict[str, Any]:
+    return {
+        name: data
+        for name, data in inputs.items()
+        if not name.startswith("params:") and name != "parameters"
+    }
+
+
+def fingerprint(func: Callable, args: tuple, kwargs: dict[str, Any]) -> str:
+    """Fingerprint a call of a node function.
+
+    Args:
+    ----
+        func (Callable): Node function.
+        args (tuple): Positional arguments.
+        kwargs (dict[str, Any]): Keyword arguments.
+
+    Raises:
+    ------
+        _UncacheableError: If the function or an argument cannot be fingerprinted.
+
+    Returns:
+    -------
+        str: Hex digest of the call.
+
+    """
+    digest = hashlib.sha256()
+    while isinstance(func, ProfiledFunction):
+        func = func.func
+    while isinstance(func, functools.partial):
+        _update_digest(digest, (func.args, func.keywords))
+        func = func.func
+    digest.update(_function_source_digest(func))
+    _update_digest(digest, (args, kwargs))
+    return digest.hexdigest()
+
+
+@functools.lru_cache(maxsize=None)
+def _function_source_digest(func: Callable) -> bytes:
+    """Digest the sources of a function's module and of the project modules it uses.
+
+    Args:
+    ----
+        func (Callable): Function.
+
+    Raises:
+    ------
+        _UncacheableError: If the source cannot be found.
+
+    Returns:
+    -------
+        bytes: Digest of the sources and the qualified name of the function.
+
+    """
+    try:
+        source = Path(inspect.getsourcefile(func)).read_bytes()
+    except (TypeError, OSError) as error:
+        raise _UncacheableError(f"No source for {func!r}") from error
+    digest = hashlib.sha256(source)
+    module = sys.modules.get(func.__module__)
+    for path in _project_module_paths(module) if module is not None else []:
+        digest.update(b"\0" + path.read_bytes())
+    digest.update(f"\0{func.__module__}.{func.__qualname__}".encode())
+    return digest.digest()
+
+
+def _project_module_paths(module: ModuleType) -> list[Path]:
+    """Find the source files of the project modules reachable from a module.
+
+    A module reaches the modules it imports and the modules defining the functions
+    and classes it imports, transitively. Only modules below the project sources
+    are followed, installed packages are not.
+
+    Args:
+    ----
+        module (ModuleType): Module of a node function.
+
+    Returns:
+    -------
+        list[Path]: Sorted source files, without the file of the module itself.
+
+    """
+    seen = {module.__name__}
+    pending = [module]
+    paths = set()
+    while pending:
+        for value in list(vars(pending.pop()).values()):
+            reached = value if isinstance(value, ModuleType) else None
+            if reached is None and isinstance(getattr(value, "__module__", None), str):
+                reached = sys.modules.get(value.__module__)
+            if reached is None or reached.__name__ in seen:
+                continue
+            seen.add(reached.__name__)
+            path = _project_source(reached)
+            if path is not None:
+                paths.add(path)
+                pending.append(reached)
+    return sorted(paths)
+
+
+def _project_source(module: ModuleType) -> Optional[Path]:
+    file = getattr(module, "__file__", None)
+    if not file or not file.endswith(".py"):
+        return None
+    path = Path(file).resolve()
+    return path if path.is_relative_to(PROJECT_SOURCE_PATH) else None
+
+
+def _update_digest(digest: "hashlib._Hash", value: Any) -> None:
+    """Add the content of a value to a digest.
+
+    DataFrames, Series and arrays are hashed from their values, containers are
+    hashed element by element and other objects from their pickled form.
+
+    Args:
+    ----
+        digest (hashlib._Hash): Digest to update.
+        value (Any): Value to add.
+
+    Raises:
+    ------
+        _UncacheableError: If the value cannot be fingerprinted, e.g. the lazy
+            loaders of a partitioned dataset.
+
+    """
+    import numpy as np
+    import pandas as pd
+
+    digest.update(type(value).__qualname__.encode())
+    if isinstance(value, (pd.DataFrame, pd.Series, np.ndarray)):
+        _update_array_digest(digest, value)
+    elif isinstance(value, dict):
+        for key in sorted(value, key=repr):
+            _update_digest(digest, key)
+            _update_digest(digest, value[key])
+    elif isinstance(value, (list, tuple)):
+        digest.update(str(len(value)).encode())
+        for item in value:
+            _update_digest(digest, item)
+    elif value is None or isinstance(value, (str, bytes, int, float, bool)):
+        digest.update(repr(value).encode())
+    elif callable(value):
+        raise _UncacheableError(f"Cannot fingerprint the callable {value!r}")
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            raise _UncacheableError(str(error)) from error
+
+
+def _update_array_digest(digest: "hashlib._Hash", value: Any) -> None:
+    """Add the values of a DataFrame, Series or array to a digest.
+
+    Args:
+    ----
+        digest (hashlib._Hash): Digest to update.
+        value (Any): DataFrame, Series or array.
+
+    Raises:
+    ------
+        _UncacheableError: If the values cannot be hashed.
+
+    """
+    import numpy as np
+    import pandas as pd
+
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        if isinstance(value, pd.DataFrame):
+            labels = (value.columns.tolist(), value.dtypes.tolist())
+        else:
+            labels = (value.name, value.dtype)
+        digest.update(repr((labels, value.index.dtype)).encode())
+        try:
+            hashed = pd.util.hash_pandas_object(value, index=True)
+        except TypeError as error:
+            raise _UncacheableError(str(error)) from error
+        digest.update(hashed.to_numpy().tobytes())
+    elif isinstance(value, np.ndarray) and value.dtype != object:
+        digest.update(repr((value.dtype, value.shape)).encode())
+        digest.update(np.ascontiguousarray(value).tobytes())
+    else:
+        try:
+            digest.update(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL))
+        except (pickle.PicklingError, TypeError, AttributeError) as error:
+            raise _UncacheableError(str(error)) from error
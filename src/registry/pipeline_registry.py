@@ -1,28 +1,217 @@
 """Project pipelines."""
 
-from data_collection.pipelines import create_data_collection_pipeline as data_collection
-from feature_engineering.pipelines import create_pipeline as feature_engineering
+import functools
+import importlib
+import os
+from collections.abc import Iterator, Mapping
+from pathlib import Path
+from typing import Any, NamedTuple, Optional
+
 from kedro.pipeline import Pipeline
-from ml_technique_stock_price.pipelines import (
-    create_modeling_pipeline as ml_technique_modeling,
-)
 
+CONF_SOURCE = Path(__file__).parents[2] / "conf"
+# Parameters of the active Kedro context, see `use_context_parameters`.
+_context_parameters: Optional[dict[str, Any]] = None
+
+
+class _Parameter(NamedTuple):
+    """Factory argument that is read from the parameters when the pipeline is built.
+
+    Used for arguments that change the structure of a pipeline, e.g. the number of
+    variants, which cannot be passed as "params:" inputs of its nodes.
+    """
+
+    key: str
+
+
+# Pipeline name -> (module, factory, factory kwargs). Modules are only imported
+# when the pipeline is first accessed, so e.g. `kedro run --pipeline
+# data_collection` never imports the modeling or backtesting code.
+_PIPELINE_FACTORIES: dict[str, tuple[str, str, dict[str, Any]]] = {
+    # Data Collection Pipelines
+    "data_collection": (
+        "data_collection.pipelines",
+        "create_data_collection_pipeline",
+        {},
+    ),
+    "synthetic_data_collection": (
+        "data_collection.pipelines",
+        "create_synthetic_data_collection_pipeline",
+        {},
+    ),
+    # Feature Engineering
+    "feature_engineering": (
+        "feature_engineering.pipelines",
+        "create_pipeline",
+        {
+            "backend": _Parameter("feature_backend.engine"),
+            "arithmetic_params": _Parameter("arithmetic"),
+            "aggregation_params": _Parameter("aggregation"),
+        },
+    ),
+    # Stock Predictions: ML Technique Pipelines
+    "ml_technique_modeling": (
+        "ml_technique_stock_price.pipelines",
+        "create_modeling_pipeline",
+        {
+            "top_level_namespace": "ml_technique_modeling",
+            "combine_mode": _Parameter("ml_technique_modeling.combine_mode"),
+            "variant_params": _Parameter("ml_technique_modeling.variants"),
+        },
+    ),
+    # Backtesting
+    "walk_forward_backtest": (
+        "common.backtesting.pipelines",
+        "create_walk_forward_pipeline",
+        {
+            "top_level_namespace": "walk_forward_backtest",
+            "use_portfolio": True,
+            "backtest_options": {
+                "bootstrap": _Parameter("walk_forward_backtest.bootstrap.enabled"),
+                "rebalancing": _Parameter("walk_forward_backtest.rebalancing.enabled"),
+            },
+        },
+    ),
+    "incremental_backtest": (
+        "common.backtesting.pipelines",
+        "create_walk_forward_pipeline",
+        {
+            "top_level_namespace": "incremental_backtest",
+            "use_portfolio": True,
+            "incremental": True,
+        },
+    ),
+    # Parameter Sweeps
+    "parameter_sweep": (
+        "parameter_sweep.pipelines",
+        "create_pipeline",
+        {"top_level_namespace": "parameter_sweep"},
+    ),
+}
+
+
+class _LazyPipelines(Mapping):
+    """Read-only mapping that builds each registered pipeline on first access.
+
+    A pipeline is built again if the values of its `_Parameter` arguments changed,
+    e.g. when a later Kedro context runs with other parameters.
+    """
+
+    def __init__(self, factories: dict[str, tuple[str, str, dict[str, Any]]]):
+        self._factories = factories
+        self._pipelines: dict[str, tuple[dict[str, Any], Pipeline]] = {}
+
+    def __getitem__(self, name: str) -> Pipeline:
+        module_name, factory_name, kwargs = self._factories[name]
+        kwargs = _resolve_parameters(kwargs)
+        if name not in self._pipelines or self._pipelines[name][0] != kwargs:
+            factory = getattr(importlib.import_module(module_name), factory_name)
+            self._pipelines[name] = (kwargs, factory(**kwargs))
+        return self._pipelines[name][1]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._factories)
+
+    def __len__(self) -> int:
+        return len(self._factories)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({list(self._factories)})"
+
+
+def _resolve_parameters(kwargs: dict[str, Any]) -> dict[str, Any]:
+    """Replace the `_Parameter` factory arguments with their values.
+
+    Args:
+    ----
+        kwargs (dict[str, Any]): Factory arguments, dictionary arguments may hold
+            `_Parameter` values as well.
+
+    Returns:
+    -------
+        dict[str, Any]: Factory arguments with the parameter values.
+
+    """
+    resolved = {}
+    for name, value in kwargs.items():
+        if isinstance(value, _Parameter):
+            resolved[name] = _load_parameter(value.key)
+        elif isinstance(value, dict):
+            resolved[name] = _resolve_parameters(value)
+        else:
+            resolved[name] = value
+    return resolved
+
+
+def use_context_parameters(parameters: Optional[dict[str, Any]]) -> None:
+    """Read the `_Parameter` factory arguments from the parameters of a run.
+
+    Called by `ContextParametersHooks` with the parameters of the Kedro context, so
+    the structure of the pipelines follows the "--env" and "--params" options of
+    `kedro run`, like the parameters the nodes receive.
+
+    Args:
+    ----
+        parameters (dict[str, Any], optional): Parameters of the Kedro context.
+            None reads the configuration files again.
+
+    """
+    global _context_parameters  # noqa: PLW0603
+    _context_parameters = parameters
+
+
+def _load_parameter(key: str) -> Any:
+    """Load a parameter of the Kedro context or else of the configuration files.
+
+    Args:
+    ----
+        key (str): Dotted key of the parameter.
+
+    Returns:
+    -------
+        Any: The parameter value.
+
+    """
+    value = _context_parameters
+    if value is None:
+        value = _config_parameters(os.environ.get("KEDRO_ENV"))
+    for part in key.split("."):
+        value = value[part]
+    return value
+
+
+@functools.lru_cache(maxsize=None)
+def _config_parameters(env: Optional[str]) -> dict[str, Any]:
+    """Load the parameters of a run environment, "local" if None.
+
+    Args:
+    ----
+        env (str, optional): Run environment.
+
+    Returns:
+    -------
+        dict[str, Any]: The parameters.
 
-def register_pipelines() -> dict[str, Pipeline]:
+    """
+    from kedro.config import OmegaConfigLoader
+
+    from registry.settings import CONFIG_LOADER_ARGS
+
+    return OmegaConfigLoader(
+        conf_source=str(CONF_SOURCE), env=env, **CONFIG_LOADER_ARGS
+    )["parameters"]
+
+
+def register_pipelines() -> Mapping[str, Pipeline]:
     """Register the project's pipelines.
 
+    The pipelines are built lazily: listing the registered names is free and each
+    pipeline (including the imports of its modules) is only created the first time
+    it is accessed.
+
     Returns
     -------
         A mapping from pipeline names to ``Pipeline`` objects.
 
     """
-    return {
-        # Data Collection Pipelines
-        "data_collection": data_collection(),
-        # Feature Engineering
-        "feature_engineering": feature_engineering(),
-        # Stock Predictions: ML Technique Pipelines
-        "ml_technique_modeling": ml_technique_modeling(
-            top_level_namespace="ml_technique_modeling",
-        ),
-    }
+    return _LazyPipelines(_PIPELINE_FACTORIES)
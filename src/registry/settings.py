@@ -1,18 +1,31 @@
 """Project settings."""
 
 # Instantiated project hooks.
-# For example, after creating a hooks.py and defining a ProjectHooks class there, do
-# from pandas_viz.hooks import ProjectHooks
+from pathlib import Path
+
+from registry.hooks import (
+    ContextParametersHooks,
+    NodeCacheHooks,
+    ProfilingHooks,
+    SharedMemoryHooks,
+    TelemetryHooks,
+)
+
+_DATA_PATH = Path(__file__).parents[2] / "data"
 
 # Hooks are executed in a Last-In-First-Out (LIFO) order.
-# HOOKS = (ProjectHooks(),)
+HOOKS = (
+    ContextParametersHooks(),
+    NodeCacheHooks(_DATA_PATH / "09_node_cache"),
+    SharedMemoryHooks(),
+    TelemetryHooks(_DATA_PATH / "08_reporting" / "telemetry.jsonl"),
+    ProfilingHooks(_DATA_PATH / "08_reporting" / "profiles"),
+)
 
 # Installed plugins for which to disable hook auto-registration.
 # DISABLE_HOOKS_FOR_PLUGINS = ("kedro-viz",)
 
 # Class that manages storing KedroSession data.
-# from pathlib import Path  # noqa: E402
-
 # from kedro_viz.integrations.kedro.sqlite_store import SQLiteStore  # noqa: E402
 
 # SESSION_STORE_CLASS = SQLiteStore
@@ -30,6 +43,9 @@ CONFIG_LOADER_CLASS = OmegaConfigLoader
 CONFIG_LOADER_ARGS = {
     "base_env": "base",
     "default_run_env": "local",
+    # The parameters of an environment (e.g. "walk_forward") are merged into the
+    # base parameters key by key instead of replacing their top-level keys.
+    "merge_strategy": {"parameters": "soft"},
     #       "config_patterns": {
     #           "spark" : ["spark*/"],
     #           "parameters": ["parameters*", "parameters*/**", "**/parameters*"],
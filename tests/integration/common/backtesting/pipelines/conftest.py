@@ -50,3 +50,23 @@ def params_performance_metrics() -> dict[str, str]:
 @pytest.fixture
 def params_plot_performance_params() -> dict[str, str]:
     return {"columns": ["Adjusted Portfolio Returns", "Portfolio Returns"]}
+
+
+@pytest.fixture
+def long_price_data(price_data: pd.DataFrame) -> pd.DataFrame:
+    return (
+        price_data.rename_axis("date")
+        .reset_index()
+        .melt(id_vars="date", var_name="stock_ticker", value_name="adj_close")
+    )
+
+
+@pytest.fixture
+def signals_concatenated(signals: pd.DataFrame) -> pd.DataFrame:
+    first_cutoff = signals.iloc[1:3]
+    second_cutoff = -signals.iloc[2:]
+    return (
+        pd.concat([first_cutoff, second_cutoff])
+        .rename_axis("timestamp")
+        .reset_index()
+    )
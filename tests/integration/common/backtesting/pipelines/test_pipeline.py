@@ -3,10 +3,16 @@
 import logging
 
 import pandas as pd
+import pytest
 from kedro.io import DataCatalog
 from kedro.runner import SequentialRunner
 
-from common.backtesting.pipelines import create_pipeline
+from common.backtesting.pipelines import (
+    create_incremental_pipeline,
+    create_pipeline,
+    create_walk_forward_pipeline,
+)
+from common.datasets import RunningStateDataset
 
 
 def test_create_pipeline(
@@ -20,7 +26,7 @@ def test_create_pipeline(
 ):
     pipeline = (
         create_pipeline()
-        .from_nodes("create_portfolio_returns")
+        .from_nodes("create_portfolio_returns", "create_market_data")
         .to_nodes("plot_performance_metrics")
     )
     catalog = DataCatalog()
@@ -41,3 +47,233 @@ def test_create_pipeline(
     SequentialRunner().run(pipeline, catalog)
 
     assert successful_run_msg in caplog.text
+
+
+def test_create_walk_forward_pipeline(
+    caplog,
+    long_price_data: pd.DataFrame,
+    signals_concatenated: pd.DataFrame,
+    params_trading_costs: dict[str, str],
+    params_performance_metrics: dict[str, str],
+    params_plot_performance_params: dict[str, str],
+):
+    pipeline = create_walk_forward_pipeline(
+        "walk_forward_backtest", signals_namespace="modeling"
+    )
+    catalog = DataCatalog()
+    catalog.add_feed_dict(
+        {
+            "price_data": long_price_data,
+            "modeling.signals_concatenated": signals_concatenated,
+            "params:modeling.stock_price_params": {"weighting": "indicator"},
+            "params:walk_forward_backtest.price_matrix": {},
+            "params:walk_forward_backtest.trading_costs": params_trading_costs,
+            "params:walk_forward_backtest.performance_metrics": (
+                params_performance_metrics
+            ),
+            "params:walk_forward_backtest.plot_performance_params": (
+                params_plot_performance_params
+            ),
+        }
+    )
+
+    caplog.set_level(logging.DEBUG, logger="kedro")
+    successful_run_msg = "Pipeline execution completed successfully."
+
+    outputs = SequentialRunner().run(pipeline, catalog)
+
+    assert successful_run_msg in caplog.text
+    metrics = outputs["walk_forward_backtest.performance_metrics"]
+    assert {"sharpe_ratio", "max_drawdown", "turnover"} <= set(metrics)
+
+
+def test_create_incremental_pipeline(
+    caplog,
+    price_data: pd.DataFrame,
+    signals: pd.DataFrame,
+    weights: pd.DataFrame,
+    params_trading_costs: dict[str, str],
+    params_performance_metrics: dict[str, str],
+):
+    pipeline = create_incremental_pipeline()
+    catalog = DataCatalog()
+    catalog.add_feed_dict(
+        {
+            "price_data": price_data,
+            "weights": weights,
+            "signals": signals,
+            "backtest_state": {},
+            "metric_state": {},
+            "params:trading_costs": params_trading_costs,
+            "params:performance_metrics": params_performance_metrics,
+        }
+    )
+
+    caplog.set_level(logging.DEBUG, logger="kedro")
+    successful_run_msg = "Pipeline execution completed successfully."
+
+    outputs = SequentialRunner().run(pipeline, catalog)
+
+    assert successful_run_msg in caplog.text
+    assert outputs["updated_backtest_state"]["last_date"] == "2024-06-05T00:00:00"
+    assert outputs["updated_metric_state"]["count"] == len(price_data)
+    assert "turnover" in outputs["performance_metrics"]
+
+
+def test_create_walk_forward_pipeline_with_portfolio(
+    caplog,
+    long_price_data: pd.DataFrame,
+    signals_concatenated: pd.DataFrame,
+    params_trading_costs: dict[str, str],
+    params_performance_metrics: dict[str, str],
+    params_plot_performance_params: dict[str, str],
+):
+    pipeline = create_walk_forward_pipeline(
+        "walk_forward_backtest", signals_namespace="modeling", use_portfolio=True
+    )
+    portfolio_concatenated = signals_concatenated.assign(
+        **{
+            column: signals_concatenated[column] / 3
+            for column in signals_concatenated.columns.drop("timestamp")
+        }
+    )
+    catalog = DataCatalog()
+    catalog.add_feed_dict(
+        {
+            "price_data": long_price_data,
+            "modeling.portfolio_concatenated": portfolio_concatenated,
+            "params:walk_forward_backtest.price_matrix": {},
+            "params:walk_forward_backtest.trading_costs": params_trading_costs,
+            "params:walk_forward_backtest.performance_metrics": (
+                params_performance_metrics
+            ),
+            "params:walk_forward_backtest.plot_performance_params": (
+                params_plot_performance_params
+            ),
+        }
+    )
+
+    caplog.set_level(logging.DEBUG, logger="kedro")
+    successful_run_msg = "Pipeline execution completed successfully."
+
+    outputs = SequentialRunner().run(pipeline, catalog)
+
+    assert successful_run_msg in caplog.text
+    assert "turnover" in outputs["walk_forward_backtest.performance_metrics"]
+
+
+def test_create_walk_forward_pipeline_incremental(
+    tmp_path,
+    long_price_data: pd.DataFrame,
+    signals_concatenated: pd.DataFrame,
+    params_trading_costs: dict[str, str],
+    params_performance_metrics: dict[str, str],
+):
+    pipeline = create_walk_forward_pipeline(
+        "incremental_backtest", signals_namespace="modeling", incremental=True
+    )
+    dates = long_price_data["date"].sort_values().unique()
+
+    def run(price_data: pd.DataFrame, signals: pd.DataFrame) -> dict:
+        catalog = DataCatalog(
+            {
+                f"incremental_backtest.{prefix}{name}": RunningStateDataset(
+                    filepath=str(tmp_path / f"{name}.pkl")
+                )
+                for name in ["backtest_state", "metric_state"]
+                for prefix in ["", "updated_"]
+            }
+        )
+        catalog.add_feed_dict(
+            {
+                "price_data": price_data,
+                "modeling.signals_concatenated": signals,
+                "params:modeling.stock_price_params": {"weighting": "indicator"},
+                "params:incremental_backtest.price_matrix": {},
+                "params:incremental_backtest.trading_costs": params_trading_costs,
+                "params:incremental_backtest.performance_metrics": (
+                    params_performance_metrics
+                ),
+            }
+        )
+        SequentialRunner().run(pipeline, catalog)
+        return {
+            name: catalog.load(f"incremental_backtest.{name}")
+            for name in ["backtest_state", "metric_state"]
+        }
+
+    first_state = run(
+        long_price_data[long_price_data["date"] <= dates[-2]],
+        signals_concatenated[signals_concatenated["timestamp"] <= dates[-2]],
+    )
+    assert first_state["backtest_state"]["last_date"] == "2024-06-04T00:00:00"
+
+    state = run(long_price_data, signals_concatenated)
+    assert state["backtest_state"]["last_date"] == "2024-06-05T00:00:00"
+    assert state["metric_state"]["count"] == first_state["metric_state"]["count"] + 1
+
+
+@pytest.mark.parametrize(
+    ("backtest_options", "node_name"),
+    [
+        ({"bootstrap": True}, "bootstrap_performance_metrics"),
+        ({"rebalancing": True}, "simulate_rebalancing"),
+    ],
+)
+def test_create_walk_forward_pipeline_with_backtest_options(
+    long_price_data: pd.DataFrame,
+    signals_concatenated: pd.DataFrame,
+    params_trading_costs: dict[str, str],
+    params_performance_metrics: dict[str, str],
+    params_plot_performance_params: dict[str, str],
+    backtest_options: dict[str, bool],
+    node_name: str,
+):
+    pipeline = create_walk_forward_pipeline(
+        "walk_forward_backtest",
+        signals_namespace="modeling",
+        backtest_options=backtest_options,
+    )
+    assert f"walk_forward_backtest.{node_name}" in {
+        node.name for node in pipeline.nodes
+    }
+    catalog = DataCatalog()
+    catalog.add_feed_dict(
+        {
+            "price_data": long_price_data,
+            "modeling.signals_concatenated": signals_concatenated,
+            "params:modeling.stock_price_params": {"weighting": "indicator"},
+            "params:walk_forward_backtest.price_matrix": {},
+            "params:walk_forward_backtest.trading_costs": params_trading_costs,
+            "params:walk_forward_backtest.performance_metrics": (
+                params_performance_metrics
+            ),
+            "params:walk_forward_backtest.plot_performance_params": (
+                params_plot_performance_params
+            ),
+            "params:walk_forward_backtest.bootstrap": {
+                "enabled": True,
+                "n_resamples": 20,
+                "block_length": 2,
+                "seed": 0,
+            },
+            "params:walk_forward_backtest.rebalancing": {
+                "enabled": True,
+                "schedule": "targets",
+            },
+        }
+    )
+
+    outputs = SequentialRunner().run(pipeline, catalog)
+
+    assert "turnover" in outputs["walk_forward_backtest.performance_metrics"]
+    if backtest_options.get("bootstrap"):
+        intervals = outputs["walk_forward_backtest.bootstrap_performance_metrics"]
+        assert "sharpe_ratio" in intervals.index
+
+
+def test_incremental_walk_forward_rejects_backtest_options():
+    with pytest.raises(ValueError, match="Invalid backtest options"):
+        create_walk_forward_pipeline(
+            "incremental_backtest", incremental=True, backtest_options={"bootstrap": True}
+        )
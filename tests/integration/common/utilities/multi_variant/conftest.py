@@ -0,0 +1,18 @@
+"""Conftest"""
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def variant_signals() -> dict[str, pd.DataFrame]:
+    return {
+        "2023-01-06": pd.DataFrame(
+            {"AAPL": [1, 1], "MSFT": [-1, -1]},
+            index=pd.Index(["2023-01-09", "2023-01-10"], name="timestamp"),
+        ),
+        "2023-01-13": pd.DataFrame(
+            {"MSFT": [1, 1], "GOOGL": [-1, -1]},
+            index=pd.Index(["2023-01-16", "2023-01-17"], name="timestamp"),
+        ),
+    }
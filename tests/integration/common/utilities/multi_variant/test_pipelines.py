@@ -0,0 +1,52 @@
+"""Integration test for the multi variant pipelines"""
+
+import pandas as pd
+from kedro.io import DataCatalog
+from kedro.runner import SequentialRunner
+from kedro_datasets.partitions import PartitionedDataset
+
+from common.utilities.multi_variant.pipelines import (
+    create_experiment_predictions_variant_stream_pipeline,
+)
+
+
+def test_create_experiment_predictions_variant_stream_pipeline(
+    tmp_path, variant_signals: dict[str, pd.DataFrame]
+):
+    variants = list(variant_signals)
+    pipeline = create_experiment_predictions_variant_stream_pipeline(
+        top_level_namespace="modeling", variants=variants, experiment_name="signals"
+    )
+
+    def _partitioned(name):
+        return PartitionedDataset(
+            path=str(tmp_path / name),
+            dataset="pandas.CSVDataset",
+            filename_suffix=".csv",
+        )
+
+    catalog = DataCatalog(
+        {
+            **{
+                f"modeling.{variant}.signals_partition": _partitioned(
+                    f"partitions/{variant}"
+                )
+                for variant in variants
+            },
+            "modeling.signals_streamed": _partitioned("streamed"),
+        }
+    )
+    catalog.add_feed_dict(
+        {
+            f"modeling.{variant}.signals": signals
+            for variant, signals in variant_signals.items()
+        }
+    )
+
+    SequentialRunner().run(pipeline, catalog)
+
+    streamed = catalog.load("modeling.signals_streamed")
+    combined = pd.concat([load() for _, load in sorted(streamed.items())])
+    assert sorted(streamed) == variants
+    assert list(combined.columns) == ["timestamp", "AAPL", "MSFT", "GOOGL"]
+    assert combined.loc[:, ["AAPL", "MSFT", "GOOGL"]].abs().sum().sum() == 8
@@ -0,0 +1,86 @@
+"""Test for the batch backtest functions."""
+
+import numpy as np
+import pandas as pd
+
+from common.backtesting.functions.batch import (
+    calculate_batch_performance_metrics,
+    create_batch_portfolio_returns,
+)
+from common.backtesting.functions.evaluation import (
+    cagr,
+    max_drawdown,
+    mean_return,
+    sharpe_ratio,
+)
+from common.backtesting.functions.returns import (
+    adjust_returns_for_trading_costs,
+    create_portfolio_returns,
+)
+
+
+def test_create_batch_portfolio_returns(
+    price_data: pd.DataFrame,
+    signals: pd.DataFrame,
+    weights: pd.DataFrame,
+    params_trading_costs: dict[str, float],
+):
+    """Every strategy of the batch matches its single backtest."""
+    strategy_signals = {"first": signals, "second": -signals}
+    strategy_weights = {"first": weights, "second": weights / 2}
+
+    result = create_batch_portfolio_returns(
+        price_data, strategy_signals, params_trading_costs, strategy_weights
+    )
+
+    assert list(result.columns) == ["first", "second"]
+    for name in result.columns:
+        single = adjust_returns_for_trading_costs(
+            create_portfolio_returns(price_data, strategy_weights[name]),
+            strategy_signals[name],
+            params_trading_costs,
+            weights=strategy_weights[name],
+        )
+        np.testing.assert_allclose(
+            result[name], single["Adjusted Portfolio Returns"]
+        )
+
+
+def test_create_batch_portfolio_returns_periods(
+    price_data: pd.DataFrame,
+    signals: pd.DataFrame,
+    params_trading_costs: dict[str, float],
+):
+    """Strategies stored with a timestamp column are active on their own dates."""
+    strategy_signals = {
+        "early": lambda: signals.iloc[:3].rename_axis("timestamp").reset_index(),
+        "late": signals.iloc[2:],
+    }
+    result = create_batch_portfolio_returns(
+        price_data, strategy_signals, params_trading_costs
+    )
+
+    assert result["early"].notna().tolist() == [True, True, True, False, False]
+    assert result["late"].notna().tolist() == [False, False, True, True, True]
+
+
+def test_calculate_batch_performance_metrics(adjusted_portfolio_returns):
+    """The metrics of every strategy match the single series metrics."""
+    returns = adjusted_portfolio_returns["Adjusted Portfolio Returns"]
+    batch_returns = pd.DataFrame({"first": returns, "second": returns * 2})
+
+    metrics = calculate_batch_performance_metrics(batch_returns)
+
+    assert list(metrics["strategy"]) == ["first", "second"]
+    first = metrics.iloc[0]
+    np.testing.assert_allclose(
+        [first["mean_return"], first["sharpe_ratio"], first["max_drawdown"]],
+        [
+            mean_return(adjusted_portfolio_returns),
+            sharpe_ratio(adjusted_portfolio_returns),
+            max_drawdown(adjusted_portfolio_returns),
+        ],
+    )
+    np.testing.assert_allclose(
+        first["cagr"], cagr(adjusted_portfolio_returns.copy())
+    )
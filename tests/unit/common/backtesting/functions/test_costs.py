@@ -0,0 +1,114 @@
+"""Test for the transaction cost models."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.backtesting.functions.batch import create_batch_portfolio_returns
+from common.backtesting.functions.costs import (
+    create_market_data,
+    transaction_costs,
+)
+from common.backtesting.functions.returns import (
+    adjust_returns_for_trading_costs,
+    create_portfolio_returns,
+)
+
+
+@pytest.fixture
+def backtest_data() -> dict[str, np.ndarray]:
+    return {
+        "trades": np.array([[0.5, -0.5], [0.25, 0.0]]),
+        "weights": np.array([[0.5, -0.5], [0.75, -0.5]]),
+        "prices": np.array([[10.0, 20.0], [10.0, 25.0]]),
+        "volatility": np.array([[0.02, 0.01], [0.02, 0.01]]),
+        "adv": np.array([[1e6, 4e6], [1e6, 4e6]]),
+    }
+
+
+@pytest.mark.parametrize(
+    ("cost_models", "expected"),
+    [
+        ({"fixed_bps": {"bps": 10}}, [1e-3, 2.5e-4]),
+        ({"per_share": {"fee_per_share": 0.01}}, [0.5e-3 + 0.25e-3, 0.25e-3]),
+        ({"spread": {"spread_bps": 20}}, [1e-3, 2.5e-4]),
+        (
+            {"sqrt_impact": {"capital": 1e6, "coefficient": 0.5}},
+            [
+                0.5 * 0.5 * 0.02 * np.sqrt(0.5) + 0.5 * 0.5 * 0.01 * np.sqrt(0.125),
+                0.25 * 0.5 * 0.02 * np.sqrt(0.25),
+            ],
+        ),
+        ({"borrow": {"annual_rate": 0.0252}}, [0.5e-4, 0.5e-4]),
+    ],
+)
+def test_cost_models(backtest_data, cost_models, expected):
+    result = transaction_costs(backtest_data, {"cost_models": cost_models})
+    np.testing.assert_allclose(result, expected)
+
+
+def test_transaction_costs_sums_models(backtest_data):
+    """The flat cost shorthand is added to the configured models."""
+    result = transaction_costs(
+        backtest_data,
+        {"bp_trading_cost": 10, "cost_models": {"spread": {"spread_bps": 20}}},
+    )
+    np.testing.assert_allclose(result, [2e-3, 5e-4])
+
+
+def test_transaction_costs_invalid_model(backtest_data):
+    with pytest.raises(ValueError, match="Invalid cost models"):
+        transaction_costs(backtest_data, {"cost_models": {"unknown": {}}})
+
+
+def test_create_market_data_requires_volumes(price_data):
+    with pytest.raises(ValueError, match="volumes"):
+        create_market_data(
+            price_data, {"cost_models": {"sqrt_impact": {"capital": 1e6}}}
+        )
+
+
+def test_create_market_data_trailing(price_data):
+    """The trailing statistics only use earlier dates."""
+    volumes = pd.DataFrame(1000.0, index=price_data.index, columns=price_data.columns)
+    market_data = create_market_data(
+        price_data,
+        {
+            "cost_models": {"sqrt_impact": {"capital": 1e6}},
+            "market_data_window": 2,
+        },
+        volumes,
+    )
+    assert market_data["adv"].iloc[0].isna().all()
+    pd.testing.assert_series_equal(
+        market_data["adv"].iloc[2],
+        (price_data.iloc[:2] * 1000).mean(),
+        check_names=False,
+    )
+
+
+def test_batch_and_single_costs_match(price_data, signals, weights):
+    """The single and the batch backtest share the cost models."""
+    params = {
+        "bp_trading_cost": 5,
+        "cost_models": {
+            "per_share": {"fee_per_share": 0.005},
+            "borrow": {"annual_rate": 0.02},
+        },
+    }
+    batch = create_batch_portfolio_returns(
+        price_data, {"strategy": signals}, params, {"strategy": -weights}
+    )
+    single = adjust_returns_for_trading_costs(
+        create_portfolio_returns(price_data, -weights),
+        signals,
+        params,
+        -weights,
+        create_market_data(price_data, params),
+    )
+    np.testing.assert_allclose(
+        batch["strategy"], single["Adjusted Portfolio Returns"]
+    )
+    assert (
+        single["Adjusted Portfolio Returns"] < single["Portfolio Returns"]
+    ).all()
@@ -0,0 +1,81 @@
+"""Test for the array backtest core."""
+
+import numpy as np
+import pandas as pd
+
+from common.backtesting.functions.returns import (
+    adjust_returns_for_trading_costs,
+    create_portfolio_returns,
+)
+
+
+def _legacy_create_portfolio_returns(prices, weights):
+    returns = prices.pct_change(fill_method=None)
+    return (returns * weights).sum(axis=1).to_frame(name="Portfolio Returns")
+
+
+def _legacy_adjust_returns_for_trading_costs(portfolio_returns, signals, params):
+    portfolio_returns = portfolio_returns.copy()
+    bp_trading_cost = params["bp_trading_cost"] / 10000
+    portfolio_returns.loc[:, "Cumulative Returns"] = (
+        1 + portfolio_returns.loc[:, "Portfolio Returns"]
+    ).cumprod()
+    trade_signals = signals.diff().fillna(signals)
+    position_sizes = portfolio_returns.loc[:, "Cumulative Returns"].shift(1).fillna(1)
+    investment_changes = trade_signals.multiply(position_sizes, axis=0).abs()
+    trading_costs = investment_changes * bp_trading_cost
+    portfolio_returns.loc[:, "Total Trading Costs"] = trading_costs.sum(axis=1)
+    portfolio_returns.loc[:, "Normalized Trading Costs"] = (
+        portfolio_returns.loc[:, "Total Trading Costs"]
+        / portfolio_returns.loc[:, "Cumulative Returns"]
+    )
+    portfolio_returns.loc[:, "Adjusted Portfolio Returns"] = (
+        portfolio_returns.loc[:, "Portfolio Returns"]
+        - portfolio_returns.loc[:, "Normalized Trading Costs"]
+    )
+    return portfolio_returns
+
+
+def _random_frames():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(start="2024-01-01", periods=60)
+    tickers = [f"TICKER_{i}" for i in range(8)]
+    prices = pd.DataFrame(
+        100 * np.cumprod(1 + rng.normal(scale=0.02, size=(60, 8)), axis=0),
+        index=dates,
+        columns=tickers,
+    )
+    prices.iloc[rng.integers(0, 60, 10), rng.integers(0, 8, 10)] = np.nan
+    signals = pd.DataFrame(
+        rng.integers(-1, 2, size=(50, 6)).astype(float),
+        index=dates[5:55],
+        columns=tickers[2:],
+    )
+    signals.iloc[rng.integers(0, 50, 5), rng.integers(0, 6, 5)] = np.nan
+    weights = signals / 6
+    return prices, weights, signals
+
+
+def test_create_portfolio_returns_matches_pandas():
+    """Misaligned dates, tickers and missing prices give the pandas results."""
+    prices, weights, _ = _random_frames()
+    pd.testing.assert_frame_equal(
+        create_portfolio_returns(prices, weights),
+        _legacy_create_portfolio_returns(prices, weights),
+        check_freq=False,
+    )
+
+
+def test_adjust_returns_for_trading_costs_matches_pandas():
+    """Signals on a subset of the dates give the pandas results."""
+    prices, weights, signals = _random_frames()
+    portfolio_returns = create_portfolio_returns(prices, weights)
+    original = portfolio_returns.copy()
+    params = {"bp_trading_cost": 15}
+
+    pd.testing.assert_frame_equal(
+        adjust_returns_for_trading_costs(portfolio_returns, signals, params),
+        _legacy_adjust_returns_for_trading_costs(portfolio_returns, signals, params),
+        check_freq=False,
+    )
+    pd.testing.assert_frame_equal(portfolio_returns, original)
@@ -4,7 +4,9 @@ import numpy as np
 import pandas as pd
 
 from common.backtesting.functions.evaluation import (
-    cagr, calculate_performance_metrics, max_drawdown, mean_return,
+    cagr, calculate_performance_metrics,
+    calculate_periodic_performance_metrics,
+    calculate_rolling_performance_metrics, max_drawdown, mean_return,
     sharpe_ratio, std_deviation)
 
 
@@ -21,9 +23,11 @@ def test_std_deviation(adjusted_portfolio_returns, evaluation_results):
 
 
 def test_cagr(adjusted_portfolio_returns, evaluation_results):
+    index = adjusted_portfolio_returns.index.copy()
     result = cagr(adjusted_portfolio_returns)
     expected = evaluation_results["cagr"]
     assert math.isclose(result, expected, rel_tol=1e-3)
+    assert adjusted_portfolio_returns.index.equals(index)
 
 
 def test_max_drawdown(adjusted_portfolio_returns, evaluation_results):
@@ -53,8 +57,78 @@ def test_calculate_performance_metrics(
         "sharpe_ratio": evaluation_results["sharpe_ratio"],
         "cagr": evaluation_results["cagr"],
         "max_drawdown": evaluation_results["max_drawdown"],
-        "sharpe_ratio": evaluation_results["sharpe_ratio"],
     }
 
     for key, _ in expected_metrics.items():
         assert math.isclose(result[key], expected_metrics[key], rel_tol=1e-3)
+
+
+def test_calculate_performance_metrics_extended(
+    adjusted_portfolio_returns: pd.DataFrame,
+    signals: pd.DataFrame,
+    params_performance_metrics: dict[str, str],
+):
+    returns = adjusted_portfolio_returns["Adjusted Portfolio Returns"]
+    result = calculate_performance_metrics(
+        portfolio_returns=adjusted_portfolio_returns,
+        performance_metric_params=params_performance_metrics,
+        signals=signals,
+    )
+    downside = np.sqrt((np.minimum(returns, 0) ** 2).mean())
+
+    assert math.isclose(result["volatility"], returns.std() * np.sqrt(252))
+    assert math.isclose(
+        result["sortino_ratio"], returns.mean() / downside * np.sqrt(252)
+    )
+    assert math.isclose(result["hit_rate"], 0.8)
+    assert math.isnan(result["calmar_ratio"])
+    assert math.isclose(
+        result["turnover"], signals.diff().fillna(signals).abs().sum(axis=1).mean()
+    )
+
+
+def test_calculate_rolling_performance_metrics():
+    dates = pd.bdate_range(start="2024-01-01", periods=60)
+    returns = pd.Series(
+        np.random.default_rng(0).normal(0.001, 0.01, len(dates)), index=dates
+    )
+    result = calculate_rolling_performance_metrics(
+        returns.to_frame("Returns"), {"columns": "Returns", "rolling_window": 10}
+    )
+
+    rolling = returns.rolling(10)
+    pd.testing.assert_series_equal(
+        result["mean_return"], rolling.mean(), check_names=False
+    )
+    pd.testing.assert_series_equal(
+        result["volatility"], rolling.std() * np.sqrt(252), check_names=False
+    )
+    expected_drawdown = rolling.apply(
+        lambda window: max_drawdown(window.to_frame())
+    )
+    pd.testing.assert_series_equal(
+        result["max_drawdown"], expected_drawdown, check_names=False
+    )
+
+
+def test_calculate_periodic_performance_metrics():
+    dates = pd.bdate_range(start="2023-11-01", periods=80)
+    returns = pd.Series(
+        np.random.default_rng(1).normal(0.001, 0.01, len(dates)), index=dates
+    )
+    result = calculate_periodic_performance_metrics(
+        returns.to_frame("Returns"), {"columns": "Returns", "frequency": "month"}
+    )
+
+    groups = returns.groupby(returns.index.to_period("M"))
+    assert list(result.index.astype(str)) == ["2023-11", "2023-12", "2024-01",
+                                              "2024-02"]
+    np.testing.assert_allclose(result["mean_return"], groups.mean())
+    np.testing.assert_allclose(
+        result["total_return"], groups.apply(lambda x: (1 + x).prod() - 1)
+    )
+    np.testing.assert_allclose(
+        result["max_drawdown"],
+        groups.apply(lambda x: max_drawdown(x.to_frame())),
+    )
+    assert result["n_observations"].sum() == len(returns)
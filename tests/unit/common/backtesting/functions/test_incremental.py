@@ -0,0 +1,89 @@
+"""Test for the incremental backtest updates."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.backtesting.functions.costs import create_market_data
+from common.backtesting.functions.evaluation import calculate_performance_metrics
+from common.backtesting.functions.incremental import (
+    update_performance_metrics,
+    update_portfolio_returns,
+)
+from common.backtesting.functions.returns import (
+    adjust_returns_for_trading_costs,
+    create_portfolio_returns,
+)
+
+
+def _random_frames():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(start="2024-01-01", periods=120)
+    tickers = [f"TICKER_{i}" for i in range(4)]
+    prices = pd.DataFrame(
+        100 * np.cumprod(1 + rng.normal(scale=0.02, size=(120, 4)), axis=0),
+        index=dates,
+        columns=tickers,
+    )
+    prices.iloc[10:15, 1] = np.nan
+    signals = pd.DataFrame(
+        rng.integers(-1, 2, size=(120, 4)), index=dates, columns=tickers
+    ).astype(float)
+    return prices, signals, signals / 4
+
+
+@pytest.mark.parametrize("stops", [[120], [60, 61, 100, 120], [30, 120, 120]])
+def test_incremental_updates_match_full_recompute(stops):
+    """Appending dates in chunks reproduces the returns and metrics of one run."""
+    prices, signals, weights = _random_frames()
+    trading_cost_params = {
+        "bp_trading_cost": 10,
+        "cost_models": {"borrow": {"annual_rate": 0.02}},
+    }
+    metric_params = {"columns": ["Adjusted Portfolio Returns"]}
+    market_data = create_market_data(prices, trading_cost_params)
+
+    expected = adjust_returns_for_trading_costs(
+        create_portfolio_returns(prices, weights),
+        signals,
+        trading_cost_params,
+        weights,
+        market_data,
+    )
+    expected_metrics = calculate_performance_metrics(expected, metric_params, signals)
+
+    backtest_state, metric_state, updates = {}, {}, []
+    for stop in stops:
+        update, backtest_state = update_portfolio_returns(
+            prices.iloc[:stop],
+            weights.iloc[:stop],
+            trading_cost_params,
+            backtest_state,
+            market_data,
+        )
+        metrics, metric_state = update_performance_metrics(
+            update, metric_params, metric_state, signals.iloc[:stop]
+        )
+        # The states survive a JSON round trip.
+        backtest_state = json.loads(json.dumps(backtest_state))
+        metric_state = json.loads(json.dumps(metric_state))
+        updates.append(update)
+
+    pd.testing.assert_frame_equal(pd.concat(updates), expected, rtol=1e-10)
+    assert metrics.keys() == expected_metrics.keys()
+    for name, value in expected_metrics.items():
+        assert metrics[name] == pytest.approx(value, rel=1e-9)
+
+
+def test_update_without_new_dates_keeps_state():
+    prices, _, weights = _random_frames()
+    _, state = update_portfolio_returns(prices, weights, {"bp_trading_cost": 10})
+
+    update, new_state = update_portfolio_returns(
+        prices, weights, {"bp_trading_cost": 10}, state
+    )
+
+    assert update.empty
+    assert new_state == state
@@ -0,0 +1,40 @@
+"""Test for the backtest preparation functions."""
+
+import numpy as np
+import pandas as pd
+
+from common.backtesting.functions.preparation import create_walk_forward_weights
+
+
+def test_create_walk_forward_weights():
+    """Later cutoffs win on shared dates and the dates are sorted."""
+    signals_concatenated = pd.DataFrame(
+        {
+            "timestamp": ["2023-01-09", "2023-01-10", "2023-01-10", "2023-01-11"],
+            "AAPL": [1, 1, -1, 0],
+            "MSFT": [-1, 0, 1, np.nan],
+        }
+    )
+    signals, weights = create_walk_forward_weights(
+        signals_concatenated, {"weighting": "indicator"}
+    )
+
+    assert list(signals.index) == list(
+        pd.to_datetime(["2023-01-09", "2023-01-10", "2023-01-11"])
+    )
+    np.testing.assert_array_equal(signals.to_numpy(), [[1, -1], [-1, 1], [0, 0]])
+    np.testing.assert_allclose(
+        weights.to_numpy(), [[0.5, -0.5], [-0.5, 0.5], [0, 0]]
+    )
+
+
+def test_create_walk_forward_weights_score():
+    """Score weights are used as they are and their signs become the signals."""
+    signals_concatenated = pd.DataFrame(
+        {"timestamp": ["2023-01-09"], "AAPL": [0.7], "MSFT": [-0.3]}
+    )
+    signals, weights = create_walk_forward_weights(
+        signals_concatenated, {"weighting": "score"}
+    )
+    np.testing.assert_array_equal(signals.to_numpy(), [[1, -1]])
+    np.testing.assert_allclose(weights.to_numpy(), [[0.7, -0.3]])
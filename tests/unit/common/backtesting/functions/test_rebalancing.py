@@ -0,0 +1,71 @@
+"""Test for the rebalancing simulation."""
+
+import numpy as np
+import pandas as pd
+
+from common.backtesting.functions.rebalancing import simulate_rebalancing
+from common.backtesting.functions.returns import create_portfolio_returns
+
+
+def _random_frames():
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(start="2024-01-01", periods=80)
+    tickers = [f"TICKER_{i}" for i in range(6)]
+    prices = pd.DataFrame(
+        100 * np.cumprod(1 + rng.normal(scale=0.02, size=(80, 6)), axis=0),
+        index=dates,
+        columns=tickers,
+    )
+    weights = pd.DataFrame(
+        rng.dirichlet(np.ones(6), size=80), index=dates, columns=tickers
+    )
+    return prices, weights
+
+
+def test_simulate_rebalancing_daily():
+    """Daily rebalancing gives the returns of constant target weights."""
+    prices, weights = _random_frames()
+    result = simulate_rebalancing(
+        prices, weights, {"bp_trading_cost": 10}, {"schedule": "daily"}
+    )
+    expected = create_portfolio_returns(prices, weights)
+    np.testing.assert_allclose(
+        result["Portfolio Returns"], expected["Portfolio Returns"]
+    )
+    assert result["Rebalance"].all()
+
+
+def test_simulate_rebalancing_buy_and_hold():
+    """Without new targets the positions drift like a buy and hold portfolio."""
+    prices, weights = _random_frames()
+    initial = weights.iloc[[0]]
+    result = simulate_rebalancing(
+        prices, initial, {"bp_trading_cost": 10}, {"schedule": "targets"}
+    )
+
+    value = (prices / prices.iloc[0] * initial.iloc[0]).sum(axis=1)
+    np.testing.assert_allclose(
+        (1 + result["Portfolio Returns"]).cumprod(), value, rtol=1e-12
+    )
+    assert result["Rebalance"].sum() == 1
+    assert np.isclose(result["Turnover"].iloc[0], 1)
+    assert (result["Total Trading Costs"].iloc[1:] == 0).all()
+
+
+def test_simulate_rebalancing_schedule_and_threshold():
+    """Trades only happen on the scheduled or drift triggered dates."""
+    prices, weights = _random_frames()
+    weekly = simulate_rebalancing(
+        prices, weights, {"bp_trading_cost": 10}, {"schedule": "W-FRI"}
+    )
+    assert weekly["Rebalance"].sum() == len(prices.index.to_period("W-FRI").unique())
+    assert (weekly.loc[~weekly["Rebalance"], "Turnover"] == 0).all()
+
+    targets = weights.iloc[[0, 40]]
+    drifted = simulate_rebalancing(
+        prices, targets, {"bp_trading_cost": 10}, {"threshold": 0.02}
+    )
+    scheduled = simulate_rebalancing(prices, targets, {"bp_trading_cost": 10}, {})
+    assert scheduled["Rebalance"].sum() == 2
+    assert drifted["Rebalance"].sum() > 2
+    assert drifted["Rebalance"].iloc[[0, 40]].all()
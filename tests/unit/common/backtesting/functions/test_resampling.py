@@ -0,0 +1,68 @@
+"""Test for the resampling functions."""
+
+import numpy as np
+import pandas as pd
+import pytest
+from common.backtesting.functions.resampling import (
+    bootstrap_performance_metrics,
+    resample_positions,
+)
+
+
+@pytest.mark.parametrize("method", ["stationary", "block", "permutation"])
+def test_resample_positions(method):
+    """Positions index into the series and are reproducible with a seed."""
+    n_dates = 50
+    positions = resample_positions(n_dates, 200, method, 5, np.random.default_rng(0))
+    assert positions.shape == (200, n_dates)
+    assert positions.min() >= 0
+    assert positions.max() < n_dates
+    np.testing.assert_array_equal(
+        positions, resample_positions(50, 200, method, 5, np.random.default_rng(0))
+    )
+
+
+def test_resample_positions_block():
+    """Fixed blocks are consecutive (circular) positions."""
+    positions = resample_positions(12, 3, "block", 4, np.random.default_rng(1))
+    steps = np.diff(positions, axis=-1) % 12
+    assert (steps[:, [0, 1, 2, 4, 5, 6, 8, 9, 10]] == 1).all()
+
+
+def test_resample_positions_permutation():
+    """Permutations use every date once."""
+    positions = resample_positions(30, 10, "permutation", rng=np.random.default_rng(2))
+    np.testing.assert_array_equal(
+        np.sort(positions, axis=-1), np.tile(np.arange(30), (10, 1))
+    )
+
+
+def test_resample_positions_invalid_method():
+    """Unknown methods raise a ValueError."""
+    with pytest.raises(ValueError, match="Invalid resampling method"):
+        resample_positions(10, 2, "jackknife")
+
+
+def test_bootstrap_performance_metrics():
+    """The intervals are ordered and the estimates match the full sample metrics."""
+    dates = pd.bdate_range(start="2020-01-01", periods=500)
+    portfolio_returns = pd.DataFrame(
+        {
+            "Adjusted Portfolio Returns": np.random.default_rng(3).normal(
+                0.001, 0.01, len(dates)
+            )
+        },
+        index=dates,
+    )
+    params = {"n_resamples": 300, "chunk_size": 128, "seed": 4}
+    result = bootstrap_performance_metrics(portfolio_returns, params)
+
+    assert {"sharpe_ratio", "max_drawdown", "cagr"} <= set(result.index)
+    returns = portfolio_returns["Adjusted Portfolio Returns"]
+    assert np.isclose(result.loc["mean_return", "estimate"], returns.mean())
+    assert (result["lower"] <= result["upper"]).all()
+    sharpe = result.loc["sharpe_ratio"]
+    assert sharpe["lower"] < sharpe["estimate"] < sharpe["upper"]
+    pd.testing.assert_frame_equal(
+        result, bootstrap_performance_metrics(portfolio_returns, params)
+    )
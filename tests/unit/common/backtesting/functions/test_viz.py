@@ -1,8 +1,11 @@
 """Test for viz functions."""
 
 import matplotlib.pyplot as plt
+import numpy as np
+import pytest
 
-from common.backtesting.functions.viz import plot_performance_metrics
+from common.backtesting.functions.viz import (
+    downsample_indices, plot_performance_metrics)
 
 
 def test_plot_performance_metrics(return_df, params_plot_performance_params):
@@ -13,3 +16,60 @@ def test_plot_performance_metrics(return_df, params_plot_performance_params):
     ), "The return type should be a matplotlib.figure.Figure"
 
     assert len(figure.axes) > 0, "The figure should have at least one axis"
+
+
+def test_plot_performance_metrics_creates_a_figure_per_call(return_df):
+    """Every call returns its own figure, which pyplot doesn't track."""
+    params = {"columns": ["Adjusted Portfolio Returns", "Portfolio Returns"]}
+    figures = plt.get_fignums()
+    first = plot_performance_metrics(return_df, params)
+    second = plot_performance_metrics(return_df, {**params, "cumulative": True})
+    assert first is not second
+    assert plt.get_fignums() == figures
+    for figure in [first, second]:
+        assert len(figure.axes) == 2
+        assert len(figure.axes[0].lines) == 2
+    assert first.axes[0].get_ylabel() == "Returns"
+
+    single_panel = plot_performance_metrics(return_df, {**params, "drawdown": False})
+    assert len(single_panel.axes) == 1
+
+
+def test_plot_performance_metrics_invalid_columns(return_df):
+    with pytest.raises(ValueError, match="Invalid column names"):
+        plot_performance_metrics(return_df, {"columns": ["Unknown"]})
+
+
+@pytest.mark.parametrize(
+    ("n_points", "n_out"), [(20000, 500), (5000, 200), (2520, 2000), (1500, 500)]
+)
+@pytest.mark.parametrize("seed", range(20))
+def test_downsample_indices_keeps_the_extremes(n_points, n_out, seed):
+    """Reduced lines keep their ends, their peak and their deepest drawdown."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(scale=0.01, size=n_points)
+    growth = np.cumprod(1 + returns)
+    drawdowns = growth / np.maximum.accumulate(growth) - 1
+    x = np.arange(n_points, dtype=float)
+
+    for y in [returns, growth, drawdowns]:
+        points = downsample_indices(x, y, n_out)
+
+        assert n_out - 2 <= len(points) <= n_out
+        assert (np.diff(points) > 0).all()
+        assert points[0] == 0
+        assert points[-1] == n_points - 1
+        assert y.max() == y[points].max()
+        assert y.min() == y[points].min()
+
+
+def test_downsample_indices_short_and_missing_values():
+    """Short lines are kept and missing values are dropped."""
+    y = np.cumsum(np.random.default_rng(0).normal(size=100))
+    x = np.arange(len(y), dtype=float)
+    np.testing.assert_array_equal(downsample_indices(x, y, 500), np.arange(100))
+
+    y[[3, 50]] = np.nan
+    np.testing.assert_array_equal(
+        downsample_indices(x, y, 500), np.delete(np.arange(100), [3, 50])
+    )
@@ -0,0 +1,18 @@
+"""Tests for the running state dataset."""
+
+from common.datasets import RunningStateDataset
+
+
+def test_load_before_the_first_save(tmp_path):
+    """A missing state file loads as an empty state."""
+    dataset = RunningStateDataset(filepath=str(tmp_path / "state.pkl"))
+    assert not dataset.exists()
+    assert dataset.load() == {}
+
+
+def test_round_trip(tmp_path):
+    """A saved state is loaded by a dataset on the same file."""
+    filepath = str(tmp_path / "nested" / "state.pkl")
+    state = {"last_date": "2024-06-05T00:00:00", "cumulative": 1.02}
+    RunningStateDataset(filepath=filepath).save(state)
+    assert RunningStateDataset(filepath=filepath).load() == state
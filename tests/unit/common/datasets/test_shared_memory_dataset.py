@@ -0,0 +1,119 @@
+"""Tests for the shared memory dataset."""
+
+import mmap
+import pickle
+
+import numpy as np
+import pandas as pd
+import pytest
+from kedro.io import DataCatalog
+from kedro.pipeline import node, pipeline
+from kedro.runner import ParallelRunner
+
+from common.datasets import SharedMemoryDataset, cleanup_shared_memory
+from registry.hooks import SharedMemoryHooks
+
+
+@pytest.fixture
+def price_data() -> pd.DataFrame:
+    return pd.DataFrame(
+        {
+            "stock_ticker": ["AAA", "BBB", "AAA", "BBB"],
+            "date": pd.to_datetime(["2024-01-02"] * 2 + ["2024-01-03"] * 2),
+            "adj_close": [10.0, 20.0, 11.0, 19.0],
+            "volume": [100, 200, 110, 190],
+            "sector": pd.Categorical(["tech", "energy", "tech", "energy"]),
+        },
+        index=pd.Index([3, 3, 7, 8], name="row"),
+    )
+
+
+@pytest.fixture
+def dataset(tmp_path):
+    dataset = SharedMemoryDataset(shm_dir=tmp_path)
+    yield dataset
+    dataset.release()
+
+
+def _total_volume(price_data):
+    return float(price_data["volume"].sum())
+
+
+def _double(price_data):
+    return price_data.assign(adj_close=price_data["adj_close"] * 2)
+
+
+def test_round_trip(dataset, price_data):
+    """DataFrames, Series, arrays and other objects are restored."""
+    dataset.save(price_data)
+    pd.testing.assert_frame_equal(dataset.load(), price_data)
+
+    dataset.save(price_data["adj_close"])
+    pd.testing.assert_series_equal(dataset.load(), price_data["adj_close"])
+
+    dataset.save(np.arange(6.0).reshape(2, 3))
+    np.testing.assert_array_equal(dataset.load(), np.arange(6.0).reshape(2, 3))
+
+    dataset.save({"cutoffs": ["2023-01-06"]})
+    assert dataset.load() == {"cutoffs": ["2023-01-06"]}
+
+
+def _is_memory_mapped(array):
+    while array is not None and not isinstance(array, mmap.mmap):
+        array = getattr(array, "base", None)
+    return array is not None
+
+
+def test_loads_map_the_files(dataset, price_data):
+    """The numeric and datetime columns are read-only maps of the shared files."""
+    dataset.save(price_data)
+    loaded = dataset.load()
+
+    for column in ["date", "adj_close", "volume"]:
+        assert _is_memory_mapped(loaded[column].to_numpy())
+        assert not loaded[column].to_numpy().flags.writeable
+    assert not _is_memory_mapped(loaded["stock_ticker"].to_numpy())
+
+
+def test_pickled_copy_loads_without_owning(dataset, price_data, tmp_path):
+    """Workers receive a handle to the same data, only the creator cleans up."""
+    dataset.save(price_data)
+    copy = pickle.loads(pickle.dumps(dataset))
+
+    pd.testing.assert_frame_equal(copy.load(), price_data)
+    cleanup_shared_memory()
+    assert not dataset.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_release_removes_data(dataset, price_data, tmp_path):
+    dataset.save(price_data)
+    dataset.save(price_data)
+    assert len(list(tmp_path.glob("*/*"))) == 2
+
+    dataset.release()
+    assert not dataset.exists()
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_parallel_runner_workers_map_the_data(tmp_path, price_data):
+    """Nodes in worker processes load the shared data, the hooks clean up."""
+    catalog = DataCatalog(
+        {
+            "price_data": SharedMemoryDataset(shm_dir=tmp_path),
+            "doubled": SharedMemoryDataset(shm_dir=tmp_path),
+        }
+    )
+    catalog.save("price_data", price_data)
+    pipe = pipeline(
+        [
+            node(_double, "price_data", "doubled", name="double"),
+            node(_total_volume, "price_data", "total_volume", name="total_volume"),
+        ]
+    )
+    outputs = ParallelRunner(max_workers=2).run(pipe, catalog)
+
+    assert outputs["total_volume"] == 600.0
+    assert catalog.load("doubled")["adj_close"].tolist() == [20.0, 40.0, 22.0, 38.0]
+    SharedMemoryHooks().after_pipeline_run()
+    assert list(tmp_path.iterdir()) == []
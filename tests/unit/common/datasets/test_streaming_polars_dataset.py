@@ -0,0 +1,54 @@
+"""Tests for the streaming Polars dataset."""
+
+import pandas as pd
+import polars as pl
+import pytest
+from kedro.io import DatasetError
+
+from common.datasets import StreamingCSVDataset, StreamingPolarsDataset
+
+
+@pytest.mark.parametrize("suffix", [".csv", ".parquet"])
+def test_round_trip(tmp_path, suffix):
+    """Lazy queries and DataFrames are written and scanned lazily."""
+    dataset = StreamingPolarsDataset(tmp_path / "nested" / f"prices{suffix}")
+    assert not dataset.exists()
+
+    prices = pl.DataFrame({"stock_ticker": ["AAA", "BBB"], "close": [1.5, 2.5]})
+    dataset.save(prices.lazy().with_columns(pl.col("close") * 2))
+    assert dataset.exists()
+    loaded = dataset.load()
+    assert isinstance(loaded, pl.LazyFrame)
+    assert loaded.collect().equals(prices.with_columns(pl.col("close") * 2))
+
+    dataset.save(prices)
+    assert dataset.load().collect().equals(prices)
+
+
+def test_load_and_save_args(tmp_path):
+    """The arguments are passed to the scan and the sink."""
+    filepath = tmp_path / "prices.csv"
+    StreamingPolarsDataset(filepath, save_args={"separator": ";"}).save(
+        pl.DataFrame({"stock_ticker": ["AAA"], "close": [1.5]})
+    )
+    assert filepath.read_text() == "stock_ticker;close\nAAA;1.5\n"
+
+    dataset = StreamingPolarsDataset(filepath, load_args={"separator": ";"})
+    assert dataset.load().collect()["close"].to_list() == [1.5]
+    assert "load_args={'separator': ;}" in str(dataset)
+
+
+def test_invalid_file_format(tmp_path):
+    with pytest.raises(DatasetError, match="Invalid file format '.json'"):
+        StreamingPolarsDataset(tmp_path / "prices.json")
+
+
+def test_csv_dataset_writes_pandas_and_polars(tmp_path):
+    """The pandas CSV dataset also sinks Polars queries and loads pandas."""
+    prices = pd.DataFrame({"stock_ticker": ["AAA", "BBB"], "close": [1.5, 2.5]})
+    dataset = StreamingCSVDataset(filepath=str(tmp_path / "nested" / "prices.csv"))
+
+    dataset.save(pl.from_dict(prices.to_dict("list")).lazy())
+    pd.testing.assert_frame_equal(dataset.load(), prices)
+    dataset.save(prices.assign(close=prices["close"] * 2))
+    assert dataset.load()["close"].tolist() == [3.0, 5.0]
@@ -0,0 +1,218 @@
+"""Tests for the runner with asynchronous catalog I/O."""
+
+import threading
+import time
+
+import pandas as pd
+import pytest
+from kedro.framework.hooks import hook_impl
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import AbstractDataset, DataCatalog, DatasetError, MemoryDataset
+from kedro.pipeline import node, pipeline
+from kedro.runner import SequentialRunner
+
+from common.runners import AsyncIORunner
+
+DELAY = 0.1
+
+
+class SlowDataset(AbstractDataset):
+    """In-memory dataset whose loads and saves take `DELAY` seconds."""
+
+    lock = threading.Lock()
+    active_saves = 0
+    max_active_saves = 0
+
+    def __init__(self, data=None, fail_save=False):
+        self._data = data
+        self._fail_save = fail_save
+        self.saves = []
+
+    def _load(self):
+        time.sleep(DELAY)
+        return self._data
+
+    def _save(self, data):
+        with self.lock:
+            SlowDataset.active_saves += 1
+            SlowDataset.max_active_saves = max(
+                SlowDataset.max_active_saves, SlowDataset.active_saves
+            )
+        time.sleep(DELAY)
+        with self.lock:
+            SlowDataset.active_saves -= 1
+        if self._fail_save:
+            raise OSError("disk full")
+        self._data = data
+        self.saves.append((threading.current_thread().name, data))
+
+    def _exists(self):
+        return self._data is not None
+
+    def _describe(self):
+        return {}
+
+
+def _compute(data):
+    time.sleep(DELAY)
+    return data * 2
+
+
+def _add(left, right):
+    return left + right
+
+
+def _fail(data):
+    raise RuntimeError("node failed")
+
+
+def _chunks(data):
+    for value in range(3):
+        yield data + value
+
+
+def _slow_pipeline():
+    """Three independent branches, each a slow load, compute and save."""
+    return pipeline(
+        [node(_compute, f"raw_{i}", f"computed_{i}", name=f"compute_{i}") for i in range(3)]
+    )
+
+
+def _slow_catalog():
+    return DataCatalog(
+        {
+            **{f"raw_{i}": SlowDataset(pd.Series([i, i + 1])) for i in range(3)},
+            **{f"computed_{i}": SlowDataset() for i in range(3)},
+        }
+    )
+
+
+def test_results_match_sequential_runner():
+    pipe = pipeline(
+        [
+            node(_compute, "a", "b", name="double"),
+            node(_add, ["a", "b"], "c", name="add"),
+            node(_add, ["b", "c"], "d", name="add_again"),
+        ]
+    )
+    data = pd.DataFrame({"x": [1.0, 2.0]})
+    expected = SequentialRunner().run(pipe, DataCatalog({"a": MemoryDataset(data)}))
+    result = AsyncIORunner().run(pipe, DataCatalog({"a": MemoryDataset(data)}))
+
+    assert result.keys() == expected.keys() == {"d"}
+    pd.testing.assert_frame_equal(result["d"], expected["d"])
+
+
+def test_io_overlaps_compute():
+    """The loads and saves of the other branches run while a node computes."""
+    start = time.perf_counter()
+    SequentialRunner().run(_slow_pipeline(), _slow_catalog())
+    sequential = time.perf_counter() - start
+
+    catalog = _slow_catalog()
+    start = time.perf_counter()
+    AsyncIORunner().run(_slow_pipeline(), catalog)
+    overlapped = time.perf_counter() - start
+
+    assert sequential >= 9 * DELAY
+    assert overlapped < sequential - 3 * DELAY
+    for i in range(3):
+        ((thread, data),) = catalog._get_dataset(f"computed_{i}").saves
+        assert thread.startswith("kedro-io")
+        assert data.tolist() == [2 * i, 2 * i + 2]
+
+
+@pytest.mark.parametrize("max_pending_saves", [1, 2])
+def test_back_pressure_limits_pending_saves(max_pending_saves):
+    """Nodes wait for a save to finish instead of exceeding the limit."""
+    pipe = pipeline(
+        [node(lambda data: data, f"raw_{i}", f"computed_{i}") for i in range(3)]
+    )
+    catalog = _slow_catalog()
+    SlowDataset.max_active_saves = 0
+    AsyncIORunner(max_pending_saves=max_pending_saves).run(pipe, catalog)
+
+    assert SlowDataset.max_active_saves == max_pending_saves
+    for i in range(3):
+        assert len(catalog._get_dataset(f"computed_{i}").saves) == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError, match="prefetched nodes"):
+        AsyncIORunner(prefetch_nodes=-1)
+    with pytest.raises(ValueError, match="pending saves"):
+        AsyncIORunner(max_pending_saves=0)
+
+
+def test_node_failure_completes_earlier_saves():
+    pipe = pipeline(
+        [
+            node(_compute, "raw_0", "computed_0", name="compute_0"),
+            node(_fail, "computed_0", "failed", name="fail"),
+            node(_compute, "raw_1", "computed_1", name="compute_1"),
+        ]
+    )
+    catalog = _slow_catalog()
+    with pytest.raises(RuntimeError, match="node failed"):
+        AsyncIORunner().run(pipe, catalog)
+
+    assert len(catalog._get_dataset("computed_0").saves) == 1
+
+
+def test_save_failure_stops_the_run():
+    pipe = pipeline(
+        [
+            node(_compute, "raw_0", "computed_0", name="compute_0"),
+            node(_compute, "computed_0", "computed_1", name="compute_1"),
+            node(_compute, "computed_1", "computed_2", name="compute_2"),
+        ]
+    )
+    catalog = _slow_catalog()
+    catalog.add("computed_0", SlowDataset(fail_save=True), replace=True)
+    with pytest.raises(DatasetError, match="disk full"):
+        AsyncIORunner().run(pipe, catalog)
+
+    assert catalog._get_dataset("computed_1").saves == []
+    assert catalog._get_dataset("computed_2").saves == []
+
+
+class _RecordingHooks:
+    def __init__(self):
+        self.events = []
+
+    @hook_impl
+    def before_node_run(self, node):
+        self.events.append(("node", node.name, threading.current_thread().name))
+
+    @hook_impl
+    def after_dataset_saved(self, dataset_name):
+        self.events.append(("saved", dataset_name, threading.current_thread().name))
+
+
+def test_hooks_and_generator_nodes():
+    """Node hooks run in the main thread, chunks of generators are saved in order."""
+    pipe = pipeline(
+        [
+            node(_compute, "a", "b", name="double"),
+            node(_chunks, "b", "c", name="chunks"),
+        ]
+    )
+    hooks = _RecordingHooks()
+    hook_manager = _create_hook_manager()
+    hook_manager.register(hooks)
+    catalog = DataCatalog({"a": MemoryDataset(1), "c": SlowDataset()})
+    AsyncIORunner().run(pipe, catalog, hook_manager)
+
+    main = threading.current_thread().name
+    assert [event for event in hooks.events if event[0] == "node"] == [
+        ("node", "double", main),
+        ("node", "chunks", main),
+    ]
+    assert ("saved", "b", main) not in hooks.events
+    assert [event[1] for event in hooks.events if event[0] == "saved"] == [
+        "b",
+        "c",
+        "c",
+        "c",
+    ]
+    assert [data for _, data in catalog._get_dataset("c").saves] == [2, 3, 4]
@@ -0,0 +1,16 @@
+"""Conftest"""
+
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def signals_first() -> pd.DataFrame:
+    dates = pd.Index(["2023-01-09", "2023-01-10"], name="timestamp")
+    return pd.DataFrame({"AAPL": [1, 1], "MSFT": [-1, -1]}, index=dates)
+
+
+@pytest.fixture
+def signals_second() -> pd.DataFrame:
+    dates = pd.Index(["2023-01-16", "2023-01-17"], name="timestamp")
+    return pd.DataFrame({"MSFT": [1, 1], "GOOGL": [-1, -1]}, index=dates)
@@ -0,0 +1,143 @@
+"""Test for the combine datasets functions."""
+
+import functools
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.utilities.combine_datasets.combine_datasets import (
+    concatenate_datasets,
+    create_partition,
+    merge_datasets,
+    stream_concatenate_datasets,
+)
+
+
+def _legacy_merge_datasets(**kwargs):
+    merge_keys = kwargs["params"]
+    dfs_list = [
+        df.rename(columns={col: f"{key}_{col}" for col in df.columns if col not in merge_keys})
+        for key, df in kwargs.items()
+        if key != "params"
+    ]
+    return functools.reduce(lambda df1, df2: pd.merge(df1, df2, on=merge_keys), dfs_list)
+
+
+def _predictions(n_variants, seed=0):
+    rng = np.random.default_rng(seed)
+    dates = pd.bdate_range("2023-01-02", periods=20).strftime("%Y-%m-%d")
+    variants = {}
+    for i in range(n_variants):
+        # Every variant misses some dates and lists the others unsorted.
+        keep = rng.permutation(len(dates))[: len(dates) - 2]
+        variants[f"variant_{i}"] = pd.DataFrame(
+            {
+                "timestamp": dates[keep],
+                "item_id": "AAPL",
+                "mean": rng.normal(size=len(keep)),
+            }
+        )
+    return variants
+
+
+def test_concatenate_datasets_intersection(signals_first, signals_second):
+    """By default only the shared columns are kept."""
+    result = concatenate_datasets(signals_first, signals_second)
+    assert list(result.columns) == ["timestamp", "MSFT"]
+    assert list(result["MSFT"]) == [-1, -1, 1, 1]
+
+
+def test_concatenate_datasets_union(signals_first, signals_second):
+    """The union policy keeps the tickers of all variants."""
+    result = concatenate_datasets(
+        signals_first, signals_second, column_policy="union"
+    )
+    assert list(result.columns) == ["timestamp", "AAPL", "MSFT", "GOOGL"]
+    assert result["GOOGL"].isna().sum() == 2
+
+
+def test_concatenate_datasets_invalid_policy(signals_first):
+    """Unknown column policies raise a ValueError."""
+    with pytest.raises(ValueError, match="Invalid column policy"):
+        concatenate_datasets(signals_first, column_policy="unknown")
+
+
+def test_stream_concatenate_datasets(signals_first, signals_second):
+    """Streaming gives the same rows as the in-memory concatenation."""
+    partitions = {
+        **create_partition(signals_first, "2023-01-06"),
+        **create_partition(signals_second, "2023-01-13"),
+    }
+    loaded = []
+    lazy_partitions = {
+        key: lambda key=key: loaded.append(key) or partitions[key]
+        for key in partitions
+    }
+
+    result = stream_concatenate_datasets(
+        lazy_partitions, column_policy="union", fill_value=0
+    )
+    loaded.clear()
+    streamed = pd.concat([load() for load in result.values()], ignore_index=True)
+    expected = concatenate_datasets(
+        signals_first, signals_second, column_policy="union"
+    ).fillna(0)
+
+    assert list(result) == ["2023-01-06", "2023-01-13"]
+    assert loaded == ["2023-01-06", "2023-01-13"]
+    pd.testing.assert_frame_equal(streamed, expected, check_dtype=False)
+
+
+def test_stream_concatenate_datasets_partition_ids(signals_first, signals_second):
+    """Partitions that do not belong to the run are ignored."""
+    partitions = {
+        **create_partition(signals_first, "2023-01-06"),
+        **create_partition(signals_second, "stale"),
+    }
+    lazy_partitions = {key: lambda key=key: partitions[key] for key in partitions}
+
+    result = stream_concatenate_datasets(lazy_partitions, partition_ids=["2023-01-06"])
+    assert list(result) == ["2023-01-06"]
+    assert list(result["2023-01-06"]().columns) == ["timestamp", "AAPL", "MSFT"]
+
+
+def test_stream_concatenate_datasets_duplicate_partition_ids(signals_first):
+    """A partition id in several datasets is an error instead of a silent overwrite."""
+    partitioned_dataset = {"2023-01-06": lambda: signals_first.reset_index()}
+
+    with pytest.raises(ValueError, match=r"Duplicate partition ids \['2023-01-06'\]"):
+        stream_concatenate_datasets(partitioned_dataset, dict(partitioned_dataset))
+
+
+@pytest.mark.parametrize("merge_cols", [["timestamp"], ["timestamp", "item_id"]])
+def test_merge_datasets_matches_pairwise_merge(merge_cols):
+    """The multi-way join equals the pairwise merges, sorted by the keys."""
+    variants = _predictions(5)
+    copies = {key: df.copy() for key, df in variants.items()}
+
+    result = merge_datasets(**variants, params=merge_cols)
+    expected = (
+        _legacy_merge_datasets(**copies, params=merge_cols)
+        .sort_values(merge_cols, ignore_index=True)
+    )
+
+    pd.testing.assert_frame_equal(result, expected)
+    assert list(result.columns[: len(merge_cols)]) == merge_cols
+    assert result["timestamp"].is_monotonic_increasing
+    for key, df in variants.items():
+        pd.testing.assert_frame_equal(df, copies[key])
+
+
+def test_merge_datasets_duplicate_keys():
+    """Rows with the same keys are combined like with `pd.merge`."""
+    first = pd.DataFrame({"timestamp": ["a", "a", "b"], "mean": [1, 2, 3]})
+    second = pd.DataFrame({"timestamp": ["b", "a"], "mean": [4, 5]})
+
+    result = merge_datasets(first=first, second=second, params=["timestamp"])
+
+    assert result.to_dict("list") == {
+        "timestamp": ["a", "a", "b"],
+        "first_mean": [1, 2, 3],
+        "second_mean": [5, 5, 4],
+    }
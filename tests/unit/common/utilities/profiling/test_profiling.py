@@ -0,0 +1,45 @@
+"""Tests for the sampling profiler."""
+
+import time
+from collections import Counter
+
+from common.utilities.profiling import StackSampler, write_profile
+
+
+def _busy(seconds):
+    end = time.perf_counter() + seconds
+    total = 0
+    while time.perf_counter() < end:
+        total += sum(range(100))
+    return total
+
+
+def _profiled_call():
+    return _busy(0.2)
+
+
+def test_sampler_keeps_the_callees_of_the_root():
+    """Only the frames below the root frame are sampled."""
+    sampler = StackSampler(_profiled_call.__code__, interval=0.001)
+    with sampler:
+        _profiled_call()
+
+    assert sum(sampler.stacks.values()) > 10
+    for stack in sampler.stacks:
+        assert stack[0].startswith("_busy (profiling/test_profiling.py:")
+
+
+def test_write_profile(tmp_path):
+    stacks = Counter({("main", "load"): 3, ("main", "fit", "loss"): 6, ("main",): 1})
+    collapsed, top = write_profile(stacks, tmp_path / "node.name", top=2)
+
+    assert collapsed.name == "node.name.collapsed"
+    assert collapsed.read_text().splitlines() == [
+        "main;load 3",
+        "main;fit;loss 6",
+        "main 1",
+    ]
+    lines = top.read_text().splitlines()
+    assert lines[0] == "10 samples"
+    assert lines[2].split() == ["60.0", "60.0", "loss"]
+    assert lines[3].split() == ["30.0", "30.0", "load"]
@@ -0,0 +1,95 @@
+"""Tests for the telemetry functions."""
+
+import json
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from common.utilities.telemetry import (
+    data_size,
+    pop_phase_seconds,
+    read_events,
+    summarize_slowest_nodes,
+    summarize_trends,
+    timed,
+)
+
+
+@pytest.fixture
+def events_path(tmp_path):
+    durations = {
+        "run_1": {"load": 1.0, "train": 10.0, "select": 2.0},
+        "run_2": {"load": 1.2, "train": 11.0, "select": 2.0},
+        "run_3": {"load": 1.1, "train": 10.5, "select": 6.0},
+    }
+    path = tmp_path / "telemetry.jsonl"
+    with path.open("w") as file:
+        for run_id, nodes in durations.items():
+            for node, duration in nodes.items():
+                event = {
+                    "run_id": run_id,
+                    "event": "node",
+                    "node": node,
+                    "start": "2024-01-01T00:00:00+00:00",
+                    "duration_s": duration,
+                    "rows_in": 100 if run_id != "run_3" else 300,
+                    "rows_out": 10,
+                    "peak_rss_mb": 50.0,
+                    "rss_increase_mb": 1.0,
+                    "phases": {"model_fit": 9.0} if node == "train" else {},
+                    "cache": "miss",
+                    "status": "success",
+                }
+                file.write(json.dumps(event) + "\n")
+            file.write(json.dumps({"run_id": run_id, "event": "pipeline"}) + "\n")
+        file.write('{"run_id": "run_4", "event": "no')
+    return path
+
+
+def test_timed_adds_up_phases():
+    pop_phase_seconds()
+    with timed("model_fit"):
+        pass
+    with timed("model_fit"):
+        pass
+    phases = pop_phase_seconds()
+
+    assert list(phases) == ["model_fit"]
+    assert phases["model_fit"] >= 0
+    assert pop_phase_seconds() == {}
+
+
+def test_data_size():
+    frame = pd.DataFrame({"a": np.arange(4.0), "b": np.arange(4)})
+    assert data_size(frame) == (4, frame.memory_usage().sum())
+    assert data_size({"x": frame, "y": np.zeros(3)}) == (
+        7,
+        frame.memory_usage().sum() + 24,
+    )
+    assert data_size("text") == (0, 0)
+
+
+def test_summarize_slowest_nodes(events_path):
+    """The nodes of the latest complete run are ranked by duration."""
+    events = read_events(events_path)
+    summary = summarize_slowest_nodes(events, top=2)
+
+    assert summary["node"].tolist() == ["train", "select"]
+    assert summary["model_fit_s"].iloc[0] == 9.0
+    assert summary["share"].iloc[0] == pytest.approx(10.5 / 17.6)
+    assert summarize_slowest_nodes(events, run_id="run_1")["duration_s"].iloc[0] == 10
+
+
+def test_summarize_trends(events_path):
+    """The node that slowed down the most comes first."""
+    trends = summarize_trends(read_events(events_path), last_runs=3)
+
+    assert trends["node"].iloc[0] == "select"
+    assert trends["slowdown"].iloc[0] == pytest.approx(3.0)
+    assert trends["rows_growth"].iloc[0] == pytest.approx(3.0)
+    assert trends.filter(like="run_").columns.tolist() == [
+        "run_0_s",
+        "run_1_s",
+        "run_2_s",
+    ]
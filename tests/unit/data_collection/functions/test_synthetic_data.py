@@ -0,0 +1,104 @@
+"""Test for the synthetic price data."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from data_collection.functions import generate_price_data
+from feature_engineering.functions import create_features
+from ml_technique_stock_price.functions.data_filtering import (
+    create_ticker_date_index,
+    filter_data,
+)
+
+COLUMNS = ["date", "stock_ticker", "adj_close", "close", "high", "low", "open", "volume"]
+PARAMS = {
+    "n_tickers": 50,
+    "n_days": 300,
+    "seed": 1,
+    "missing_bar_rate": 0.01,
+    "ipo_rate": 0.2,
+    "delisting_rate": 0.2,
+    "split_rate": 0.2,
+    "dividend_yield": 0.02,
+}
+
+
+@pytest.fixture(scope="module")
+def price_data() -> pd.DataFrame:
+    return generate_price_data(PARAMS)
+
+
+def test_schema_and_determinism(price_data):
+    assert list(price_data.columns) == COLUMNS
+    assert price_data["date"].iloc[0] == "2010-01-04"
+    assert price_data["stock_ticker"].nunique() == 50
+    assert not price_data.duplicated(["date", "stock_ticker"]).any()
+    assert price_data.equals(
+        price_data.sort_values(["date", "stock_ticker"], ignore_index=True)
+    )
+    pd.testing.assert_frame_equal(generate_price_data(PARAMS), price_data)
+    assert not generate_price_data({**PARAMS, "seed": 2}).equals(price_data)
+
+
+def test_price_relations(price_data):
+    assert (price_data["high"] >= price_data[["open", "close"]].max(axis=1)).all()
+    assert (price_data["low"] <= price_data[["open", "close"]].min(axis=1)).all()
+    assert (price_data["low"] > 0).all()
+    assert (price_data["volume"] > 0).all()
+    # Dividends discount the adjusted prices of earlier dates.
+    assert (price_data["adj_close"] <= price_data["close"] + 1e-9).all()
+
+
+def test_gaps_and_corporate_actions(price_data):
+    n_rows = generate_price_data({"n_tickers": 50, "n_days": 300, "seed": 1}).shape[0]
+    assert len(price_data) < n_rows == 50 * 300
+
+    dates = price_data.groupby("stock_ticker")["date"].agg(["min", "max"])
+    assert (dates["min"] > "2010-01-04").any()
+    assert (dates["max"] < price_data["date"].max()).any()
+
+    by_ticker = price_data.sort_values(["stock_ticker", "date"]).groupby(
+        "stock_ticker"
+    )
+    close_jump = by_ticker["close"].apply(lambda close: close.pct_change().min())
+    adj_close_jump = by_ticker["adj_close"].apply(lambda close: close.pct_change().min())
+    # Splits halve or third the unadjusted prices, the adjusted prices stay smooth.
+    assert (close_jump < -0.5).any()
+    assert adj_close_jump.min() > -0.5
+
+
+@pytest.mark.parametrize(
+    ("params", "match"),
+    [
+        ({"n_tickers": 0, "n_days": 10}, "Invalid size"),
+        ({"n_tickers": 2, "n_days": 10, "missing_bar_rate": 1.5}, "missing_bar_rate"),
+    ],
+)
+def test_invalid_parameters(params, match):
+    with pytest.raises(ValueError, match=match):
+        generate_price_data(params)
+
+
+def test_downstream_functions_run_on_synthetic_data(price_data):
+    """The feature engineering and the cutoff filter accept the synthetic data."""
+    features = create_features(
+        price_data,
+        [{"new_column": "high_minus_low", "formula": "high - low"}],
+        [
+            {
+                "aggregation_type": "mean",
+                "aggregation_lengths": [7],
+                "aggregation_columns": ["adj_close"],
+            }
+        ],
+        {"shift_period": 1},
+        {"columns": ["close"]},
+    )
+    assert len(features) == len(price_data)
+    assert np.isfinite(features["log_return_close"].dropna()).all()
+
+    sorted_features, ticker_date_index = create_ticker_date_index(features)
+    filtered = filter_data(sorted_features, "2010-06-30", ticker_date_index)
+    assert filtered["date"].max() <= pd.Timestamp("2010-06-30")
+    assert filtered["stock_ticker"].nunique() < 50
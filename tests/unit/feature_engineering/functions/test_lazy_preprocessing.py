@@ -0,0 +1,181 @@
+"""Test for the out-of-core feature engineering with Polars."""
+
+from pathlib import Path
+
+import pandas as pd
+import polars as pl
+import pytest
+import yaml
+from kedro.io import DataCatalog
+from kedro.runner import SequentialRunner
+from kedro_datasets.pandas import CSVDataset
+from kedro_datasets.partitions import PartitionedDataset
+
+from common.datasets import StreamingCSVDataset, StreamingPolarsDataset
+from data_collection.functions import generate_price_data
+from feature_engineering.functions import (
+    check_lazy_feature_params,
+    create_features,
+    create_features_lazy,
+    partition_by_ticker,
+)
+from feature_engineering.pipelines import create_pipeline
+
+ARITHMETIC = [
+    {"new_column": "high_minus_low", "formula": "high - low"},
+    {"new_column": "close_minus_open", "formula": "close - open"},
+]
+AGGREGATION = [
+    {
+        "aggregation_type": "mean",
+        "aggregation_lengths": [2, 7],
+        "aggregation_columns": ["adj_close"],
+    },
+    {
+        "aggregation_type": "std",
+        "aggregation_lengths": [3],
+        "aggregation_columns": ["adj_close", "volume"],
+    },
+]
+LOG_RETURNS = {"columns": ["close", "adj_close"]}
+PARAMETERS_PATH = (
+    Path(__file__).parents[4] / "conf/base/parameters/feature_engineering.yml"
+)
+
+
+@pytest.fixture(scope="module")
+def price_data() -> pd.DataFrame:
+    """Price data with missing bars, IPOs and delistings, sorted by date."""
+    return generate_price_data(
+        {
+            "n_tickers": 12,
+            "n_days": 60,
+            "seed": 3,
+            "missing_bar_rate": 0.05,
+            "ipo_rate": 0.3,
+            "delisting_rate": 0.3,
+        }
+    )
+
+
+def _to_pandas(frame) -> pd.DataFrame:
+    return pd.DataFrame({name: frame[name].to_numpy() for name in frame.columns})
+
+
+@pytest.mark.parametrize("shift_period", [1, 2, -1])
+def test_create_features_lazy_matches_pandas(price_data, shift_period):
+    """The lazy query computes the same columns as the pandas transform."""
+    params = (ARITHMETIC, AGGREGATION, {"shift_period": shift_period}, LOG_RETURNS)
+    expected = create_features(price_data, *params)
+
+    lazy_price_data = pl.from_dict(price_data.to_dict("list")).lazy()
+    query = create_features_lazy(lazy_price_data, *params)
+    assert isinstance(query, pl.LazyFrame)
+    pd.testing.assert_frame_equal(
+        _to_pandas(query.collect()), expected, check_exact=False, rtol=1e-9
+    )
+
+
+def test_partition_by_ticker(price_data):
+    """The partitions hold whole tickers and are sorted by ticker."""
+    lazy_price_data = pl.from_dict(price_data.to_dict("list")).lazy()
+    partitions = partition_by_ticker(lazy_price_data, {"n_partitions": 5})
+
+    assert list(partitions) == [f"part_{i:04d}" for i in range(4)]
+    tickers = [
+        partitions[key]().collect()["stock_ticker"].unique().sort().to_list()
+        for key in partitions
+    ]
+    assert [len(partition) for partition in tickers] == [3, 3, 3, 3]
+    assert sum(tickers, []) == sorted(price_data["stock_ticker"].unique())
+
+    assert len(partition_by_ticker(lazy_price_data, {"n_partitions": 100})) == 12
+    with pytest.raises(ValueError, match="Invalid number of partitions 0"):
+        partition_by_ticker(lazy_price_data, {"n_partitions": 0})
+
+
+def test_polars_pipeline_matches_pandas_pipeline(price_data, tmp_path):
+    """Both backends write the same "price_w_features" file."""
+    parameters = {
+        "arithmetic": ARITHMETIC,
+        "aggregation": AGGREGATION,
+        "shift": {"shift_period": 1},
+        "log_returns": LOG_RETURNS,
+        "feature_backend": {"n_partitions": 4},
+    }
+    CSVDataset(filepath=str(tmp_path / "price_data.csv")).save(price_data)
+
+    outputs = {}
+    for backend in ["pandas", "polars"]:
+        output_path = str(tmp_path / backend / "price_w_features.csv")
+        catalog = DataCatalog(
+            {
+                "price_data": CSVDataset(filepath=str(tmp_path / "price_data.csv")),
+                "price_w_features": StreamingCSVDataset(filepath=output_path),
+                "price_data_lazy": StreamingPolarsDataset(
+                    tmp_path / "price_data.csv"
+                ),
+                "price_data_partitioned": PartitionedDataset(
+                    path=str(tmp_path / backend / "price_data_partitioned"),
+                    dataset=StreamingPolarsDataset,
+                    filename_suffix=".parquet",
+                ),
+                "price_w_features_partitioned": PartitionedDataset(
+                    path=str(tmp_path / backend / "price_w_features_partitioned"),
+                    dataset=StreamingPolarsDataset,
+                    filename_suffix=".parquet",
+                ),
+            }
+        )
+        catalog.add_feed_dict(
+            {f"params:{name}": value for name, value in parameters.items()}
+        )
+        SequentialRunner().run(create_pipeline(backend=backend), catalog)
+        outputs[backend] = catalog.load("price_w_features")
+
+    assert len(list((tmp_path / "polars/price_data_partitioned").iterdir())) == 4
+    pd.testing.assert_frame_equal(
+        outputs["polars"], outputs["pandas"], check_exact=False, rtol=1e-9
+    )
+
+
+def test_feature_backend_parameters():
+    """The default backend is pandas and unknown backends are rejected."""
+    feature_backend = yaml.safe_load(PARAMETERS_PATH.read_text())["feature_backend"]
+    assert feature_backend["engine"] == "pandas"
+    assert [node.name for node in create_pipeline().nodes] == ["create_features"]
+
+    with pytest.raises(ValueError, match="Invalid feature backend 'duckdb'"):
+        create_pipeline(backend="duckdb")
+
+
+@pytest.mark.parametrize(
+    ("arithmetic_params", "aggregation_params", "match"),
+    [
+        ([{"new_column": "ratio", "formula": "high / low"}], [], "'high / low'"),
+        ([], [{**AGGREGATION[0], "aggregation_type": "max"}], "'max'"),
+    ],
+)
+def test_unsupported_features_fail_when_the_pipeline_is_built(
+    price_data, arithmetic_params, aggregation_params, match
+):
+    """The Polars backend rejects the features it cannot compute up front."""
+    with pytest.raises(ValueError, match=f"Unsupported .*{match}"):
+        create_pipeline(
+            backend="polars",
+            arithmetic_params=arithmetic_params,
+            aggregation_params=aggregation_params,
+        )
+    with pytest.raises(ValueError, match="Polars feature backend"):
+        create_features_lazy(
+            pl.from_dict(price_data.to_dict("list")).lazy(),
+            arithmetic_params,
+            aggregation_params,
+            {"shift_period": 1},
+            LOG_RETURNS,
+        )
+    check_lazy_feature_params(ARITHMETIC, AGGREGATION)
+    # The pandas backend keeps skipping them.
+    create_pipeline(
+        arithmetic_params=arithmetic_params, aggregation_params=aggregation_params
+    )
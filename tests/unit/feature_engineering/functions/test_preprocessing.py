@@ -0,0 +1,115 @@
+"""Test for the feature preprocessing."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from feature_engineering.functions import (
+    basic_arithmetic,
+    calculate_rolling_aggregations,
+    create_features,
+    log_returns,
+    shift_features,
+)
+
+ARITHMETIC = [
+    {"new_column": "high_minus_low", "formula": "high - low"},
+    {"new_column": "close_minus_open", "formula": "close - open"},
+]
+AGGREGATION = [
+    {
+        "aggregation_type": "mean",
+        "aggregation_lengths": [2, 3],
+        "aggregation_columns": ["adj_close"],
+    },
+    {
+        "aggregation_type": "std",
+        "aggregation_lengths": [3],
+        "aggregation_columns": ["adj_close"],
+    },
+]
+LOG_RETURNS = {"columns": ["close"]}
+
+
+@pytest.fixture
+def price_data() -> pd.DataFrame:
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range(start="2024-01-01", periods=8).strftime("%Y-%m-%d")
+    tickers = ["BBB", "AAA", "CCC"]
+    close = 100 * np.exp(np.cumsum(rng.normal(scale=0.01, size=(8, 3)), axis=0))
+    price_data = pd.DataFrame(
+        {
+            "date": np.repeat(dates, 3),
+            "stock_ticker": np.tile(tickers, 8),
+            "adj_close": close.ravel() * 0.99,
+            "close": close.ravel(),
+            "high": close.ravel() * 1.01,
+            "low": close.ravel() * 0.98,
+            "open": close.ravel() * 1.001,
+        }
+    )
+    # CCC only starts trading on the fourth date.
+    return price_data.drop(index=[2, 5, 8]).reset_index(drop=True)
+
+
+def _reference_features(price_data: pd.DataFrame, shift_period: int) -> pd.DataFrame:
+    features = price_data.sort_values("stock_ticker", kind="stable", ignore_index=True)
+    features["ftr_high_minus_low"] = features["high"] - features["low"]
+    features["ftr_close_minus_open"] = features["close"] - features["open"]
+    grouped = features.groupby("stock_ticker")["adj_close"]
+    for length in [2, 3]:
+        features[f"ftr_adj_close_mean_{length}"] = grouped.transform(
+            lambda series, length=length: series.rolling(length).mean()
+        )
+    features["ftr_adj_close_std_3"] = grouped.transform(
+        lambda series: series.rolling(3).std()
+    )
+    feature_columns = [c for c in features.columns if c.startswith("ftr")]
+    for column in feature_columns:
+        features[f"{column}_shifted_{shift_period}"] = features.groupby(
+            "stock_ticker"
+        )[column].shift(shift_period)
+    features["log_return_close"] = np.log(
+        features["close"] / features.groupby("stock_ticker")["close"].shift(1)
+    )
+    return features
+
+
+@pytest.mark.parametrize("shift_period", [1, 2, -1])
+def test_create_features_matches_steps(price_data, shift_period):
+    """The fused transform equals the chained steps and a groupby reference."""
+    expected = _reference_features(price_data, shift_period)
+    original = price_data.copy()
+
+    fused = create_features(
+        price_data,
+        ARITHMETIC,
+        AGGREGATION,
+        {"shift_period": shift_period},
+        LOG_RETURNS,
+    )
+    chained = log_returns(
+        shift_features(
+            calculate_rolling_aggregations(
+                basic_arithmetic(price_data, ARITHMETIC), AGGREGATION
+            ),
+            {"shift_period": shift_period},
+        ),
+        LOG_RETURNS,
+    )
+
+    pd.testing.assert_frame_equal(fused, expected)
+    pd.testing.assert_frame_equal(chained, expected)
+    pd.testing.assert_frame_equal(price_data, original)
+
+
+def test_log_returns_keeps_row_order(price_data):
+    result = log_returns(price_data, LOG_RETURNS)
+
+    assert result.index.equals(price_data.index)
+    aaa = result[result["stock_ticker"] == "AAA"]
+    np.testing.assert_allclose(
+        aaa["log_return_close"].iloc[1:],
+        np.diff(np.log(aaa["close"])),
+    )
+    assert np.isnan(aaa["log_return_close"].iloc[0])
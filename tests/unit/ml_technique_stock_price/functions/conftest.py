@@ -0,0 +1,36 @@
+"""Conftest"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def predictions() -> pd.DataFrame:
+    timestamps = pd.bdate_range(start="2024-06-03", periods=5)
+    tickers = [f"TICKER_{i:02d}" for i in range(20)]
+    rng = np.random.default_rng(0)
+    return pd.DataFrame(
+        {
+            "item_id": np.repeat(tickers, len(timestamps)),
+            "mean": rng.normal(scale=0.01, size=len(tickers) * len(timestamps)),
+            "timestamp": np.tile(timestamps, len(tickers)),
+        }
+    )
+
+
+@pytest.fixture
+def params_stock_price() -> dict[str, str]:
+    return {"cutoff_percentile": 0.1}
+
+
+@pytest.fixture
+def price_w_features() -> pd.DataFrame:
+    dates = pd.bdate_range(start="2023-01-02", periods=10).strftime("%Y-%m-%d")
+    frames = [
+        pd.DataFrame({"date": dates, "stock_ticker": "AAA", "close": range(10)}),
+        pd.DataFrame({"date": dates[:4], "stock_ticker": "BBB", "close": range(4)}),
+        pd.DataFrame({"date": dates[3:], "stock_ticker": "CCC", "close": range(7)}),
+    ]
+    # Interleave the tickers like the collected data, which is sorted by date.
+    return pd.concat(frames).sort_values(["date", "stock_ticker"], ignore_index=True)
@@ -0,0 +1,60 @@
+"""Test for the data filtering functions."""
+
+import pandas as pd
+import pytest
+
+from ml_technique_stock_price.functions.data_filtering import (
+    create_ticker_date_index,
+    filter_data,
+)
+
+
+def _legacy_filter_data(unfiltered_df, cutoff_date):
+    cutoff_date = pd.to_datetime(cutoff_date)
+    unfiltered_df = unfiltered_df.assign(date=pd.to_datetime(unfiltered_df["date"]))
+    latest_dates = unfiltered_df.groupby("stock_ticker")["date"].max()
+    valid_stocks = latest_dates[latest_dates >= cutoff_date].index
+    return unfiltered_df[
+        unfiltered_df["stock_ticker"].isin(valid_stocks)
+        & (unfiltered_df["date"] <= cutoff_date)
+    ]
+
+
+def test_create_ticker_date_index(price_w_features):
+    """The index holds the contiguous row range of every ticker."""
+    sorted_df, ticker_date_index = create_ticker_date_index(price_w_features)
+
+    assert list(ticker_date_index["stock_ticker"]) == ["AAA", "BBB", "CCC"]
+    assert list(ticker_date_index["start"]) == [0, 10, 14]
+    assert list(ticker_date_index["stop"]) == [10, 14, 21]
+    pd.testing.assert_frame_equal(
+        sorted_df, sorted_df.sort_values(["stock_ticker", "date"])
+    )
+    assert pd.api.types.is_datetime64_any_dtype(sorted_df["date"])
+    assert price_w_features["date"].dtype == object
+
+
+@pytest.mark.parametrize(
+    "cutoff_date", ["2023-01-01", "2023-01-05", "2023-01-07", "2023-01-13"]
+)
+def test_filter_data_matches_mask(price_w_features, cutoff_date):
+    """Filtering with the index selects the same rows as the boolean masks."""
+    original = price_w_features.copy()
+    sorted_df, ticker_date_index = create_ticker_date_index(price_w_features)
+
+    result = filter_data(sorted_df, cutoff_date, ticker_date_index)
+    expected = _legacy_filter_data(price_w_features, cutoff_date).sort_values(
+        ["stock_ticker", "date"]
+    )
+
+    pd.testing.assert_frame_equal(
+        result.reset_index(drop=True), expected.reset_index(drop=True)
+    )
+    pd.testing.assert_frame_equal(price_w_features, original)
+
+
+def test_filter_data_without_index(price_w_features):
+    """The index is created on the fly if it is not passed."""
+    result = filter_data(price_w_features, "2023-01-05")
+    assert set(result["stock_ticker"]) == {"AAA", "BBB", "CCC"}
+    assert result["date"].max() == pd.Timestamp("2023-01-05")
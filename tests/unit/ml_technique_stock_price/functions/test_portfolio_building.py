@@ -0,0 +1,136 @@
+"""Test for the portfolio building."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_technique_stock_price.functions.portfolio_building import (
+    _RollingMoments,
+    apply_constraints,
+    ledoit_wolf_covariance,
+    portfolio_building,
+)
+
+
+def _reference_ledoit_wolf(returns):
+    n_dates, n_tickers = returns.shape
+    centered = returns - returns.mean(axis=0)
+    covariance = centered.T @ centered / n_dates
+    mu = np.trace(covariance) / n_tickers
+    squared = centered**2
+    beta = (np.sum(squared.T @ squared) / n_dates - np.sum(covariance**2)) / (
+        n_tickers * n_dates
+    )
+    delta = np.sum((covariance - mu * np.eye(n_tickers)) ** 2) / n_tickers
+    shrinkage = min(beta, delta) / delta
+    return (1 - shrinkage) * covariance + shrinkage * mu * np.eye(n_tickers), shrinkage
+
+
+def _returns(n_dates=300, n_tickers=6):
+    rng = np.random.default_rng(0)
+    mixing = rng.normal(size=(n_tickers, n_tickers)) * 0.01
+    return rng.normal(size=(n_dates, n_tickers)) @ mixing
+
+
+def _long_price_data(returns):
+    dates = pd.bdate_range(start="2023-01-02", periods=len(returns) + 1)
+    prices = 100 * np.cumprod(np.vstack([np.ones(returns.shape[1]), 1 + returns]), 0)
+    tickers = [f"TICKER_{i}" for i in range(returns.shape[1])]
+    frame = pd.DataFrame(prices, index=dates, columns=tickers)
+    return frame.rename_axis("date").reset_index().melt(
+        id_vars="date", var_name="stock_ticker", value_name="adj_close"
+    )
+
+
+def test_ledoit_wolf_covariance():
+    returns = _returns()
+    covariance, shrinkage = ledoit_wolf_covariance(returns)
+    expected, expected_shrinkage = _reference_ledoit_wolf(returns)
+    np.testing.assert_allclose(covariance, expected, atol=1e-15)
+    assert shrinkage == pytest.approx(expected_shrinkage)
+    assert 0 < shrinkage < 1
+
+
+def test_rolling_moments_match_fresh_windows():
+    """Moving the window gives the estimate of the window computed from scratch."""
+    returns = _returns()
+    moments = _RollingMoments(returns.shape[1])
+    for start in [0, 5, 6, 40, 39, 150]:
+        moments.move(returns, start, start + 120)
+        covariance, _ = moments.ledoit_wolf()
+        expected, _ = _reference_ledoit_wolf(returns[start : start + 120])
+        np.testing.assert_allclose(covariance, expected, atol=1e-15)
+
+
+def test_apply_constraints():
+    sides = np.array([1, 1, 1, -1, 0])
+    scores = np.array([5.0, 1.0, 1.0, 1.0, 3.0])
+
+    weights = apply_constraints(scores, sides, {"max_position": 0.3})
+    assert np.abs(weights).sum() == pytest.approx(1.0)
+    assert np.abs(weights).max() == pytest.approx(0.3)
+    assert weights[4] == 0
+    assert (np.sign(weights[:4]) == sides[:4]).all()
+
+    neutral = apply_constraints(scores, sides, {"max_net_exposure": 0.0})
+    assert neutral.sum() == pytest.approx(0.0)
+
+
+@pytest.mark.parametrize(
+    "method", ["equal", "inverse_volatility", "risk_parity", "mean_variance"]
+)
+def test_portfolio_building(method):
+    returns = _returns()
+    price_data = _long_price_data(returns)
+    dates = pd.bdate_range(start="2024-06-03", periods=3)
+    signals = pd.DataFrame(
+        [[1, -1, 1, 0, -1, 2]] * 3,
+        index=pd.Index(dates, name="timestamp"),
+        columns=[f"TICKER_{i}" for i in range(6)],
+    )
+
+    weights = portfolio_building(
+        signals, price_data, {"method": method, "gross_exposure": 2.0}
+    )
+
+    assert weights.index.equals(signals.index)
+    assert weights.columns.equals(signals.columns)
+    np.testing.assert_allclose(weights.abs().sum(axis=1), 2.0)
+    assert (weights * signals >= 0).all().all()
+    assert (weights["TICKER_3"] == 0).all()
+    if method == "risk_parity":
+        covariance, _ = ledoit_wolf_covariance(returns[-252:])
+        row = weights.iloc[0].to_numpy()
+        contributions = row * (covariance @ row)
+        np.testing.assert_allclose(contributions[row != 0], contributions[0])
+
+
+def test_portfolio_building_concatenated_signals():
+    """Each date only uses the returns before it and keeps the input layout."""
+    returns = _returns()
+    price_data = _long_price_data(returns)
+    dates = pd.bdate_range(start="2023-01-02", periods=len(returns) + 1)
+    signals = pd.DataFrame(
+        {
+            "timestamp": dates[[10, 200, 201]],
+            "TICKER_0": [1, 1, 1],
+            "TICKER_1": [1, 1, 1],
+        }
+    )
+    weights = portfolio_building(
+        signals,
+        price_data,
+        {"method": "inverse_volatility", "lookback": 60, "shrinkage": False},
+    )
+
+    assert list(weights.columns) == ["timestamp", "TICKER_0", "TICKER_1"]
+    # Too short a history falls back to equal weights.
+    np.testing.assert_allclose(weights.iloc[0, 1:].to_numpy(dtype=float), 0.5)
+    volatility = returns[139:199, :2].std(axis=0)
+    expected = (1 / volatility) / (1 / volatility).sum()
+    np.testing.assert_allclose(weights.iloc[1, 1:].to_numpy(dtype=float), expected)
+
+
+def test_portfolio_building_invalid_method():
+    with pytest.raises(ValueError, match="Invalid portfolio method"):
+        portfolio_building(pd.DataFrame(), pd.DataFrame(), {"method": "unknown"})
@@ -0,0 +1,67 @@
+"""Test for the stock selection functions."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from ml_technique_stock_price.functions.stock_selection import (
+    select_stocks,
+    stock_selection,
+)
+
+
+def _legacy_stock_selection(predictions, cutoff_percentile):
+    predictions = predictions.copy()
+    log_return_sums = predictions.groupby("item_id")["mean"].sum()
+    n_selected = int(len(log_return_sums) * cutoff_percentile)
+    top_performer = log_return_sums.nlargest(n_selected).index
+    lowest_performer = log_return_sums.nsmallest(n_selected).index
+    predictions["indicator"] = 0
+    predictions.loc[predictions["item_id"].isin(top_performer), "indicator"] = 1
+    predictions.loc[predictions["item_id"].isin(lowest_performer), "indicator"] = -1
+    return predictions.pivot_table(
+        index="timestamp", columns="item_id", values="indicator", fill_value=0
+    )
+
+
+def test_stock_selection_matches_pivot(predictions, params_stock_price):
+    """The default mode reproduces the previous isin/pivot_table implementation."""
+    original = predictions.copy()
+    signals = stock_selection(predictions, params_stock_price)
+    expected = _legacy_stock_selection(predictions, 0.1)
+
+    pd.testing.assert_frame_equal(signals, expected, check_dtype=False)
+    pd.testing.assert_frame_equal(predictions, original)
+
+
+def test_stock_selection_missing_rows_are_zero(predictions, params_stock_price):
+    """Ticker/timestamp pairs without a prediction get a zero signal."""
+    signals = stock_selection(predictions.iloc[1:], params_stock_price)
+    assert signals.iloc[0].loc["TICKER_00"] == 0
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        ({"selection_mode": "top_k", "top_k": 2}, [-1, -1, 0, 1, 1]),
+        ({"cutoff_percentile": 0.2, "long_only": True}, [0, 0, 0, 0, 1]),
+        (
+            {"selection_mode": "top_k", "top_k": 1, "weighting": "equal"},
+            [-0.5, 0, 0, 0, 0.5],
+        ),
+        (
+            {"selection_mode": "top_k", "top_k": 2, "weighting": "score"},
+            [-0.25, -0.25, 0, 1 / 6, 1 / 3],
+        ),
+    ],
+)
+def test_select_stocks_modes(params, expected):
+    """Top-k, quantile, long-only and weighted selections."""
+    scores = np.array([-2.0, -2.0, 0.0, 1.0, 2.0])
+    np.testing.assert_allclose(select_stocks(scores, params), expected)
+
+
+def test_select_stocks_invalid_mode():
+    """Unknown selection modes raise a ValueError."""
+    with pytest.raises(ValueError, match="Invalid selection mode"):
+        select_stocks(np.zeros(3), {"selection_mode": "unknown"})
@@ -0,0 +1,50 @@
+"""Tests for the variant functions."""
+
+import pytest
+
+from ml_technique_stock_price.functions.variants import (
+    batch_cutoff_dates,
+    batch_name,
+    create_cutoff_dates,
+)
+
+
+def test_create_cutoff_dates_from_range():
+    """One Friday per week between the start and the end date."""
+    cutoffs = create_cutoff_dates(
+        {"start_date": "2023-01-01", "end_date": "2023-01-31", "freq": "W-FRI"}
+    )
+    assert cutoffs == ["2023-01-06", "2023-01-13", "2023-01-20", "2023-01-27"]
+
+
+def test_create_cutoff_dates_from_list():
+    """Explicit cutoffs are sorted and deduplicated."""
+    cutoffs = create_cutoff_dates({"cutoffs": ["2023-01-13", "2023-01-06", "2023-01-13"]})
+    assert cutoffs == ["2023-01-06", "2023-01-13"]
+
+
+def test_create_cutoff_dates_empty():
+    with pytest.raises(ValueError, match="No cutoff dates"):
+        create_cutoff_dates({"start_date": "2023-01-07", "end_date": "2023-01-08"})
+
+
+@pytest.mark.parametrize("max_batches", [1, 4, 7, 100])
+def test_batch_cutoff_dates(max_batches):
+    """The batches are contiguous, nearly equal and keep every cutoff once."""
+    cutoffs = create_cutoff_dates({"start_date": "2021-01-01", "end_date": "2021-12-31"})
+    batches = batch_cutoff_dates(cutoffs, max_batches)
+
+    assert len(batches) == min(max_batches, len(cutoffs))
+    assert [cutoff for batch in batches for cutoff in batch] == cutoffs
+    assert max(map(len, batches)) - min(map(len, batches)) <= 1
+    assert all(isinstance(cutoff, str) for cutoff in batches[0])
+
+
+def test_batch_cutoff_dates_invalid():
+    with pytest.raises(ValueError, match="Invalid maximum number of batches"):
+        batch_cutoff_dates(["2023-01-06"], 0)
+
+
+def test_batch_name():
+    assert batch_name(["2023-01-06"]) == "2023-01-06"
+    assert batch_name(["2023-01-06", "2023-01-13"]) == "2023-01-06_2023-01-13"
@@ -0,0 +1,60 @@
+"""Tests for the modeling pipeline."""
+
+import pytest
+
+from ml_technique_stock_price.pipelines import create_modeling_pipeline
+
+VARIANT_PARAMS = {"start_date": "2021-01-01", "end_date": "2023-12-31"}
+
+
+def _node(pipeline, name):
+    return next(node for node in pipeline.nodes if node.name == name)
+
+
+def test_single_cutoff_batches_keep_per_step_nodes():
+    """Batches of one cutoff have the per-step nodes in the cutoff's namespace."""
+    pipeline = create_modeling_pipeline("ml")
+
+    assert len(pipeline.nodes) == 1 + 2 * 4 + 1 + 1
+    assert _node(pipeline, "ml.signals_concatenated").inputs == [
+        "ml.2023-01-06.signals",
+        "ml.2023-01-13.signals",
+    ]
+
+
+@pytest.mark.parametrize("combine_mode", ["concat", "stream"])
+def test_batches_bound_the_pipeline_size(combine_mode):
+    """Hundreds of cutoffs are modeled by one node per batch."""
+    pipeline = create_modeling_pipeline(
+        "ml", combine_mode, variant_params={**VARIANT_PARAMS, "max_batches": 8}
+    )
+    batch_nodes = [node for node in pipeline.nodes if node.name.endswith("model_cutoff_batch")]
+
+    assert len(batch_nodes) == 8
+    assert batch_nodes[0].name == "ml.2021-01-01_2021-05-14.model_cutoff_batch"
+    assert batch_nodes[0].outputs == [
+        "ml.2021-01-01_2021-05-14.predictions_batch",
+        "ml.2021-01-01_2021-05-14.signals",
+    ]
+    assert set(batch_nodes[0].inputs) == {
+        "ml.sorted_price_w_features",
+        "ml.ticker_date_index",
+        "params:ml.modeling_params",
+        "params:ml.stock_price_params",
+    }
+    assert len(pipeline.nodes) < 2 * 8 + 3
+
+
+def test_cutoffs_cover_all_batches():
+    """Every cutoff is modeled by exactly one batch."""
+    pipeline = create_modeling_pipeline(
+        "ml", variant_params={**VARIANT_PARAMS, "max_batches": 16}
+    )
+    cutoffs = [
+        cutoff
+        for node in pipeline.nodes
+        if node.name.endswith("model_cutoff_batch")
+        for cutoff in node.func.keywords["cutoff_dates"]
+    ]
+    assert len(cutoffs) == len(set(cutoffs)) == 157
+    assert cutoffs == sorted(cutoffs)
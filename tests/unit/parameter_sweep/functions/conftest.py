@@ -0,0 +1,55 @@
+"""Conftest"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+@pytest.fixture
+def prices() -> pd.DataFrame:
+    dates = pd.bdate_range(start="2023-01-02", periods=20)
+    rng = np.random.default_rng(1)
+    returns = rng.normal(scale=0.01, size=(len(dates), 10))
+    tickers = [f"TICKER_{i}" for i in range(10)]
+    return pd.DataFrame(
+        100 * np.cumprod(1 + returns, axis=0), index=dates, columns=tickers
+    )
+
+
+@pytest.fixture
+def predictions(prices: pd.DataFrame) -> dict:
+    rng = np.random.default_rng(2)
+    partitions = {}
+    for cutoff in ["2023-01-06", "2023-01-13"]:
+        timestamps = pd.bdate_range(start=cutoff, periods=6)[1:]
+        frame = pd.DataFrame(
+            {
+                "item_id": np.repeat(prices.columns, len(timestamps)),
+                "mean": rng.normal(scale=0.01, size=len(timestamps) * 10),
+                "timestamp": np.tile(timestamps.strftime("%Y-%m-%d"), 10),
+            }
+        )
+        partitions[cutoff] = lambda frame=frame: frame
+    return partitions
+
+
+@pytest.fixture
+def sweep_params() -> dict:
+    return {
+        "search": "grid",
+        "n_jobs": 1,
+        "trading_costs": {"bp_trading_cost": 10},
+        "performance_metrics": {"columns": ["Adjusted Portfolio Returns"]},
+        "parameters": {
+            "stock_price_params": {
+                "cutoff_percentile": [0.1, 0.2],
+                "weighting": ["indicator", "score"],
+            },
+            "trading_costs": {"bp_trading_cost": [0, 10, 20]},
+        },
+    }
+
+
+@pytest.fixture
+def stock_price_params() -> dict:
+    return {"selection_mode": "quantile", "cutoff_percentile": 0.1}
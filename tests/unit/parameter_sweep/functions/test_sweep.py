@@ -0,0 +1,65 @@
+"""Test for the parameter sweep functions."""
+
+import pandas as pd
+import pytest
+
+from parameter_sweep.functions.sweep import create_parameter_grid, run_parameter_sweep
+
+
+def test_create_parameter_grid(sweep_params):
+    """The grid holds every combination with prefixed column names."""
+    grid = create_parameter_grid(sweep_params)
+    assert list(grid.columns) == [
+        "stock_price_params.cutoff_percentile",
+        "stock_price_params.weighting",
+        "trading_costs.bp_trading_cost",
+    ]
+    assert len(grid) == 12
+    assert not grid.duplicated().any()
+
+
+def test_create_parameter_grid_random(sweep_params):
+    """Random search draws distinct combinations reproducibly."""
+    sweep_params = {**sweep_params, "search": "random", "n_samples": 5, "seed": 3}
+    grid = create_parameter_grid(sweep_params)
+    assert len(grid) == 5
+    assert not grid.duplicated().any()
+    pd.testing.assert_frame_equal(grid, create_parameter_grid(sweep_params))
+
+
+def test_create_parameter_grid_invalid_group(sweep_params):
+    """Unknown parameter groups raise a ValueError."""
+    sweep_params = {**sweep_params, "parameters": {"unknown": {"a": [1]}}}
+    with pytest.raises(ValueError, match="Invalid parameter groups"):
+        create_parameter_grid(sweep_params)
+
+
+def test_run_parameter_sweep(predictions, prices, sweep_params, stock_price_params):
+    """Every combination gets one row and higher costs lower the returns."""
+    grid = create_parameter_grid(sweep_params)
+    results = run_parameter_sweep(
+        predictions, prices, grid, sweep_params, stock_price_params
+    )
+
+    assert len(results) == len(grid)
+    pd.testing.assert_frame_equal(
+        results.loc[:, grid.columns], grid, check_dtype=False
+    )
+    for _, group in results.groupby(
+        ["stock_price_params.cutoff_percentile", "stock_price_params.weighting"]
+    ):
+        assert group["mean_return"].is_monotonic_decreasing
+
+
+def test_run_parameter_sweep_process_pool(
+    predictions, prices, sweep_params, stock_price_params
+):
+    """The process pool gives the same results as the serial evaluation."""
+    grid = create_parameter_grid(sweep_params)
+    serial = run_parameter_sweep(
+        predictions, prices, grid, sweep_params, stock_price_params
+    )
+    parallel = run_parameter_sweep(
+        predictions, prices, grid, {**sweep_params, "n_jobs": 2}, stock_price_params
+    )
+    pd.testing.assert_frame_equal(serial, parallel)
@@ -0,0 +1,330 @@
+"""Tests for the project hooks."""
+
+import os
+import time
+
+import pandas as pd
+import pytest
+from click.testing import CliRunner
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.io import DataCatalog, MemoryDataset
+from kedro.pipeline import node, pipeline
+from kedro.runner import SequentialRunner
+
+from common.utilities.telemetry import read_events, timed
+from registry.__main__ import _pop_profile_nodes
+from registry import hooks as hooks_module
+from registry.cli import cli
+from registry.hooks import (
+    PROFILE_NODES_ENV,
+    CachedFunction,
+    NodeCacheHooks,
+    ProfilingHooks,
+    TelemetryHooks,
+    _function_source_digest,
+    fingerprint,
+)
+
+CALLS = []
+
+
+def _double(data, params):
+    CALLS.append("double")
+    return data * params["factor"]
+
+
+def _apply(data, func):
+    CALLS.append("apply")
+    return func(data)
+
+
+def _report(data):
+    CALLS.append("report")
+
+
+@pytest.fixture(autouse=True)
+def _clear_calls():
+    CALLS.clear()
+
+
+def _catalog(data, factor=2, func=None):
+    return DataCatalog(
+        {
+            "data": MemoryDataset(data),
+            "params:factor": MemoryDataset({"factor": factor}),
+            "func": MemoryDataset(func, copy_mode="assign"),
+        }
+    )
+
+
+def _run(hooks, pipe, data, factor=2, func=None):
+    hooks.before_pipeline_run(pipeline=pipe)
+    try:
+        return SequentialRunner().run(pipe, _catalog(data, factor, func))
+    finally:
+        hooks.after_pipeline_run()
+
+
+@pytest.fixture()
+def data():
+    return pd.DataFrame({"price": [1.0, 2.0, 3.0]}, index=pd.date_range("2024", periods=3))
+
+
+@pytest.fixture()
+def double_pipeline():
+    return pipeline([node(_double, ["data", "params:factor"], "doubled", name="double")])
+
+
+def test_cache_skips_unchanged_nodes(tmp_path, data, double_pipeline):
+    """A second run with the same inputs restores the outputs."""
+    hooks = NodeCacheHooks(tmp_path, enabled=True)
+    first = _run(hooks, double_pipeline, data)
+    second = _run(hooks, double_pipeline, data)
+
+    assert CALLS == ["double"]
+    pd.testing.assert_frame_equal(first["doubled"], second["doubled"])
+    assert not isinstance(double_pipeline.nodes[0].func, CachedFunction)
+
+
+def test_cache_reruns_changed_inputs(tmp_path, data, double_pipeline):
+    """Changed data or parameters are executed again."""
+    hooks = NodeCacheHooks(tmp_path, enabled=True)
+    _run(hooks, double_pipeline, data)
+    _run(hooks, double_pipeline, data.assign(price=data["price"] + 1))
+    result = _run(hooks, double_pipeline, data, factor=3)
+
+    assert CALLS == ["double"] * 3
+    assert result["doubled"]["price"].tolist() == [3.0, 6.0, 9.0]
+
+
+def test_cache_evicts_least_recently_used(tmp_path, data, double_pipeline):
+    """Outputs above the size limit are evicted, the newest one is kept."""
+    hooks = NodeCacheHooks(tmp_path, max_size_mb=1e-6, enabled=True)
+    _run(hooks, double_pipeline, data)
+    _run(hooks, double_pipeline, data, factor=3)
+
+    assert len(list(tmp_path.glob("*.pkl"))) == 0
+    hooks = NodeCacheHooks(tmp_path, max_size_mb=1, enabled=True)
+    _run(hooks, double_pipeline, data)
+    _run(hooks, double_pipeline, data)
+    assert len(list(tmp_path.glob("*.pkl"))) == 1
+    assert CALLS == ["double"] * 3
+
+
+def test_cache_always_runs_uncacheable_nodes(tmp_path, data):
+    """Nodes without outputs, tagged nodes and callable inputs are executed."""
+    pipe = pipeline(
+        [
+            node(_report, "data", None, name="report"),
+            node(_apply, ["data", "func"], "applied", name="apply"),
+            node(
+                _double,
+                ["data", "params:factor"],
+                "doubled",
+                name="double",
+                tags="no_cache",
+            ),
+        ]
+    )
+    hooks = NodeCacheHooks(tmp_path, enabled=True)
+    _run(hooks, pipe, data, func=len)
+    _run(hooks, pipe, data, func=len)
+
+    assert sorted(CALLS) == sorted(["report", "apply", "double"] * 2)
+    assert list(tmp_path.glob("*.pkl")) == []
+
+
+def test_cache_enabled_by_environment(tmp_path, data, double_pipeline, monkeypatch):
+    """The cache is off unless the environment variable enables it."""
+    monkeypatch.delenv("KEDRO_NODE_CACHE", raising=False)
+    hooks = NodeCacheHooks(tmp_path)
+    _run(hooks, double_pipeline, data)
+    _run(hooks, double_pipeline, data)
+    assert CALLS == ["double"] * 2
+
+    monkeypatch.setenv("KEDRO_NODE_CACHE", "1")
+    _run(hooks, double_pipeline, data)
+    _run(hooks, double_pipeline, data)
+    assert CALLS == ["double"] * 3
+
+
+def test_fingerprint_covers_imported_project_modules(tmp_path, monkeypatch):
+    """Editing a project module used by a node function changes its fingerprint."""
+    package = tmp_path / "cache_project"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "helpers.py").write_text("def scale(x):\n    return 2 * x\n")
+    (package / "nodes.py").write_text(
+        "from cache_project.helpers import scale\n\n"
+        "def run(x):\n    return scale(x)\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    monkeypatch.setattr(hooks_module, "PROJECT_SOURCE_PATH", tmp_path.resolve())
+    from cache_project.nodes import run
+
+    _function_source_digest.cache_clear()
+    before = fingerprint(run, (1,), {})
+    (package / "helpers.py").write_text("def scale(x):\n    return 3 * x\n")
+    _function_source_digest.cache_clear()
+    assert fingerprint(run, (1,), {}) != before
+
+    # Modules outside the project sources are not followed.
+    monkeypatch.setattr(hooks_module, "PROJECT_SOURCE_PATH", tmp_path / "other")
+    _function_source_digest.cache_clear()
+    unfollowed = fingerprint(run, (1,), {})
+    (package / "helpers.py").write_text("def scale(x):\n    return 4 * x\n")
+    _function_source_digest.cache_clear()
+    assert fingerprint(run, (1,), {}) == unfollowed
+    _function_source_digest.cache_clear()
+
+
+def test_network_and_model_nodes_are_not_cached():
+    """Downloads and nodes holding the shared model directory always run."""
+    from data_collection.pipelines import create_data_collection_pipeline
+    from ml_technique_stock_price.pipelines.pipeline import (
+        _create_modeling_pipeline,
+    )
+
+    (download,) = create_data_collection_pipeline().nodes
+    assert "no_cache" in download.tags
+    modeling = _create_modeling_pipeline("ml_technique_modeling", "2023-01-06")
+    uncached = {
+        node.name.split(".")[-1]
+        for node in modeling.only_nodes_with_tags("no_cache").nodes
+    }
+    assert uncached == {"train_model", "inference"}
+
+
+def _fit(data):
+    with timed("model_fit"):
+        CALLS.append("fit")
+    return data.iloc[:2]
+
+
+def _fail(data):
+    raise RuntimeError("failed")
+
+
+def _run_with_telemetry(tmp_path, pipe, data, session_id):
+    hook_manager = _create_hook_manager()
+    hooks = [
+        NodeCacheHooks(tmp_path / "cache", enabled=True),
+        TelemetryHooks(tmp_path / "telemetry.jsonl"),
+    ]
+    for hook in hooks:
+        hook_manager.register(hook)
+    catalog = DataCatalog(
+        {
+            "data": MemoryDataset(data),
+            "params:factor": MemoryDataset({"factor": 2}),
+        }
+    )
+    run_params = {"session_id": session_id, "pipeline_name": "test"}
+    hook_manager.hook.before_pipeline_run(
+        run_params=run_params, pipeline=pipe, catalog=catalog
+    )
+    try:
+        SequentialRunner().run(pipe, catalog, hook_manager)
+    except RuntimeError:
+        hook_manager.hook.on_pipeline_error(
+            error=None, run_params=run_params, pipeline=pipe, catalog=catalog
+        )
+    else:
+        hook_manager.hook.after_pipeline_run(
+            run_params=run_params, run_result={}, pipeline=pipe, catalog=catalog
+        )
+    return read_events(tmp_path / "telemetry.jsonl")
+
+
+def test_telemetry_records_node_events(tmp_path, data):
+    """Every node run writes its duration, rows, fit time and cache status."""
+    pipe = pipeline(
+        [
+            node(_double, ["data", "params:factor"], "doubled", name="double"),
+            node(_fit, "doubled", "fitted", name="fit"),
+        ]
+    )
+    _run_with_telemetry(tmp_path, pipe, data, "run_1")
+    events = _run_with_telemetry(tmp_path, pipe, data, "run_2")
+
+    nodes = events[events["event"] == "node"].set_index(["run_id", "node"])
+    assert len(nodes) == 4
+    assert nodes.loc[("run_1", "double"), "rows_in"] == 3
+    assert nodes.loc[("run_1", "fit"), "rows_out"] == 2
+    assert nodes.loc[("run_1", "fit"), "bytes_out"] > 0
+    assert nodes.loc[("run_1", "fit"), "phases"]["model_fit"] >= 0
+    assert nodes.loc[("run_1", "fit"), "cache"] == "miss"
+    assert nodes.loc[("run_2", "fit"), "cache"] == "hit"
+    assert (nodes["peak_rss_mb"] > 0).all()
+    assert (events.loc[events["event"] == "pipeline", "status"] == "success").all()
+    assert events["pipeline"].eq("test").all()
+
+
+def test_telemetry_records_failures(tmp_path, data):
+    pipe = pipeline([node(_fail, "data", "failed", name="fail")])
+    events = _run_with_telemetry(tmp_path, pipe, data, "run_1")
+
+    assert events.set_index("event")["status"].to_dict() == {
+        "node": "error",
+        "pipeline": "error",
+    }
+
+
+def test_telemetry_summary_command(tmp_path, data):
+    pipe = pipeline(
+        [node(_double, ["data", "params:factor"], "doubled", name="double")]
+    )
+    _run_with_telemetry(tmp_path, pipe, data, "run_1")
+
+    result = CliRunner().invoke(
+        cli, ["telemetry-summary", "--path", str(tmp_path / "telemetry.jsonl")]
+    )
+    assert result.exit_code == 0, result.output
+    assert "Slowest nodes of run run_1" in result.output
+    assert "double" in result.output
+
+
+def _slow(data):
+    CALLS.append("slow")
+    end = time.perf_counter() + 0.05
+    while time.perf_counter() < end:
+        pass
+    return data
+
+
+def test_profiling_wraps_matching_nodes(tmp_path, data):
+    """Matching nodes write their profiles and always run despite the cache."""
+    pipe = pipeline(
+        [
+            node(_slow, "data", "slowed", name="slow_node"),
+            node(_double, ["slowed", "params:factor"], "doubled", name="double"),
+        ]
+    )
+    profiling = ProfilingHooks(tmp_path / "profiles", "*slow*", interval=0.001)
+    caching = NodeCacheHooks(tmp_path / "cache", enabled=True)
+    for _ in range(2):
+        profiling.before_pipeline_run(pipeline=pipe)
+        caching.before_pipeline_run(pipeline=pipe)
+        SequentialRunner().run(pipe, _catalog(data))
+        profiling.after_pipeline_run()
+        caching.after_pipeline_run()
+
+    assert CALLS == ["slow", "double", "slow"]
+    assert sorted(path.name for path in (tmp_path / "profiles").iterdir()) == [
+        "slow_node.collapsed",
+        "slow_node_top.txt",
+    ]
+    assert "_slow (registry/test_hooks.py" in (
+        tmp_path / "profiles" / "slow_node.collapsed"
+    ).read_text()
+    assert {node.func for node in pipe.nodes} == {_double, _slow}
+
+
+def test_profile_nodes_option(monkeypatch):
+    monkeypatch.delenv(PROFILE_NODES_ENV, raising=False)
+    args = ["--pipeline", "x", "--profile-nodes", "*selection*", "--async"]
+    assert _pop_profile_nodes(args) == ["--pipeline", "x", "--async"]
+    assert os.environ[PROFILE_NODES_ENV] == "*selection*"
+
+    assert _pop_profile_nodes(["--profile-nodes=a,b"]) == []
+    assert os.environ[PROFILE_NODES_ENV] == "a,b"
@@ -0,0 +1,170 @@
+"""Tests for the pipeline registry."""
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+from kedro.config import OmegaConfigLoader
+from kedro.framework.context import KedroContext
+from kedro.framework.hooks.manager import _create_hook_manager
+from kedro.pipeline import Pipeline
+
+from registry.hooks import ContextParametersHooks
+from registry.pipeline_registry import register_pipelines, use_context_parameters
+from registry.settings import CONFIG_LOADER_ARGS
+
+SRC_PATH = Path(__file__).parents[3] / "src"
+HEAVY_MODULES = ["autogluon", "matplotlib", "yfinance"]
+STARTUP_BUDGET_SECONDS = 10.0
+
+_STARTUP_SCRIPT = """
+import json, sys, time
+start = time.perf_counter()
+from registry.pipeline_registry import register_pipelines
+pipelines = register_pipelines()
+names = list(pipelines)
+pipelines["data_collection"]
+elapsed = time.perf_counter() - start
+heavy = [m for m in {heavy!r} if m in sys.modules]
+print(json.dumps({{"elapsed": elapsed, "heavy": heavy, "names": names}}))
+"""
+
+
+def test_register_pipelines_lists_without_building():
+    """Listing the registered pipelines must not build any of them."""
+    pipelines = register_pipelines()
+    assert set(pipelines) == {
+        "data_collection",
+        "feature_engineering",
+        "incremental_backtest",
+        "ml_technique_modeling",
+        "parameter_sweep",
+        "synthetic_data_collection",
+        "walk_forward_backtest",
+    }
+    assert pipelines._pipelines == {}
+
+
+def test_register_pipelines_builds_on_first_access():
+    """Pipelines are built once and cached afterwards."""
+    pipelines = register_pipelines()
+    pipeline = pipelines["feature_engineering"]
+    assert isinstance(pipeline, Pipeline)
+    assert pipelines["feature_engineering"] is pipeline
+    assert list(pipelines._pipelines) == ["feature_engineering"]
+
+
+def test_startup_import_budget():
+    """Startup must stay within budget and not import heavy dependencies."""
+    result = subprocess.run(
+        [sys.executable, "-c", _STARTUP_SCRIPT.format(heavy=HEAVY_MODULES)],
+        capture_output=True,
+        check=True,
+        text=True,
+        env={**os.environ, "PYTHONPATH": str(SRC_PATH)},
+    )
+    startup = json.loads(result.stdout.strip().splitlines()[-1])
+
+    assert startup["heavy"] == []
+    assert startup["elapsed"] < STARTUP_BUDGET_SECONDS
+
+
+def _batch_nodes(pipeline):
+    return [node for node in pipeline.nodes if node.name.endswith("model_cutoff_batch")]
+
+
+@pytest.fixture
+def _reset_context_parameters():
+    yield
+    use_context_parameters(None)
+
+
+def test_modeling_pipeline_reads_variant_parameters(monkeypatch):
+    """The variants of the modeling pipeline come from the parameters."""
+    monkeypatch.delenv("KEDRO_ENV", raising=False)
+    pipeline = register_pipelines()["ml_technique_modeling"]
+    assert _batch_nodes(pipeline) == []
+    assert len(pipeline.only_nodes_with_tags("modeling").nodes) == 1 + 2 * 4 + 1
+
+    monkeypatch.setenv("KEDRO_ENV", "walk_forward")
+    assert len(_batch_nodes(register_pipelines()["ml_technique_modeling"])) == 16
+
+
+@pytest.mark.usefixtures("_reset_context_parameters")
+def test_pipelines_follow_context_parameters():
+    """The "--env" and "--params" of the Kedro context shape the pipelines."""
+    context = KedroContext(
+        package_name="registry",
+        project_path=SRC_PATH.parent,
+        config_loader=OmegaConfigLoader(
+            conf_source=str(SRC_PATH.parent / "conf"),
+            env="walk_forward",
+            **CONFIG_LOADER_ARGS,
+        ),
+        hook_manager=_create_hook_manager(),
+        env="walk_forward",
+        extra_params={"feature_backend": {"engine": "polars"}},
+    )
+    ContextParametersHooks().after_context_created(context)
+    pipelines = register_pipelines()
+
+    assert len(_batch_nodes(pipelines["ml_technique_modeling"])) == 16
+    feature_pipeline = pipelines["feature_engineering"]
+    assert "partition_by_ticker" in {node.name for node in feature_pipeline.nodes}
+    # The modeling parameters keep their base values next to the overrides.
+    assert context.params["ml_technique_modeling"]["modeling_params"]
+
+    use_context_parameters(
+        {**context.params, "feature_backend": {"engine": "pandas"}}
+    )
+    assert pipelines["feature_engineering"] is not feature_pipeline
+    assert [node.name for node in pipelines["feature_engineering"].nodes] == [
+        "create_features"
+    ]
+
+
+@pytest.mark.usefixtures("_reset_context_parameters")
+def test_modeling_pipeline_reads_combine_mode(monkeypatch):
+    """The signals are concatenated by default and streamed when configured."""
+    monkeypatch.delenv("KEDRO_ENV", raising=False)
+    pipelines = register_pipelines()
+    assert "ml_technique_modeling.signals_concatenated" in (
+        pipelines["ml_technique_modeling"].all_outputs()
+    )
+
+    parameters = OmegaConfigLoader(
+        conf_source=str(SRC_PATH.parent / "conf"), **CONFIG_LOADER_ARGS
+    )["parameters"]
+    parameters["ml_technique_modeling"]["combine_mode"] = "stream"
+    use_context_parameters(parameters)
+    outputs = pipelines["ml_technique_modeling"].all_outputs()
+    assert "ml_technique_modeling.signals_streamed" in outputs
+    assert "ml_technique_modeling.signals_concatenated" not in outputs
+
+
+@pytest.mark.usefixtures("_reset_context_parameters")
+@pytest.mark.parametrize(
+    ("option", "node_name"),
+    [
+        ("bootstrap", "bootstrap_performance_metrics"),
+        ("rebalancing", "simulate_rebalancing"),
+    ],
+)
+def test_walk_forward_backtest_options_follow_parameters(option, node_name):
+    """The optional backtest nodes are disabled by default and enabled by flags."""
+    parameters = OmegaConfigLoader(
+        conf_source=str(SRC_PATH.parent / "conf"), **CONFIG_LOADER_ARGS
+    )["parameters"]
+    use_context_parameters(parameters)
+    pipelines = register_pipelines()
+    node_name = f"walk_forward_backtest.{node_name}"
+    assert node_name not in {node.name for node in pipelines["walk_forward_backtest"].nodes}
+
+    parameters["walk_forward_backtest"][option]["enabled"] = True
+    use_context_parameters(parameters)
+    pipeline = pipelines["walk_forward_backtest"]
+    assert node_name in {node.name for node in pipeline.nodes}
+    assert f"params:walk_forward_backtest.{option}" in pipeline.inputs()